@@ -77,6 +77,22 @@ Example:
     recovered = session.statuses_show(id=tweet.id_str)
     session.statuses_destroy(id=recovered.id_str)
 
+### The [`AsyncClient`](client/async_client.m.html) API
+
+[`AsyncClient`](client/async_client.m.html) and [`AsyncAPISession`](api/async_api.m.html) are
+asyncio based counterparts of the APIs above built on aiohttp, which must be installed
+to use them (`pip install pytter[async]`). All API methods are coroutines.
+
+    import asyncio
+    from pytter import AsyncClient, Credentials
+
+    async def main():
+        async with AsyncClient(creds, max_concurrency=200) as client:
+            users = await asyncio.gather(
+                *[client.user(id=id) for id in ids])
+
+    asyncio.run(main())
+
 """
 
 __title__     = 'pytter'
@@ -1,3 +1,17 @@
 from .api import *
+from .async_api import *
+from .base import *
+from .batching import *
+from .chunking import *
 from .credentials import *
-from .exceptions import *
\ No newline at end of file
+from .cursor import *
+from .exceptions import *
+from .media_cache import *
+from .object_store import *
+from .processing import *
+from .projection import *
+from .ratelimit import *
+from .response_cache import *
+from .retry import *
+from .single_flight import *
+from .snapshots import *
\ No newline at end of file
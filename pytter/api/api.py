@@ -1,23 +1,29 @@
-import uuid
-import base64
-import urllib
+import time
+import heapq
+import threading
 import requests
-from typing import Iterator, List, Dict
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED, FIRST_EXCEPTION
+from typing import Callable, Iterator, List, Dict
 from requests_oauthlib import OAuth2
 
-from .credentials import Credentials
-from .exceptions import (
-    RateLimitException, NoneResponseException, 
-    ParameterOutOfBoundsException,
-    ParameterNoneException
-)
+from .base import BaseAPISession
+from .credentials import Credentials, CredentialPool
+from .exceptions import NoneResponseException, RequestFailedException, UploadCancelledException
+from .ratelimit import RATE_LIMIT_RAISE, endpoint_key
+from .retry import RetryPolicy
+from .media_cache import MediaCache, media_cache_key
+from .chunking import AdaptiveChunkSizer
+from .response_cache import ResponseCache, NegativeCache
+from .single_flight import SingleFlight
+from .processing import processing_delay
+from .cursor import Cursor
 
 from ..utils import utils
 from ..objects import Tweet, Media, User
-from ..utils import FileInfo
+from ..utils import FileInfo, IdSet
 
 
-class APISession:
+class APISession(BaseAPISession):
     """
     Barebone Twitter API wrapper representing Twitters API
     endpoints directly. Initialized with App Credentials
@@ -25,30 +31,99 @@ class APISession:
 
     **Parameters**
 
-    - `credentials: Credentials`  
+    - `credentials: [Credentials, CredentialPool]`  
       APP or User credentials to authenticate against
-      the Twitter API.
+      the Twitter API, or a pool of multiple credentials
+      the requests will be spread over.
+
+    - `rate_limit_mode: str`  
+      What to do when the rate limit window of an endpoint
+      is exhausted: `'wait'` blocks until the window resets,
+      `'raise'` raises a `RateLimitException` without sending
+      the request and `'ignore'` sends the request anyway.
+      If a `CredentialPool` is passed, the pools mode is
+      used instead.  
+      *Default: `'raise'`*
+
+    - `retry_policy: RetryPolicy`  
+      Policy for retrying rate limited and transiently
+      failing requests. If not passed, failed requests
+      are not retried.  
+      *Default: `None`*
+
+    - `json_decoder: Callable[[bytes], object]`  
+      Function decoding the raw response bodies. If not
+      passed, `utils.json_loads` is used, which uses
+      orjson if installed.  
+      *Default: `None`*
+
+    - `projection: [str, List[str]]`  
+      Default projection of `statuses_lookup`, `users_lookup`,
+      `followers_list` and `friends_list` results (and their
+      bulk and iterator variants). `PROJECTION_RAW` returns the
+      raw response dicts, a list of fields returns dicts only
+      containing these fields, like
+      `['id_str', 'screen_name', 'followers_count']`. This skips
+      building `User` and `Tweet` objects.  
+      *Default: `None`*
+
+    - `media_cache: MediaCache`  
+      Cache of uploaded media by file content. Uploading
+      a file which was uploaded before returns the cached
+      media object without any request, as long as its
+      media ID is valid.  
+      *Default: `None`*
+
+    - `chunk_sizer: AdaptiveChunkSizer`  
+      Chooses the size of the APPEND segments of chunked
+      uploads from the measured upload throughput instead
+      of using the fixed `UPLOAD_CHUNK_SIZE`.  
+      *Default: `None`*
+
+    - `response_cache: ResponseCache`  
+      Cache of responses of read endpoints like
+      `users_show` or `statuses_show`. Write requests
+      invalidate the cached responses of the Tweets
+      they change.  
+      *Default: `None`*
+
+    - `negative_cache: NegativeCache`  
+      Cache of IDs of deleted and inaccessible Tweets,
+      which `statuses_show` and `statuses_lookup` do
+      not request again within its TTL.  
+      *Default: `None`*
+
+    - `coalesce_requests: bool`  
+      Whether concurrent identical GET requests share one
+      request. Threads requesting the same resource with
+      the same parameters while it is in flight get the
+      result or exception of this request. The raw
+      response objects are shared and must not be
+      modified.  
+      *Default: `False`*
     """
 
-    API_ROOT_URI        = 'https://api.twitter.com'
-    API_VERSION         = '1.1'
-    API_UPLOAD_ROOT_URI = 'https://upload.twitter.com/1.1'
-    UPLOAD_CHUNK_SIZE   = 1024 * 1024 * 1024 # 1 MiB
+    def __init__(self, credentials: [Credentials, CredentialPool],
+        rate_limit_mode: str = RATE_LIMIT_RAISE,
+        retry_policy: RetryPolicy = None,
+        json_decoder: Callable[[bytes], object] = None,
+        projection: [str, List[str]] = None,
+        media_cache: MediaCache = None,
+        chunk_sizer: AdaptiveChunkSizer = None,
+        response_cache: ResponseCache = None,
+        negative_cache: NegativeCache = None,
+        coalesce_requests: bool = False):
+        super().__init__(credentials, rate_limit_mode, retry_policy, json_decoder,
+            projection, media_cache, chunk_sizer, response_cache, negative_cache)
+        self._single_flight = SingleFlight() if coalesce_requests else None
 
-    def __init__(self, credentials: Credentials):
-        self._session = requests.Session()
-        
-        self._credentials = credentials
-        
         self._session = requests.Session()
 
-        if all([self._credentials.access_token_key,
-                self._credentials.access_token_secret,
-                self._credentials.consumer_key,
-                self._credentials.consumer_secret]):
-            self._oauth = self._credentials.to_oauth1()
-        else:
-            self.obtain_user_context_token()
+        for entry in self._pool.entries:
+            if entry.user_context:
+                self._auth[entry] = entry.credentials.to_oauth1()
+            else:
+                self.obtain_user_context_token(entry.credentials)
 
         self.verify_credentials()
 
@@ -56,11 +131,24 @@ class APISession:
     # GENERAL REQUEST HANDLING #
     ############################
 
+    def _with_retries(self, fn, method: str, endpoint: str) -> object:
+        """
+        Calls `fn`, retrying it according to the sessions
+        retry policy, if set.
+        """
+
+        if self._retry_policy is None:
+            return fn()
+        return self._retry_policy.call(fn, method, endpoint)
+
     def request(self, method: str, resource_path: str, **kwargs) -> object:
         """
         Request the Twitter API with the defined authentication
         credentials.
         This method raises an exception on failed authentication or request.
+        GET requests of cached endpoints are served from the
+        response cache, if set, and concurrent identical GET
+        requests are coalesced, if enabled.
 
         **Parameters**
 
@@ -80,21 +168,55 @@ class APISession:
           JSON-parsed response body.
         """
 
-        res = self._session.request(
-            auth=self._oauth,
-            method=method,
-            url='{0}/{1}/{2}'.format(self.API_ROOT_URI, self.API_VERSION,
-                (resource_path[1:] if resource_path.startswith('/') else resource_path)),
-            **kwargs)
+        endpoint = endpoint_key(resource_path)
+
+        if method == 'GET':
+            params = kwargs.get('params')
+            key, generation, res = self._cache_get(endpoint, resource_path, params)
+            if res is None:
+                res = self._get(key, resource_path, endpoint, **kwargs)
+                self._cache_set(endpoint, key, generation, resource_path, params, res)
+            return res
+
+        try:
+            return self._request(method, resource_path, endpoint, **kwargs)
+        finally:
+            self._cache_invalidate(endpoint, resource_path,
+                kwargs.get('data') or kwargs.get('params'))
+
+    def _get(self, key: tuple, resource_path: str, endpoint: str, **kwargs) -> object:
+        """
+        Sends the GET request or waits for the in-flight
+        request with the same key, if requests are coalesced.
+        """
+
+        if self._single_flight is None:
+            return self._request('GET', resource_path, endpoint, **kwargs)
+        return self._single_flight.do(key,
+            lambda: self._request('GET', resource_path, endpoint, **kwargs))
 
-        if res.status_code == 429:
-            raise RateLimitException()
+    def _request(self, method: str, resource_path: str, endpoint: str, **kwargs) -> object:
+        """
+        Sends the request bypassing the response cache.
+        """
+
+        def send():
+            entry = self._pool.acquire(endpoint, method)
+
+            res = self._session.request(
+                auth=self._auth[entry],
+                method=method,
+                url=self._resource_url(resource_path),
+                **kwargs)
 
-        if not res.ok:
-            raise Exception('request failed with status code {} and message: {}'
-                .format(res.status_code, res.text))
+            self._check_rate_limit(entry, endpoint, res.status_code, res.headers)
 
-        return res.json()
+            if not res.ok:
+                raise RequestFailedException(res.status_code, res.text, res.headers)
+
+            return self._json_decoder(res.content)
+
+        return self._with_retries(send, method, endpoint)
 
     def cursor_request(self, resource_path: str, expected_key: str, count: int = 200, params: dict = {}) -> List[object]:
         """
@@ -124,54 +246,136 @@ class APISession:
         - `List[object]`  
           List of concat objects expected in `expected_key`.
         """
-        
-        results = []
-        cursor = -1
-        params['count'] = count
 
-        if count > 200 or count < 1:
-            raise ParameterOutOfBoundsException("must be in range of [1, 200]")
+        return list(self.cursor(resource_path, expected_key,
+            count=count, params=params, prefetch=False))
 
-        while cursor is not 0:
-            params['cursor'] = cursor
-            res = self.request('GET', resource_path, params=params)
-            data = res.get(expected_key)
-            if data:
-                results.extend(data)
-            cursor = res.get('next_cursor')
+    def cursor(self, resource_path: str, expected_key: str,
+        count: int = 200,
+        params: dict = {},
+        cursor: int = -1,
+        prefetch: bool = True,
+        item_factory = None,
+        max_count: int = 200) -> Cursor:
+        """
+        Returns a lazy `Cursor` over a cursored endpoint
+        which requests the pages while it is iterated,
+        optionally prefetching the next page while the
+        current one is processed.
+
+        **Parameters**
+
+        - `resource_path: str`  
+          Path to the requested resource (without root URI).
+          Leading '/' will be cut off.
+
+        - `expected_key: str`  
+          Key expected to be contained in the response grouping
+          all response objects.
+
+        - `count: int`  
+          Ammount of objects which will be requested at once.
+          Must be in range of [1, 200].
+
+        - `params: dict`  
+          Parameters passed to the single GET requests.
+
+        - `cursor: int`  
+          Cursor to start or resume from.  
+          *Default: `-1`*
+
+        - `prefetch: bool`  
+          Request the next page in the background.  
+          *Default: `True`*
+
+        - `item_factory: Callable`  
+          Function applied to each response object.  
+          *Default: `None`*
+
+        - `max_count: int`  
+          Maximum page size of the endpoint.  
+          *Default: `200`*
+
+        **Returns**
+
+        - `Cursor`  
+          Iterator over the objects expected in `expected_key`.
+        """
+
+        return Cursor(self, resource_path, expected_key,
+            count=count, params=params, cursor=cursor,
+            prefetch=prefetch, item_factory=item_factory,
+            max_count=max_count)
+
+    def _run_batches(self, fn, batches: list, workers: int) -> dict:
+        """
+        Calls `fn` for each batch using up to `workers`
+        threads and merges the resulting dicts. If one
+        batch fails, the batches not yet started are
+        cancelled and the exception is re-raised.
+        """
+
+        self._check_workers(workers)
+
+        results = {}
+
+        if len(batches) == 1 or workers == 1:
+            for batch in batches:
+                results.update(fn(batch))
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+            futures = [executor.submit(fn, batch) for batch in batches]
+            try:
+                for future in futures:
+                    results.update(future.result())
+            except:
+                for future in futures:
+                    future.cancel()
+                raise
 
         return results
 
-    def obtain_user_context_token(self):
+    def obtain_user_context_token(self, credentials: Credentials = None):
         """
         Collect a user context bearer token
         from client_key and client_secret and sets it as OAuth2 
         authentication method for further requests.
+
+        **Parameters**
+
+        - `credentials: Credentials`  
+          Credentials of the sessions pool to obtain the
+          token for. Defaults to the sessions (primary)
+          credentials.  
+          *Default: `None`*
         """
 
-        key = urllib.parse.quote_plus(self._credentials.consumer_key)
-        secret = urllib.parse.quote_plus(self._credentials.consumer_secret)
-        basic_token = base64.b64encode(
-            '{0}:{1}'.format(key, secret).encode('utf8')).decode('utf8')
-        
-        res = self._session.post(
-            url='{0}/oauth2/token'.format(self.API_ROOT_URI),
-            headers={
-                'Content-Type': 'application/x-www-form-urlencoded;charset=UTF-8',
-                'Authorization': 'Basic {0}'.format(basic_token),
-            },
-            data={
-                'grant_type': 'client_credentials',
-            })
+        entry = self._pool.entry(credentials or self._credentials)
+        basic_token = self._basic_token(entry)
+
+        def send():
+            self._pool.acquire('oauth2/token', entry=entry)
 
-        if res.status_code == 429:
-            raise RateLimitException()
-        if res.status_code != 200:
-            raise Exception('request failed with status code {0}'.format(res.status_code))
+            res = self._session.post(
+                url='{0}/oauth2/token'.format(self.API_ROOT_URI),
+                headers={
+                    'Content-Type': 'application/x-www-form-urlencoded;charset=UTF-8',
+                    'Authorization': 'Basic {0}'.format(basic_token),
+                },
+                data={
+                    'grant_type': 'client_credentials',
+                })
 
-        body = res.json()
+            self._check_rate_limit(entry, 'oauth2/token', res.status_code, res.headers)
+            if res.status_code != 200:
+                raise RequestFailedException(res.status_code, headers=res.headers)
 
-        self._oauth = OAuth2(token=body)
+            return self._json_decoder(res.content)
+
+        body = self._with_retries(send, 'POST', 'oauth2/token')
+
+        self._auth[entry] = OAuth2(token=body)
 
     def verify_credentials(self, **kwargs):
         """
@@ -191,12 +395,8 @@ class APISession:
           Self user object.
         """
 
-        data = kwargs
-        res = self.request('GET', 'account/verify_credentials.json', params=data)
-        if not res:
-            raise NoneResponseException()
-        
-        return User(res, self)
+        res = self.request('GET', 'account/verify_credentials.json', params=kwargs)
+        return User(self._required(res), self)
 
     ##############
     # UPLOAD API #
@@ -234,20 +434,257 @@ class APISession:
             params['command'] = command
             params = utils.sort_dict_alphabetically(params)
 
-        res = self._session.post(
-            auth=self._oauth,
-            url='{0}/media/upload.json'.format(self.API_UPLOAD_ROOT_URI),
-            data=(params if raw is None else raw),
-            **kwargs)
+        def send():
+            # Retried attempts re-send the body from the start.
+            if raw is not None and hasattr(raw, 'seekable') and raw.seekable():
+                raw.seek(0)
+
+            entry = self._pool.acquire('media/upload', 'POST')
+
+            res = self._session.post(
+                auth=self._auth[entry],
+                url='{0}/media/upload.json'.format(self.API_UPLOAD_ROOT_URI),
+                data=(params if raw is None else raw),
+                **kwargs)
+
+            self._check_rate_limit(entry, 'media/upload', res.status_code, res.headers)
+            if res.status_code < 200 or res.status_code >= 300:
+                raise RequestFailedException(res.status_code, headers=res.headers)
+
+            return res
+
+        return self._with_retries(send, 'POST', 'media/upload')
+
+    def upload_media_status(self, media_id: [str, int]) -> Media:
+        """
+        Requests the processing state of an uploaded media
+        via the STATUS command.
+
+        **Parameters**
+
+        - `media_id : [str, int]`  
+          ID of the uploaded media.
+
+        **Returns**
+
+        - `Media`  
+          Media object with the current `processing_info`.
+        """
+
+        params = {
+            'command': 'STATUS',
+            'media_id': str(media_id),
+        }
+
+        def send():
+            entry = self._pool.acquire('media/upload', 'GET')
+
+            res = self._session.get(
+                auth=self._auth[entry],
+                url='{0}/media/upload.json'.format(self.API_UPLOAD_ROOT_URI),
+                params=params)
+
+            self._check_rate_limit(entry, 'media/upload', res.status_code, res.headers)
+            if res.status_code < 200 or res.status_code >= 300:
+                raise RequestFailedException(res.status_code, res.text, res.headers)
+
+            return res
+
+        res = self._with_retries(send, 'GET', 'media/upload')
+        return Media(self._json_decoder(res.content))
+
+    def wait_for_processing(self, media: Media, timeout: float = None) -> Media:
+        """
+        Waits until the processing of an uploaded media
+        has finished, see `wait_for_processing_many`.
+
+        **Parameters**
+
+        - `media : Media`  
+          Media object returned by the upload.
+
+        - `timeout : float`  
+          Maximum time to wait in seconds.
+          If `None`, it is waited until processing
+          has finished.  
+          *Default: `None`*
+
+        **Returns**
+
+        - `Media`  
+          Media object with the final `processing_info`.
+        """
+
+        return self.wait_for_processing_many([media], timeout)[0]
+
+    def wait_for_processing_many(self, media: List[Media], timeout: float = None) -> List[Media]:
+        """
+        Waits until the processing of all given media has
+        finished. Media without `processing_info` (like
+        images) are returned as they are.
+
+        The state of each media is requested via STATUS
+        after the `check_after_secs` of its last response,
+        so the waits of all media overlap and only one
+        thread is blocked. A `MediaProcessingException`
+        is raised as soon as the processing of one media
+        failed, a `TimeoutError` if processing did not
+        finish within `timeout`.
+
+        **Parameters**
+
+        - `media : List[Media]`  
+          Media objects returned by the upload.
+
+        - `timeout : float`  
+          Maximum time to wait in seconds.
+          If `None`, it is waited until processing
+          has finished.  
+          *Default: `None`*
+
+        **Returns**
+
+        - `List[Media]`  
+          Media objects with the final `processing_info`
+          in the order of `media`.
+        """
+
+        results = list(media)
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+
+        # Heap of (next check time, index) ordering the
+        # media by the time they are due to be checked.
+        due = []
+        for i, m in enumerate(results):
+            delay = processing_delay(m, self.PROCESSING_INTERVAL)
+            if delay is not None:
+                heapq.heappush(due, (start + delay, i))
+
+        while due:
+            check_at, i = heapq.heappop(due)
+            if deadline is not None and check_at > deadline:
+                raise TimeoutError('processing of media {} did not finish within {} seconds'
+                    .format(results[i].id_str, timeout))
+            time.sleep(max(check_at - time.monotonic(), 0))
+
+            results[i] = self.upload_media_status(results[i].id_str)
+            delay = processing_delay(results[i], self.PROCESSING_INTERVAL)
+            if delay is not None:
+                heapq.heappush(due, (time.monotonic() + delay, i))
 
-        if res.status_code == 429:
-            raise RateLimitException()
-        if res.status_code < 200 or res.status_code >= 300:
-            raise Exception('request failed with status code {0}'.format(res.status_code))
+        return results
 
-        return res
+    def wait_for_processing_background(self, media: List[Media], timeout: float = None) -> Future:
+        """
+        Runs `wait_for_processing_many` in a background
+        thread and returns immediately.
 
-    def upload_file_cunked(self, file_info: utils.FileInfo, close_after: bool = False) -> Media:
+        **Parameters**
+
+        - `media : List[Media]`  
+          Media objects returned by the upload.
+
+        - `timeout : float`  
+          Maximum time to wait in seconds.  
+          *Default: `None`*
+
+        **Returns**
+
+        - `Future`  
+          Future resolving to the list of Media objects
+          with the final `processing_info` or to the
+          raised exception.
+        """
+
+        future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(self.wait_for_processing_many(media, timeout))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, daemon=True).start()
+        return future
+
+    def _upload_segment(self, media_id: int, file_info: utils.FileInfo, chunk: utils.FileChunk):
+        """
+        Sends a single APPEND request for the given chunk,
+        see `_segment_body`. Failed segments are retried on
+        their own, see `_segment_retry_policy`.
+        The duration of successful attempts is recorded by
+        the chunk sizer, if set.
+        """
+
+        body = self._segment_body(media_id, file_info, chunk)
+
+        def send():
+            start = time.monotonic()
+            res = self.upload_media_request(
+                headers={
+                    'Content-Type': body.content_type,
+                    'Content-Length': str(len(body)),
+                },
+                raw=body)
+            if self._chunk_sizer is not None:
+                self._chunk_sizer.record(chunk.size, time.monotonic() - start)
+            return res
+
+        policy = self._segment_retry_policy()
+        if policy is None:
+            return send()
+        return policy.call(send, 'POST', 'media/upload')
+
+    def _check_stop(self, stop: threading.Event):
+        """
+        Raises an `UploadCancelledException`, if
+        `stop` is passed and set.
+        """
+
+        if stop is not None and stop.is_set():
+            raise UploadCancelledException()
+
+    def _upload_segments(self, media_id: int, file_info: utils.FileInfo,
+        chunks: Iterator[utils.FileChunk], workers: int, stop: threading.Event = None):
+        """
+        Uploads the given chunks as APPEND segments using
+        up to `workers` threads. Chunks are only taken from
+        the iterator when a worker is free, so at most
+        `workers` segments are in flight at once. If a
+        segment finally fails or `stop` is set, the
+        remaining segments are cancelled and the exception
+        is re-raised.
+        """
+
+        if workers == 1:
+            for chunk in chunks:
+                self._check_stop(stop)
+                self._upload_segment(media_id, file_info, chunk)
+            return
+
+        pending = set()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for chunk in chunks:
+                    self._check_stop(stop)
+                    if len(pending) >= workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    pending.add(executor.submit(
+                        self._upload_segment, media_id, file_info, chunk))
+                for future in pending:
+                    future.result()
+            except:
+                for future in pending:
+                    future.cancel()
+                raise
+
+    def upload_file_cunked(self, file_info: [utils.FileInfo, utils.RemoteFileInfo],
+        close_after: bool = False, workers: int = None, stop: threading.Event = None) -> Media:
         """
         Try to grab the FileInfo of the specified media file, checks if it 
         can be uploaded to twitter and then tries to upload the file via 
@@ -255,74 +692,58 @@ class APISession:
 
         **Parameters**
 
-        - `media : str`  
-          Either a local file location or a HTTP(S) URL
-          to an online file resource.
+        - `media : [FileInfo, RemoteFileInfo]`  
+          The file to upload. The data of a `RemoteFileInfo`
+          is downloaded while the already downloaded
+          segments are uploaded.
 
         - `close_after: bool`  
           Wether the file info reader should be closed
           after upload or not.
           *Default: `False`*
 
+        - `workers: int`  
+          Number of APPEND segments uploaded concurrently.
+          If not passed, `UPLOAD_WORKERS` is used.  
+          *Default: `None`*
+
+        - `stop: threading.Event`  
+          Event checked before each segment. Once it is
+          set, the upload is aborted with an
+          `UploadCancelledException`.  
+          *Default: `None`*
+
         **Returns**
 
         - `Media`  
-          Result media object.
+          Result media object. Videos and gifs may still
+          be processed, which is indicated by its
+          `processing_info`, see `wait_for_processing`.
         """
 
+        cache_key = None
+        if self._media_cache is not None and isinstance(file_info, FileInfo):
+            cache_key = media_cache_key(file_info, self._credentials.access_token_key)
+            cached = self._media_cache.get(cache_key)
+            if cached is not None:
+                if close_after:
+                    file_info.close()
+                return Media(cached)
+
         # --- INIT ------------------------------------------------------------
-        res = self.upload_media_request(
-            command='INIT',
-            params={
-                'total_bytes': file_info.size,
-                'media_type': file_info.mime_type,
-            })
-        
-        res_data = res.json()
-        if 'media_id_string' not in res_data:
-            raise Exception('"media_id_string" not contained in response body')
-        media_id = res_data['media_id']
+        res = self.upload_media_request(command='INIT', params=self._init_params(file_info))
+        media_id = self._init_media_id(self._json_decoder(res.content))
 
         # --- APPEND ----------------------------------------------------------
-        boundary_uuid = uuid.uuid4().hex
-        boundary = '--{0}'.format(boundary_uuid).encode('utf8')
-        for chunk in utils.chunk_file(file_info, self.UPLOAD_CHUNK_SIZE):
-            body_data = (
-                # COMMAND
-                boundary,
-                b'Content-Disposition: form-data; name="command"',
-                b'',
-                b'APPEND',
-                # MEDIA_ID
-                boundary,
-                b'Content-Disposition: form-data; name="media_id"',
-                b'',
-                str(media_id).encode('utf8'),
-                # MEDIA
-                boundary,
-                'Content-Disposition: form-data; name="media"; filename="{0!r}"'
-                    .format(file_info.file_name).encode('utf8'),
-                b'Content-Type: application/octet-stream',
-                b'',
-                chunk.data,
-                # SEGMENT_INDEX
-                boundary,
-                b'Content-Disposition: form-data; name="segment_index"',
-                b'',
-                str(chunk.index).encode('utf8'),
-                boundary + b'--'
-            )
-            body = b'\r\n'.join(body_data)
-
-            self.upload_media_request(
-                headers={ 
-                    'Content-Type': 'multipart/form-data; boundary={0}'
-                        .format(boundary_uuid), 
-                    'Content-Length': str(len(body)),
-                },
-                raw=body)
+        workers = workers or self.UPLOAD_WORKERS
+        chunks = self._upload_chunks(file_info, workers)
+        try:
+            self._upload_segments(media_id, file_info, chunks, workers, stop)
+        finally:
+            chunks.close()
 
         # --- FINALIZE --------------------------------------------------------
+        self._check_stop(stop)
         res = self.upload_media_request(
             command='FINALIZE',
             params={
@@ -335,15 +756,26 @@ class APISession:
         if res == None:
             raise NoneResponseException()
 
-        return Media(res.json())
+        res_data = self._json_decoder(res.content)
+        if cache_key is not None:
+            self._media_cache.set(cache_key, res_data)
+
+        return Media(res_data)
 
-    def upload_attachments(self, media: list, close_after: bool = False) -> Iterator[Media]:
+    def upload_attachments(self, media: list, close_after: bool = False, pipelined: bool = None) -> Iterator[Media]:
         """
         Upload a list of media using chunked upload.
         The list of media can only contain either 4 photos,
         1 gif or 1 video. Everything else will raise an
         exception.
 
+        All media are uploaded concurrently; the resulting
+        Media objects are yielded in the order of `media`.
+        If one upload fails, the other uploads stop before
+        their next segment. Once they have stopped, the
+        files opened here are closed and the exception is
+        re-raised.
+
         **Parameters**
 
         - `media: list`  
@@ -356,28 +788,59 @@ class APISession:
           uploading or not.
           *Default: `False`*
 
+        - `pipelined: bool`  
+          Upload online files while they are downloaded
+          instead of downloading them into a temporary file
+          first. Falls back to the temporary file if the
+          server does not send the file size. If not passed,
+          `PIPELINE_URL_MEDIA` is used.  
+          *Default: `None`*
+
         **Returns**
 
         - `Iterator[Media]`  
           Iterator of uploaded Media objects.
         """
 
-        max_attachable = None
-        files = []
+        if pipelined is None:
+            pipelined = self.PIPELINE_URL_MEDIA
+
+        files, opened = self._attachment_files(media, pipelined)
+        try:
+            results = self._upload_files(files, close_after)
+        except:
+            for file_info in opened:
+                file_info.close()
+            raise
 
-        for m in media:
-            file_info = m if type(m) == FileInfo else utils.try_get_file(m)
-            i = utils.check_upload_compatibility(file_info)
-            files.append(file_info)
-            if not max_attachable:
-                max_attachable = i
+        yield from results
 
-        if max_attachable and len(media) > max_attachable:
-            raise Exception('you can only attach up to {} files using this attachment type.'
-                .format(max_attachable))
+    def _upload_files(self, files: list, close_after: bool) -> List[Media]:
+        """
+        Uploads the files concurrently via `upload_file_cunked`
+        and returns the Media objects in the order of `files`.
+        Each file gets its own thread, so all uploads start at
+        once. If one upload fails, the uploads not yet started
+        are cancelled and the running ones are stopped via a
+        shared event before their next segment. The exception
+        is re-raised once they have stopped.
+        """
 
-        for f in files:
-            yield self.upload_file_cunked(f, close_after=close_after)
+        if len(files) == 1:
+            return [self.upload_file_cunked(files[0], close_after=close_after)]
+
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=len(files)) as executor:
+            futures = [executor.submit(self.upload_file_cunked, f, close_after=close_after, stop=stop)
+                for f in files]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            failed = [f for f in futures if f in done and f.exception() is not None]
+            if failed:
+                stop.set()
+                for future in futures:
+                    future.cancel()
+                failed[0].result()
+            return [future.result() for future in futures]
 
     ################
     # STATUSES API #
@@ -386,6 +849,9 @@ class APISession:
     def statuses_update(self, status: str, media: [list, str] = None, **kwargs) -> Tweet:
         """
         Create a Tweet with specified content.
+        Attached videos and gifs are posted once their
+        processing has finished, which is waited for up
+        to `PROCESSING_TIMEOUT` seconds.
 
         **Parameters**
 
@@ -420,13 +886,13 @@ class APISession:
             for media_obj in self.upload_attachments(media):
                 media_objs.append(media_obj)
 
+            # Media can only be attached once processed.
+            media_objs = self.wait_for_processing_many(media_objs, self.PROCESSING_TIMEOUT)
+
             data['media_ids'] = ','.join([m.id_str for m in media_objs])
         
         res = self.request('POST', 'statuses/update.json', data=data)
-        if not res:
-            raise NoneResponseException()
-
-        return Tweet(res, self)
+        return Tweet(self._required(res), self)
 
     def statuses_destroy(self, id: [str, int], **kwargs) -> Tweet:
         """
@@ -447,13 +913,8 @@ class APISession:
           The tweet ofbject which was deleted.
         """
         
-        data = kwargs
-
-        res = self.request('POST', 'statuses/destroy/{}.json'.format(id), data=data)
-        if not res:
-            raise NoneResponseException()
-
-        return Tweet(res)
+        res = self.request('POST', 'statuses/destroy/{}.json'.format(id), data=kwargs)
+        return Tweet(self._required(res))
 
     def statuses_show(self, id: [str, int], **kwargs) -> Tweet:
         """
@@ -478,16 +939,19 @@ class APISession:
         """
 
         data = kwargs
-
         data['id'] = id
 
-        res = self.request('GET', 'statuses/show.json', params=data)
-        if not res:
-            raise NoneResponseException()
-        
-        return Tweet(res, self)
+        self._check_negative(id)
+        try:
+            res = self.request('GET', 'statuses/show.json', params=data)
+        except RequestFailedException as e:
+            self._add_negative(id, e)
+            raise
 
-    def statuses_lookup(self, ids: List[str], raise_on_none: bool = False, **kwargs) -> Dict[str, Tweet]:
+        return Tweet(self._required(res), self)
+
+    def statuses_lookup(self, ids: List[str], raise_on_none: bool = False,
+        projection: [str, List[str]] = None, **kwargs) -> Dict[str, Tweet]:
         """
         Get details about up to 100 tweets. The returned
         dictionary keys represent the original requested
@@ -505,6 +969,13 @@ class APISession:
           Raise an `NoneResponseException` exception if
           a Tweet could not be fetched for a given ID.
 
+        - `projection: [str, List[str]]`  
+          `PROJECTION_RAW` to get the raw response dicts
+          or a list of fields to get dicts only containing
+          these fields instead of Tweet objects. If not
+          passed, the sessions projection is used.  
+          *Default: `None`*
+
         - `**kwargs:`  
           Additional agruments passed directly to the 
           request parameters.
@@ -516,27 +987,70 @@ class APISession:
           result Tweet object, which can be `None`.
         """
 
-        ln = len(ids)
-        if ln < 1 or ln > 100:
-            raise ParameterOutOfBoundsException('index must be in range [1, 100]')
+        ids, tweets = self._statuses_lookup_ids(ids, raise_on_none)
+        if ids:
+            tweets.update(self._statuses_lookup(ids, raise_on_none, projection, **kwargs))
+        return tweets
 
-        data = kwargs
+    def _statuses_lookup(self, ids: List[str], raise_on_none: bool,
+        projection: [str, List[str]], **kwargs) -> Dict[str, Tweet]:
+        """
+        Requests a batch of up to 100 Tweets and adds
+        the IDs returned as `None` to the negative cache.
+        """
 
-        data['id'] = ','.join([str(id) for id in ids])
-        data['map'] = True
+        res = self.request('GET', 'statuses/lookup.json',
+            params=self._statuses_lookup_params(ids, kwargs))
+        return self._statuses_lookup_result(res, raise_on_none, projection)
 
-        res = self.request('GET', 'statuses/lookup.json', params=data)
-    
-        if not res or 'id' not in res:
-            raise NoneResponseException()
+    def statuses_lookup_bulk(self, ids: List[str], raise_on_none: bool = False, workers: int = 4,
+        projection: [str, List[str]] = None, **kwargs) -> Dict[str, Tweet]:
+        """
+        Get details about any number of tweets. The IDs are
+        split into batches of 100 which are requested
+        concurrently via `statuses_lookup` and merged into
+        one result dictionary of the same shape.
+        All requests are subject to the sessions rate limit
+        handling.
 
-        tweets = {}
+        **Parameters**
 
-        for tid, obj in res.get('id').items():
-            if not obj and raise_on_none:
-                raise NoneResponseException()
-            tweets[tid] = Tweet(obj, self) if obj else None
+        - `ids: list`  
+          List of tweet IDs to be fetched.
+
+        - `raise_on_none: boolean`  
+          Raise an `NoneResponseException` exception if
+          a Tweet could not be fetched for a given ID.
 
+        - `workers: int`  
+          Maximum number of batches requested at once.  
+          *Default: `4`*
+
+        - `projection: [str, List[str]]`  
+          `PROJECTION_RAW` to get the raw response dicts
+          or a list of fields to get dicts only containing
+          these fields instead of Tweet objects. If not
+          passed, the sessions projection is used.  
+          *Default: `None`*
+
+        - `**kwargs:`  
+          Additional agruments passed directly to the 
+          request parameters.
+
+        **Returns**
+
+        - `Dict[[int, str], Tweet]`  
+          Tweet IDs as keys paired with the corresponding
+          result Tweet object, which can be `None`.
+        """
+
+        batches, tweets = self._statuses_lookup_batches(ids, raise_on_none)
+
+        def lookup(batch):
+            return self._statuses_lookup(batch, raise_on_none, projection, **kwargs)
+
+        if batches:
+            tweets.update(self._run_batches(lookup, batches, workers))
         return tweets
 
     def statuses_retweet(self, id: [str, int], **kwargs) -> Tweet:
@@ -559,13 +1073,8 @@ class APISession:
           data information.
         """
 
-        data = kwargs
-        
-        res = self.request('POST', 'statuses/retweet/{}.json'.format(id), params=data)
-        if not res:
-            return NoneResponseException()
-
-        return Tweet(res, self)
+        res = self.request('POST', 'statuses/retweet/{}.json'.format(id), params=kwargs)
+        return Tweet(self._required(res), self)
 
     def statuses_unretweet(self, id: [str, int], **kwargs) -> Tweet:
         """
@@ -586,13 +1095,8 @@ class APISession:
           Tweet object of the revoked retweet.
         """
 
-        data = kwargs
-
-        res = self.request('POST', 'statuses/unretweet/{}.json'.format(id), params=data)
-        if not res:
-            return NoneResponseException()
-
-        return Tweet(res)
+        res = self.request('POST', 'statuses/unretweet/{}.json'.format(id), params=kwargs)
+        return Tweet(self._required(res))
 
     def statuses_retweets(self, id: [str, int], count: int = None, **kwargs) -> List[Tweet]:
         """
@@ -621,18 +1125,9 @@ class APISession:
           retweets details.
         """
 
-        data = kwargs
-
-        if count:
-            if count < 1 or count > 100:
-                raise ParameterOutOfBoundsException('count must be in range of [1, 100]')
-            data['count'] = count
-
-        res = self.request('GET', 'statuses/retweets/{}.json'.format(id), params=data)
-        if not res:
-            raise NoneResponseException()
-
-        return [Tweet(r, self) for r in res]
+        res = self.request('GET', 'statuses/retweets/{}.json'.format(id),
+            params=self._count_param(count, kwargs))
+        return [Tweet(r, self) for r in self._required(res)]
 
     def statuses_retweets_of_me(self, 
         count: int = None,
@@ -681,27 +1176,11 @@ class APISession:
           Result list of Tweet objects.
         """
 
-        data = kwargs
-
-        data['include_entities'] = include_entities
-        data['include_user_entities'] = include_user_entities
-
-        if count:
-            if count < 1 or count > 100:
-                raise ParameterOutOfBoundsException('count must be in range of [1, 100]')
-            data['count'] = count
-
-        if since_id:
-            data['since_id'] = since_id
-
-        if max_id:
-            data['max_id'] = max_id
+        data = self._retweets_of_me_params(count, since_id, max_id,
+            include_entities, include_user_entities, kwargs)
 
         res = self.request('GET', 'statuses/retweets_of_mine', params=data)
-        if not res:
-            raise NoneResponseException()
-
-        return [Tweet(r, self) for r in res]
+        return [Tweet(r, self) for r in self._required(res)]
 
     #################
     # FAVORITES API #
@@ -728,12 +1207,9 @@ class APISession:
 
         data = kwargs
         data['id'] = id
-        
-        res = self.request('POST', 'favorites/create.json', data=data)
-        if not res:
-            raise NoneResponseException()
 
-        return Tweet(res, self)
+        res = self.request('POST', 'favorites/create.json', data=data)
+        return Tweet(self._required(res), self)
 
     def favorites_destroy(self, id: [str, int], **kwargs) -> Tweet:
         """
@@ -759,10 +1235,7 @@ class APISession:
         data['id'] = id
 
         res = self.request('POST', 'favorites/destroy.json', data=data)
-        if not res:
-            raise NoneResponseException()
-
-        return Tweet(res, self)
+        return Tweet(self._required(res), self)
 
     #############
     # USERS API #
@@ -794,22 +1267,12 @@ class APISession:
           Fetched user object.
         """
 
-        if not id and not screen_name:
-            raise ParameterNoneException()
-
-        data = kwargs
-        if id: 
-            data['user_id'] = id
-        if screen_name: 
-            data['screen_name'] = screen_name
-
-        res = self.request('GET', 'users/show.json', params=data)
-        if not res:
-            raise NoneResponseException()
-
-        return User(res, self)
+        res = self.request('GET', 'users/show.json',
+            params=self._user_params(id, screen_name, kwargs))
+        return User(self._required(res), self)
 
-    def users_lookup(self, ids: List[str] = None, screen_names: List[str] = None, **kwargs) -> Dict[str, User]:
+    def users_lookup(self, ids: List[str] = None, screen_names: List[str] = None,
+        projection: [str, List[str]] = None, **kwargs) -> Dict[str, User]:
         """
         Fetches up to 100 users by their ids OR screen
         names (Twitter handles).
@@ -827,6 +1290,13 @@ class APISession:
           (handles).  
           *Default: `none`*
 
+        - `projection: [str, List[str]]`  
+          `PROJECTION_RAW` to get the raw response dicts
+          or a list of fields to get dicts only containing
+          these fields instead of User objects. If not
+          passed, the sessions projection is used.  
+          *Default: `None`*
+
         - `**kwargs:`  
           Additional agruments passed directly to the 
           request parameters.
@@ -842,33 +1312,61 @@ class APISession:
           key.
         """
 
-        if not ids and not screen_names:
-            raise ParameterNoneException()
+        res = self.request('GET', 'users/lookup.json',
+            params=self._users_lookup_params(ids, screen_names, kwargs))
+        return self._users_lookup_result(res, projection)
 
-        data = kwargs
-        ln = 0
-        if ids and len(ids) > 0:
-            data['user_id'] = ','.join([str(id) for id in ids])
-            ln += len(ids)
-        if screen_names and len(screen_names) > 0:
-            data['screen_name'] = ','.join(screen_names)
-            ln += len(screen_names)
-
-        if ln < 1 or ln > 100:
-            raise ParameterOutOfBoundsException(
-                'ids + screen_names length must be in range [1, 100]')
-
-        res = self.request('GET', 'users/lookup.json', params=data)
-        if not res:
-            return NoneResponseException()
-
-        users = {}
-        for r in res:
-          user = User(r, self)
-          users[user.id_str] = user
-          users[user.username or user.screen_name] = user
-
-        return users
+    def users_lookup_bulk(self, ids: List[str] = None, screen_names: List[str] = None, workers: int = 4,
+        projection: [str, List[str]] = None, **kwargs) -> Dict[str, User]:
+        """
+        Fetches any number of users by their ids and/or
+        screen names (Twitter handles). The values are
+        split into batches of 100 which are requested
+        concurrently via `users_lookup` and merged into
+        one result dictionary of the same shape.
+        All requests are subject to the sessions rate limit
+        handling.
+
+        **Parameters**
+
+        - `ids: List[str]`  
+          List of desired user IDs.  
+          *Default: `none`*
+
+        - `screen_names: List[str]`  
+          List of desired user screen names
+          (handles).  
+          *Default: `none`*
+
+        - `workers: int`  
+          Maximum number of batches requested at once.  
+          *Default: `4`*
+
+        - `projection: [str, List[str]]`  
+          `PROJECTION_RAW` to get the raw response dicts
+          or a list of fields to get dicts only containing
+          these fields instead of User objects. If not
+          passed, the sessions projection is used.  
+          *Default: `None`*
+
+        - `**kwargs:`  
+          Additional agruments passed directly to the 
+          request parameters.
+
+        **Returns**
+
+        - `Dict[str, User]`  
+          A dict of user IDs and user names as keys
+          linked to the corresponding user objects.
+        """
+
+        batches = self._users_lookup_batches(ids, screen_names)
+
+        def lookup(batch):
+            key, values = batch
+            return self.users_lookup(**{key: values}, projection=projection, **kwargs)
+
+        return self._run_batches(lookup, batches, workers)
 
     def followers_ids(self, id: [str, int] = None, screen_name: str = None, **kwargs) -> List[str]:
         """
@@ -896,20 +1394,83 @@ class APISession:
           List of IDs of all followers of the desired user.
         """
 
-        if not id and not screen_name:
-            raise ParameterNoneException()
+        return list(self.followers_ids_iter(id, screen_name, prefetch=False, **kwargs))
+
+    def followers_ids_iter(self, id: [str, int] = None, screen_name: str = None,
+        cursor: int = -1, prefetch: bool = True, **kwargs) -> Cursor:
+        """
+        Returns a lazy `Cursor` over the user IDs (as strings)
+        of all followers of the user specified by its ID.
+
+        **Parameters**
+
+        - `id: [str, int]`  
+          ID of the user to get followers list from.  
+          *Default: `None`*
+
+        - `screen_name: str`  
+          Screen name (handle) of the user to get 
+          followers list from.  
+          *Default: `None`*
+
+        - `cursor: int`  
+          Cursor to start or resume from.  
+          *Default: `-1`*
+
+        - `prefetch: bool`  
+          Request the next page in the background.  
+          *Default: `True`*
+
+        - `**kwargs:`  
+          Additional agruments passed directly to the 
+          request parameters.
+
+        **Returns**
+
+        - `Cursor`  
+          Iterator of IDs of all followers of the desired user.
+        """
 
-        params = kwargs
+        params = self._user_params(id, screen_name, kwargs)
         params['stringify_ids'] = True
 
-        if id:
-            params['user_id'] = id
-        if screen_name:
-            params['screen_name'] = screen_name
+        return self.cursor('followers/ids.json', 'ids', params=params,
+            cursor=cursor, prefetch=prefetch)
 
-        return self.cursor_request('followers/ids.json', 'ids', params=params)
+    def followers_id_set(self, id: [str, int] = None, screen_name: str = None, **kwargs) -> IdSet:
+        """
+        Returns the IDs of all followers of the user
+        specified by its ID as compact `IdSet`. The pages are
+        requested with the maximum size of `IDS_PAGE_SIZE` IDs
+        and added to the set as they arrive, so no list of
+        boxed IDs is built.
+
+        **Parameters**
+
+        - `id: [str, int]`  
+          ID of the user.  
+          *Default: `None`*
 
-    def followers_list(self, id: [str, int] = None, screen_name: str = None, **kwargs) -> List[User]:
+        - `screen_name: str`  
+          Screen name (handle) of the user.  
+          *Default: `None`*
+
+        - `**kwargs:`  
+          Additional agruments passed directly to the 
+          request parameters.
+
+        **Returns**
+
+        - `IdSet`  
+          Sorted set of the numeric user IDs.
+        """
+
+        params = self._user_params(id, screen_name, kwargs)
+        return self.cursor('followers/ids.json', 'ids', count=self.IDS_PAGE_SIZE, params=params,
+            max_count=self.IDS_PAGE_SIZE).to_idset()
+
+    def followers_list(self, id: [str, int] = None, screen_name: str = None,
+        projection: [str, List[str]] = None, **kwargs) -> List[User]:
         """
         Returns a list of User objects of the users
         following the target user.
@@ -925,6 +1486,13 @@ class APISession:
           followers list from.  
           *Default: `None`*
 
+        - `projection: [str, List[str]]`  
+          `PROJECTION_RAW` to get the raw response dicts
+          or a list of fields to get dicts only containing
+          these fields instead of User objects. If not
+          passed, the sessions projection is used.  
+          *Default: `None`*
+
         - `**kwargs:`  
           Additional agruments passed directly to the 
           request parameters.
@@ -936,19 +1504,57 @@ class APISession:
           the target user.
         """
 
-        if not id and not screen_name:
-            raise ParameterNoneException()
+        return list(self.followers_list_iter(id, screen_name, prefetch=False,
+            projection=projection, **kwargs))
+
+    def followers_list_iter(self, id: [str, int] = None, screen_name: str = None,
+        cursor: int = -1, prefetch: bool = True, projection: [str, List[str]] = None,
+        **kwargs) -> Cursor:
+        """
+        Returns a lazy `Cursor` over the User objects of
+        the users following the target user.
+
+        **Parameters**
+
+        - `id: [str, int]`  
+          ID of the user to get followers list from.  
+          *Default: `None`*
+
+        - `screen_name: str`  
+          Screen name (handle) of the user to get 
+          followers list from.  
+          *Default: `None`*
+
+        - `cursor: int`  
+          Cursor to start or resume from.  
+          *Default: `-1`*
+
+        - `prefetch: bool`  
+          Request the next page in the background.  
+          *Default: `True`*
+
+        - `projection: [str, List[str]]`  
+          `PROJECTION_RAW` to get the raw response dicts
+          or a list of fields to get dicts only containing
+          these fields instead of User objects. If not
+          passed, the sessions projection is used.  
+          *Default: `None`*
 
-        params = kwargs
+        - `**kwargs:`  
+          Additional agruments passed directly to the 
+          request parameters.
 
-        if id:
-            params['user_id'] = id
-        if screen_name:
-            params['screen_name'] = screen_name
+        **Returns**
 
-        results = self.cursor_request('followers/list.json', 'users', params=params)
+        - `Cursor`  
+          Iterator of User objects of all followers of 
+          the target user.
+        """
 
-        return [User(r, self) for r in results]
+        params = self._user_params(id, screen_name, kwargs)
+        return self.cursor('followers/list.json', 'users', params=params,
+            cursor=cursor, prefetch=prefetch,
+            item_factory=self._projector(projection, lambda r: User(r, self)))
 
     def friends_ids(self, id: [str, int] = None, screen_name: str = None, **kwargs) -> List[str]:
         """
@@ -977,21 +1583,84 @@ class APISession:
           List of IDs of all friends of the desired user.
         """
 
+        return list(self.friends_ids_iter(id, screen_name, prefetch=False, **kwargs))
+
+    def friends_ids_iter(self, id: [str, int] = None, screen_name: str = None,
+        cursor: int = -1, prefetch: bool = True, **kwargs) -> Cursor:
+        """
+        Returns a lazy `Cursor` over the user IDs (as strings)
+        of all friends (the user is following) of the user
+        specified by its ID.
+
+        **Parameters**
+
+        - `id: [str, int]`  
+          ID of the user to get friends list from.  
+          *Default: `None`*
+
+        - `screen_name: str`  
+          Screen name (handle) of the user to get 
+          friends list from.  
+          *Default: `None`*
+
+        - `cursor: int`  
+          Cursor to start or resume from.  
+          *Default: `-1`*
+
+        - `prefetch: bool`  
+          Request the next page in the background.  
+          *Default: `True`*
+
+        - `**kwargs:`  
+          Additional agruments passed directly to the 
+          request parameters.
 
-        if not id and not screen_name:
-            raise ParameterNoneException()
+        **Returns**
 
-        params = kwargs
+        - `Cursor`  
+          Iterator of IDs of all friends of the desired user.
+        """
+
+        params = self._user_params(id, screen_name, kwargs)
         params['stringify_ids'] = True
 
-        if id:
-            params['user_id'] = id
-        if screen_name:
-            params['screen_name'] = screen_name
+        return self.cursor('friends/ids.json', 'ids', params=params,
+            cursor=cursor, prefetch=prefetch)
 
-        return self.cursor_request('friends/ids.json', 'ids', params=params)
+    def friends_id_set(self, id: [str, int] = None, screen_name: str = None, **kwargs) -> IdSet:
+        """
+        Returns the IDs of all users followed by the user
+        specified by its ID as compact `IdSet`. The pages are
+        requested with the maximum size of `IDS_PAGE_SIZE` IDs
+        and added to the set as they arrive, so no list of
+        boxed IDs is built.
 
-    def friends_list(self, id: [str, int] = None, screen_name: str = None, **kwargs) -> List[User]:
+        **Parameters**
+
+        - `id: [str, int]`  
+          ID of the user.  
+          *Default: `None`*
+
+        - `screen_name: str`  
+          Screen name (handle) of the user.  
+          *Default: `None`*
+
+        - `**kwargs:`  
+          Additional agruments passed directly to the 
+          request parameters.
+
+        **Returns**
+
+        - `IdSet`  
+          Sorted set of the numeric user IDs.
+        """
+
+        params = self._user_params(id, screen_name, kwargs)
+        return self.cursor('friends/ids.json', 'ids', count=self.IDS_PAGE_SIZE, params=params,
+            max_count=self.IDS_PAGE_SIZE).to_idset()
+
+    def friends_list(self, id: [str, int] = None, screen_name: str = None,
+        projection: [str, List[str]] = None, **kwargs) -> List[User]:
         """
         Returns a list of User objects of the users
         the target user is following (friends).
@@ -1007,6 +1676,13 @@ class APISession:
           friends list from.  
           *Default: `None`*
 
+        - `projection: [str, List[str]]`  
+          `PROJECTION_RAW` to get the raw response dicts
+          or a list of fields to get dicts only containing
+          these fields instead of User objects. If not
+          passed, the sessions projection is used.  
+          *Default: `None`*
+
         - `**kwargs:`  
           Additional agruments passed directly to the 
           request parameters.
@@ -1018,16 +1694,54 @@ class APISession:
           the target user.
         """
 
-        if not id and not screen_name:
-            raise ParameterNoneException()
+        return list(self.friends_list_iter(id, screen_name, prefetch=False,
+            projection=projection, **kwargs))
+
+    def friends_list_iter(self, id: [str, int] = None, screen_name: str = None,
+        cursor: int = -1, prefetch: bool = True, projection: [str, List[str]] = None,
+        **kwargs) -> Cursor:
+        """
+        Returns a lazy `Cursor` over the User objects of
+        the users the target user is following (friends).
 
-        params = kwargs
+        **Parameters**
+
+        - `id: [str, int]`  
+          ID of the user to get friends list from.  
+          *Default: `None`*
+
+        - `screen_name: str`  
+          Screen name (handle) of the user to get 
+          friends list from.  
+          *Default: `None`*
 
-        if id:
-            params['user_id'] = id
-        if screen_name:
-            params['screen_name'] = screen_name
+        - `cursor: int`  
+          Cursor to start or resume from.  
+          *Default: `-1`*
 
-        results = self.cursor_request('friends/list.json', 'users', params=params)
+        - `prefetch: bool`  
+          Request the next page in the background.  
+          *Default: `True`*
+
+        - `projection: [str, List[str]]`  
+          `PROJECTION_RAW` to get the raw response dicts
+          or a list of fields to get dicts only containing
+          these fields instead of User objects. If not
+          passed, the sessions projection is used.  
+          *Default: `None`*
+
+        - `**kwargs:`  
+          Additional agruments passed directly to the 
+          request parameters.
+
+        **Returns**
+
+        - `Cursor`  
+          Iterator of User objects of all friends of 
+          the target user.
+        """
 
-        return [User(r, self) for r in results]
\ No newline at end of file
+        params = self._user_params(id, screen_name, kwargs)
+        return self.cursor('friends/list.json', 'users', params=params,
+            cursor=cursor, prefetch=prefetch,
+            item_factory=self._projector(projection, lambda r: User(r, self)))
\ No newline at end of file
@@ -0,0 +1,944 @@
+import time
+import urllib
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterator, List, Dict
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .base import BaseAPISession
+from .credentials import Credentials, CredentialPool, PooledCredentials
+from .exceptions import (
+    NoneResponseException,
+    ParameterOutOfBoundsException,
+    RequestFailedException
+)
+from .ratelimit import RATE_LIMIT_RAISE, endpoint_key
+from .retry import RetryPolicy
+from .media_cache import MediaCache, media_cache_key
+from .chunking import AdaptiveChunkSizer
+from .response_cache import ResponseCache, NegativeCache
+from .single_flight import AsyncSingleFlight
+from .processing import processing_delay
+from .cursor import AsyncCursor
+
+from ..utils import utils
+from ..objects import Tweet, Media, User
+from ..utils import FileInfo, MultipartEncoder, IdSet
+
+
+def _encode_params(params: dict) -> str:
+    """
+    Url-encodes a parameter dict the way requests
+    does it, which means `None` values are dropped.
+    """
+
+    if not params:
+        return ''
+    return urllib.parse.urlencode(
+        [(k, v) for k, v in params.items() if v is not None])
+
+
+class AsyncAPISession(BaseAPISession):
+    """
+    asyncio based counterpart of `APISession` using aiohttp.
+    All endpoint methods are coroutines mirroring the methods
+    of `APISession` with the same parameters and results.
+
+    The session must be started before usage, either by
+    awaiting `start()` or by using it as async context manager:
+
+        async with AsyncAPISession(creds) as session:
+            user = await session.users_show(screen_name='zekroTJA')
+
+    **Parameters**
+
+    - `credentials: [Credentials, CredentialPool]`  
+      APP or User credentials to authenticate against
+      the Twitter API, or a pool of multiple credentials
+      the requests will be spread over.
+
+    - `rate_limit_mode: str`  
+      Behaviour on exhausted rate limit windows, see
+      `APISession`.  
+      *Default: `'raise'`*
+
+    - `max_concurrency: int`  
+      Maximum number of requests in flight at once.  
+      *Default: `100`*
+
+    - `retry_policy: RetryPolicy`  
+      Policy for retrying rate limited and transiently
+      failing requests, see `APISession`.  
+      *Default: `None`*
+
+    - `json_decoder: Callable[[bytes], object]`  
+      Function decoding the raw response bodies,
+      see `APISession`.  
+      *Default: `None`*
+
+    - `projection: [str, List[str]]`  
+      Default projection of lookup and list results,
+      see `APISession`.  
+      *Default: `None`*
+
+    - `media_cache: MediaCache`  
+      Cache of uploaded media by file content,
+      see `APISession`.  
+      *Default: `None`*
+
+    - `chunk_sizer: AdaptiveChunkSizer`  
+      Adaptive size of upload segments,
+      see `APISession`.  
+      *Default: `None`*
+
+    - `response_cache: ResponseCache`  
+      Cache of responses of read endpoints,
+      see `APISession`.  
+      *Default: `None`*
+
+    - `negative_cache: NegativeCache`  
+      Cache of IDs of deleted and inaccessible Tweets,
+      see `APISession`.  
+      *Default: `None`*
+
+    - `coalesce_requests: bool`  
+      Whether concurrent identical GET requests of
+      tasks share one request, see `APISession`.  
+      *Default: `False`*
+    """
+
+    def __init__(self, credentials: [Credentials, CredentialPool],
+        rate_limit_mode: str = RATE_LIMIT_RAISE,
+        max_concurrency: int = 100,
+        retry_policy: RetryPolicy = None,
+        json_decoder: Callable[[bytes], object] = None,
+        projection: [str, List[str]] = None,
+        media_cache: MediaCache = None,
+        chunk_sizer: AdaptiveChunkSizer = None,
+        response_cache: ResponseCache = None,
+        negative_cache: NegativeCache = None,
+        coalesce_requests: bool = False):
+
+        if aiohttp is None:
+            raise ImportError('AsyncAPISession requires aiohttp to be installed')
+        if max_concurrency < 1:
+            raise ParameterOutOfBoundsException('max_concurrency must be larger than 0')
+
+        super().__init__(credentials, rate_limit_mode, retry_policy, json_decoder,
+            projection, media_cache, chunk_sizer, response_cache, negative_cache)
+        self._single_flight = AsyncSingleFlight() if coalesce_requests else None
+        self._max_concurrency = max_concurrency
+
+        self._session = None
+        self._semaphore = None
+
+    async def start(self):
+        """
+        Opens the underlying HTTP session, obtains a
+        bearer token if no user context credentials
+        are given and verifies the credentials.
+        """
+
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self._max_concurrency))
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        for entry in self._pool.entries:
+            if entry.user_context:
+                self._auth[entry] = entry.credentials.to_oauth1_client()
+            else:
+                await self.obtain_user_context_token(entry.credentials)
+
+        await self.verify_credentials()
+
+    async def close(self):
+        """
+        Closes the underlying HTTP session.
+        """
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    ############################
+    # GENERAL REQUEST HANDLING #
+    ############################
+
+    async def _with_retries(self, fn, method: str, endpoint: str) -> object:
+        """
+        Async version of `APISession._with_retries`
+        awaiting the coroutine function `fn`.
+        """
+
+        if self._retry_policy is None:
+            return await fn()
+        return await self._retry_policy.call_async(fn, method, endpoint)
+
+    async def _acquire_rate_limit(self, endpoint: str, method: str = 'GET',
+        entry: PooledCredentials = None) -> PooledCredentials:
+        picked, wait = self._pool.reserve(endpoint, method, entry)
+        while wait > 0:
+            await asyncio.sleep(wait)
+            picked, wait = self._pool.reserve(endpoint, method, entry)
+        return picked
+
+    def _auth_headers(self, entry: PooledCredentials, method: str, url: str, body: str = None) -> dict:
+        """
+        Returns the authorization headers for a request.
+        `body` must only be passed for form encoded bodies,
+        which are then included into the OAuth1 signature.
+        """
+
+        auth = self._auth[entry]
+        if isinstance(auth, str):
+            return {'Authorization': 'Bearer {0}'.format(auth)}
+
+        headers = {}
+        if body is not None:
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        _, headers, _ = auth.sign(url, http_method=method,
+            body=body, headers=headers)
+        return headers
+
+    async def request(self, method: str, resource_path: str,
+        params: dict = None, data: dict = None) -> object:
+        """
+        Request the Twitter API with the defined authentication
+        credentials.
+        This method raises an exception on failed authentication or request.
+
+        **Parameters**
+
+        - `method : str`  
+          Request method.
+
+        - `resource_path : str`  
+          Path to the requested resource (without root URI).
+          Leading '/' will be cut off.
+
+        - `params : dict`  
+          URL query parameters.
+
+        - `data : dict`  
+          Form encoded body parameters.
+
+        **Returns**
+
+        - `Object`  
+          JSON-parsed response body.
+        """
+
+        endpoint = endpoint_key(resource_path)
+
+        url = self._resource_url(resource_path)
+        query = _encode_params(params)
+        if query:
+            url = '{0}?{1}'.format(url, query)
+        body = _encode_params(data) if data is not None else None
+
+        if method == 'GET':
+            key, generation, res = self._cache_get(endpoint, resource_path, params)
+            if res is None:
+                if self._single_flight is None:
+                    res = await self._request(method, endpoint, url, body)
+                else:
+                    res = await self._single_flight.do(key,
+                        lambda: self._request(method, endpoint, url, body))
+                self._cache_set(endpoint, key, generation, resource_path, params, res)
+            return res
+
+        try:
+            return await self._request(method, endpoint, url, body)
+        finally:
+            self._cache_invalidate(endpoint, resource_path, data or params)
+
+    async def _request(self, method: str, endpoint: str, url: str, body: str) -> object:
+        """
+        Sends the request bypassing the response cache.
+        """
+
+        async def send():
+            entry = await self._acquire_rate_limit(endpoint, method)
+            headers = self._auth_headers(entry, method, url, body)
+
+            async with self._semaphore:
+                async with self._session.request(method, url,
+                        data=body, headers=headers) as res:
+                    self._check_rate_limit(entry, endpoint, res.status, res.headers)
+
+                    if res.status < 200 or res.status >= 300:
+                        raise RequestFailedException(res.status, await res.text(), res.headers)
+
+                    return self._json_decoder(await res.read())
+
+        return await self._with_retries(send, method, endpoint)
+
+    async def cursor_request(self, resource_path: str, expected_key: str,
+        count: int = 200, params: dict = {}) -> AsyncIterator[object]:
+        """
+        Async iterator issuing cursored GET requests to the
+        Twitter API following the respond cursor for next
+        requests and yielding each response object contained
+        in `expected_key`.
+
+        **Parameters**
+
+        - `resource_path: str`  
+          Path to the requested resource (without root URI).
+          Leading '/' will be cut off.
+
+        - `expected_key: str`  
+          Key expected to be contained in the response grouping
+          all response objects.
+
+        - `count: int`  
+          Ammount of objects which will be requested at once.
+          Must be in range of [1, 200].
+
+        - `params: dict`  
+          Parameters passed to the single GET requests.
+
+        **Returns**
+
+        - `AsyncIterator[object]`  
+          Iterator of objects expected in `expected_key`.
+        """
+
+        async for obj in self.cursor(resource_path, expected_key,
+                count=count, params=params, prefetch=False):
+            yield obj
+
+    def cursor(self, resource_path: str, expected_key: str,
+        count: int = 200,
+        params: dict = {},
+        cursor: int = -1,
+        prefetch: bool = True,
+        item_factory = None,
+        max_count: int = 200) -> AsyncCursor:
+        """
+        Async version of `APISession.cursor` returning
+        an `AsyncCursor`.
+        """
+
+        return AsyncCursor(self, resource_path, expected_key,
+            count=count, params=params, cursor=cursor,
+            prefetch=prefetch, item_factory=item_factory,
+            max_count=max_count)
+
+    async def _run_batches(self, fn, batches: list, workers: int) -> dict:
+        """
+        Runs the coroutine function `fn` for each batch with
+        up to `workers` batches at once and merges the
+        resulting dicts. If one batch fails, the remaining
+        batches are cancelled and the exception is re-raised.
+        """
+
+        self._check_workers(workers)
+        limit = asyncio.Semaphore(workers)
+
+        async def run(batch):
+            async with limit:
+                return await fn(batch)
+
+        tasks = [asyncio.ensure_future(run(batch)) for batch in batches]
+        try:
+            batch_results = await asyncio.gather(*tasks)
+        except:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        results = {}
+        for r in batch_results:
+            results.update(r)
+        return results
+
+    async def obtain_user_context_token(self, credentials: Credentials = None):
+        """
+        Async version of `APISession.obtain_user_context_token`.
+        """
+
+        entry = self._pool.entry(credentials or self._credentials)
+        basic_token = self._basic_token(entry)
+
+        async def send():
+            await self._acquire_rate_limit('oauth2/token', entry=entry)
+
+            async with self._session.post(
+                    url='{0}/oauth2/token'.format(self.API_ROOT_URI),
+                    headers={
+                        'Content-Type': 'application/x-www-form-urlencoded;charset=UTF-8',
+                        'Authorization': 'Basic {0}'.format(basic_token),
+                    },
+                    data='grant_type=client_credentials') as res:
+
+                self._check_rate_limit(entry, 'oauth2/token', res.status, res.headers)
+                if res.status != 200:
+                    raise RequestFailedException(res.status, headers=res.headers)
+
+                return self._json_decoder(await res.read())
+
+        body = await self._with_retries(send, 'POST', 'oauth2/token')
+
+        self._auth[entry] = body.get('access_token')
+
+    async def verify_credentials(self, **kwargs) -> User:
+        """
+        Async version of `APISession.verify_credentials`.
+        """
+
+        res = await self.request('GET', 'account/verify_credentials.json', params=kwargs)
+        return User(self._required(res), self)
+
+    ##############
+    # UPLOAD API #
+    ##############
+
+    async def upload_media_request(self, command=None, params={}, form=None) -> object:
+        """
+        Async version of `APISession.upload_media_request`.
+        Instead of a raw body, a function returning an
+        `aiohttp.FormData` or a `MultipartEncoder` instance
+        can be passed as `form`, which overwrites `command`
+        and `params`. It is called once per attempt, because
+        form data can only be sent once.
+
+        **Returns**
+
+        - `object`  
+          JSON-parsed response body or `None`, if the
+          response has no content.
+        """
+
+        url = '{0}/media/upload.json'.format(self.API_UPLOAD_ROOT_URI)
+
+        if form is None:
+            params = dict(params)
+            params['command'] = command
+            encoded = _encode_params(utils.sort_dict_alphabetically(params))
+
+        async def send():
+            entry = await self._acquire_rate_limit('media/upload', 'POST')
+
+            if form is None:
+                body = encoded
+                headers = self._auth_headers(entry, 'POST', url, body)
+            else:
+                body = form()
+                headers = self._auth_headers(entry, 'POST', url)
+                if isinstance(body, MultipartEncoder):
+                    headers['Content-Type'] = body.content_type
+                    headers['Content-Length'] = str(len(body))
+
+            async with self._semaphore:
+                async with self._session.post(url, data=body, headers=headers) as res:
+                    self._check_rate_limit(entry, 'media/upload', res.status, res.headers)
+                    if res.status < 200 or res.status >= 300:
+                        raise RequestFailedException(res.status, headers=res.headers)
+
+                    content = await res.read()
+                    return self._json_decoder(content) if content else None
+
+        return await self._with_retries(send, 'POST', 'media/upload')
+
+    async def upload_media_status(self, media_id: [str, int]) -> Media:
+        """
+        Async version of `APISession.upload_media_status`.
+        """
+
+        url = '{0}/media/upload.json?{1}'.format(self.API_UPLOAD_ROOT_URI,
+            _encode_params({'command': 'STATUS', 'media_id': str(media_id)}))
+
+        async def send():
+            entry = await self._acquire_rate_limit('media/upload', 'GET')
+            headers = self._auth_headers(entry, 'GET', url)
+
+            async with self._semaphore:
+                async with self._session.get(url, headers=headers) as res:
+                    self._check_rate_limit(entry, 'media/upload', res.status, res.headers)
+                    if res.status < 200 or res.status >= 300:
+                        raise RequestFailedException(res.status, await res.text(), res.headers)
+
+                    return self._json_decoder(await res.read())
+
+        return Media(await self._with_retries(send, 'GET', 'media/upload'))
+
+    async def wait_for_processing(self, media: Media, timeout: float = None) -> Media:
+        """
+        Async version of `APISession.wait_for_processing`.
+        The event loop is not blocked while waiting.
+        """
+
+        async def poll():
+            current = media
+            delay = processing_delay(current, self.PROCESSING_INTERVAL)
+            while delay is not None:
+                await asyncio.sleep(delay)
+                current = await self.upload_media_status(current.id_str)
+                delay = processing_delay(current, self.PROCESSING_INTERVAL)
+            return current
+
+        try:
+            return await asyncio.wait_for(poll(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError('processing of media {} did not finish within {} seconds'
+                .format(media.id_str, timeout)) from None
+
+    async def wait_for_processing_many(self, media: List[Media], timeout: float = None) -> List[Media]:
+        """
+        Async version of `APISession.wait_for_processing_many`.
+        Each media is polled in its own task. If one fails,
+        the other tasks are cancelled.
+        """
+
+        tasks = [asyncio.ensure_future(self.wait_for_processing(m, timeout))
+            for m in media]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def _upload_segment(self, media_id: int, file_info: FileInfo, chunk: utils.FileChunk):
+        """
+        Async version of `APISession._upload_segment`.
+        The body is read in the default executor while
+        it is sent.
+        """
+
+        async def send():
+            start = time.monotonic()
+            res = await self.upload_media_request(
+                form=lambda: self._segment_body(media_id, file_info, chunk))
+            if self._chunk_sizer is not None:
+                self._chunk_sizer.record(chunk.size, time.monotonic() - start)
+            return res
+
+        policy = self._segment_retry_policy()
+        if policy is None:
+            return await send()
+        return await policy.call_async(send, 'POST', 'media/upload')
+
+    async def _upload_segments(self, media_id: int, file_info: FileInfo,
+        chunks: Iterator[utils.FileChunk], workers: int, reader: ThreadPoolExecutor):
+        """
+        Async version of `APISession._upload_segments`
+        using tasks instead of threads. The chunks are
+        taken from the iterator by the single thread of
+        `reader`, as they may be downloaded while iterating.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        pending = set()
+        try:
+            while True:
+                chunk = await loop.run_in_executor(reader, next, chunks, None)
+                if chunk is None:
+                    break
+                if len(pending) >= workers:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+                pending.add(asyncio.ensure_future(
+                    self._upload_segment(media_id, file_info, chunk)))
+            for task in pending:
+                await task
+        except:
+            for task in pending:
+                task.cancel()
+            raise
+
+    async def upload_file_cunked(self, file_info: [FileInfo, utils.RemoteFileInfo],
+        close_after: bool = False, workers: int = None) -> Media:
+        """
+        Async version of `APISession.upload_file_cunked`.
+        File chunks are read in an executor so that the
+        event loop is not blocked by file I/O. Instead of
+        setting a `stop` event, the task is cancelled.
+        """
+
+        cache_key = None
+        if self._media_cache is not None and isinstance(file_info, FileInfo):
+            cache_key = await asyncio.get_running_loop().run_in_executor(
+                None, media_cache_key, file_info, self._credentials.access_token_key)
+            cached = self._media_cache.get(cache_key)
+            if cached is not None:
+                if close_after:
+                    file_info.close()
+                return Media(cached)
+
+        # --- INIT ------------------------------------------------------------
+        res_data = await self.upload_media_request(command='INIT', params=self._init_params(file_info))
+        media_id = self._init_media_id(res_data)
+
+        # --- APPEND ----------------------------------------------------------
+        workers = workers or self.UPLOAD_WORKERS
+        chunks = self._upload_chunks(file_info, workers)
+        reader = ThreadPoolExecutor(max_workers=1)
+        try:
+            await self._upload_segments(media_id, file_info, chunks, workers, reader)
+        finally:
+            # A generator can not be closed while a next() call is
+            # still running in the reader, which is the case if the
+            # upload was cancelled meanwhile. Closing it in the same
+            # thread runs it after that call has returned.
+            reader.submit(chunks.close)
+            reader.shutdown(wait=False)
+
+        # --- FINALIZE --------------------------------------------------------
+        res_data = await self.upload_media_request(
+            command='FINALIZE',
+            params={
+                'media_id': str(media_id),
+            })
+
+        if close_after:
+            file_info.close()
+
+        if res_data == None:
+            raise NoneResponseException()
+
+        if cache_key is not None:
+            self._media_cache.set(cache_key, res_data)
+
+        return Media(res_data)
+
+    async def upload_attachments(self, media: list, close_after: bool = False, pipelined: bool = None) -> List[Media]:
+        """
+        Async version of `APISession.upload_attachments`.
+        The media are resolved to files in the default
+        executor, as this may download them. Running
+        uploads of other attachments are cancelled as well
+        if one upload fails.
+
+        **Returns**
+
+        - `List[Media]`  
+          List of uploaded Media objects.
+        """
+
+        if pipelined is None:
+            pipelined = self.PIPELINE_URL_MEDIA
+
+        files, opened = await asyncio.get_running_loop().run_in_executor(
+            None, self._attachment_files, media, pipelined)
+
+        tasks = [asyncio.ensure_future(self.upload_file_cunked(f, close_after=close_after))
+            for f in files]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except:
+            for task in tasks:
+                task.cancel()
+            # The files are only closed once no segment reads them.
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for file_info in opened:
+                file_info.close()
+            raise
+
+    ################
+    # STATUSES API #
+    ################
+
+    async def statuses_update(self, status: str, media: [list, str] = None, **kwargs) -> Tweet:
+        """
+        Async version of `APISession.statuses_update`.
+        Other tasks keep running while attached media
+        are processed.
+        """
+
+        data = kwargs
+        data['status'] = status
+
+        if media is not None:
+            if type(media) is not list:
+                media = [media]
+
+            media_objs = await self.upload_attachments(media)
+            # Media can only be attached once processed.
+            media_objs = await self.wait_for_processing_many(media_objs, self.PROCESSING_TIMEOUT)
+            data['media_ids'] = ','.join([m.id_str for m in media_objs])
+
+        res = await self.request('POST', 'statuses/update.json', data=data)
+        return Tweet(self._required(res), self)
+
+    async def statuses_destroy(self, id: [str, int], **kwargs) -> Tweet:
+        """
+        Async version of `APISession.statuses_destroy`.
+        """
+
+        res = await self.request('POST', 'statuses/destroy/{}.json'.format(id), data=kwargs)
+        return Tweet(self._required(res))
+
+    async def statuses_show(self, id: [str, int], **kwargs) -> Tweet:
+        """
+        Async version of `APISession.statuses_show`.
+        """
+
+        data = kwargs
+        data['id'] = id
+
+        self._check_negative(id)
+        try:
+            res = await self.request('GET', 'statuses/show.json', params=data)
+        except RequestFailedException as e:
+            self._add_negative(id, e)
+            raise
+
+        return Tweet(self._required(res), self)
+
+    async def statuses_lookup(self, ids: List[str], raise_on_none: bool = False,
+        projection: [str, List[str]] = None, **kwargs) -> Dict[str, Tweet]:
+        """
+        Async version of `APISession.statuses_lookup`.
+        """
+
+        ids, tweets = self._statuses_lookup_ids(ids, raise_on_none)
+        if ids:
+            tweets.update(await self._statuses_lookup(ids, raise_on_none, projection, **kwargs))
+        return tweets
+
+    async def _statuses_lookup(self, ids: List[str], raise_on_none: bool,
+        projection: [str, List[str]], **kwargs) -> Dict[str, Tweet]:
+        """
+        See `APISession._statuses_lookup`.
+        """
+
+        res = await self.request('GET', 'statuses/lookup.json',
+            params=self._statuses_lookup_params(ids, kwargs))
+        return self._statuses_lookup_result(res, raise_on_none, projection)
+
+    async def statuses_lookup_bulk(self, ids: List[str], raise_on_none: bool = False, workers: int = 4,
+        projection: [str, List[str]] = None, **kwargs) -> Dict[str, Tweet]:
+        """
+        Async version of `APISession.statuses_lookup_bulk`.
+        Up to `workers` batches are requested at once, which
+        is further bounded by the sessions `max_concurrency`.
+        """
+
+        batches, tweets = self._statuses_lookup_batches(ids, raise_on_none)
+
+        async def lookup(batch):
+            return await self._statuses_lookup(batch, raise_on_none, projection, **kwargs)
+
+        if batches:
+            tweets.update(await self._run_batches(lookup, batches, workers))
+        return tweets
+
+    async def statuses_retweet(self, id: [str, int], **kwargs) -> Tweet:
+        """
+        Async version of `APISession.statuses_retweet`.
+        """
+
+        res = await self.request('POST', 'statuses/retweet/{}.json'.format(id), params=kwargs)
+        return Tweet(self._required(res), self)
+
+    async def statuses_unretweet(self, id: [str, int], **kwargs) -> Tweet:
+        """
+        Async version of `APISession.statuses_unretweet`.
+        """
+
+        res = await self.request('POST', 'statuses/unretweet/{}.json'.format(id), params=kwargs)
+        return Tweet(self._required(res))
+
+    async def statuses_retweets(self, id: [str, int], count: int = None, **kwargs) -> List[Tweet]:
+        """
+        Async version of `APISession.statuses_retweets`.
+        """
+
+        res = await self.request('GET', 'statuses/retweets/{}.json'.format(id),
+            params=self._count_param(count, kwargs))
+        return [Tweet(r, self) for r in self._required(res)]
+
+    async def statuses_retweets_of_me(self,
+        count: int = None,
+        since_id: [int, str] = None,
+        max_id: [int, str] = None,
+        include_entities: bool = True,
+        include_user_entities: bool = True,
+        **kwargs) -> List[Tweet]:
+        """
+        Async version of `APISession.statuses_retweets_of_me`.
+        """
+
+        data = self._retweets_of_me_params(count, since_id, max_id,
+            include_entities, include_user_entities, kwargs)
+
+        res = await self.request('GET', 'statuses/retweets_of_mine', params=data)
+        return [Tweet(r, self) for r in self._required(res)]
+
+    #################
+    # FAVORITES API #
+    #################
+
+    async def favorites_create(self, id: [str, int], **kwargs) -> Tweet:
+        """
+        Async version of `APISession.favorites_create`.
+        """
+
+        data = kwargs
+        data['id'] = id
+
+        res = await self.request('POST', 'favorites/create.json', data=data)
+        return Tweet(self._required(res), self)
+
+    async def favorites_destroy(self, id: [str, int], **kwargs) -> Tweet:
+        """
+        Async version of `APISession.favorites_destroy`.
+        """
+
+        data = kwargs
+        data['id'] = id
+
+        res = await self.request('POST', 'favorites/destroy.json', data=data)
+        return Tweet(self._required(res), self)
+
+    #############
+    # USERS API #
+    #############
+
+    async def users_show(self, id: [str, int] = None, screen_name: str = None, **kwargs) -> User:
+        """
+        Async version of `APISession.users_show`.
+        """
+
+        res = await self.request('GET', 'users/show.json',
+            params=self._user_params(id, screen_name, kwargs))
+        return User(self._required(res), self)
+
+    async def users_lookup(self, ids: List[str] = None, screen_names: List[str] = None,
+        projection: [str, List[str]] = None, **kwargs) -> Dict[str, User]:
+        """
+        Async version of `APISession.users_lookup`.
+        """
+
+        res = await self.request('GET', 'users/lookup.json',
+            params=self._users_lookup_params(ids, screen_names, kwargs))
+        return self._users_lookup_result(res, projection)
+
+    async def users_lookup_bulk(self, ids: List[str] = None, screen_names: List[str] = None, workers: int = 4,
+        projection: [str, List[str]] = None, **kwargs) -> Dict[str, User]:
+        """
+        Async version of `APISession.users_lookup_bulk`.
+        Up to `workers` batches are requested at once, which
+        is further bounded by the sessions `max_concurrency`.
+        """
+
+        batches = self._users_lookup_batches(ids, screen_names)
+
+        async def lookup(batch):
+            key, values = batch
+            return await self.users_lookup(**{key: values}, projection=projection, **kwargs)
+
+        return await self._run_batches(lookup, batches, workers)
+
+    async def followers_ids(self, id: [str, int] = None, screen_name: str = None, **kwargs) -> List[str]:
+        """
+        Async version of `APISession.followers_ids`.
+        """
+
+        return [r async for r in self.followers_ids_iter(id, screen_name, prefetch=False, **kwargs)]
+
+    def followers_ids_iter(self, id: [str, int] = None, screen_name: str = None,
+        cursor: int = -1, prefetch: bool = True, **kwargs) -> AsyncCursor:
+        """
+        Async version of `APISession.followers_ids_iter`
+        returning an `AsyncCursor`.
+        """
+
+        params = self._user_params(id, screen_name, kwargs)
+        params['stringify_ids'] = True
+
+        return self.cursor('followers/ids.json', 'ids', params=params,
+            cursor=cursor, prefetch=prefetch)
+
+    async def followers_id_set(self, id: [str, int] = None, screen_name: str = None, **kwargs) -> IdSet:
+        """
+        Async version of `APISession.followers_id_set`.
+        """
+
+        params = self._user_params(id, screen_name, kwargs)
+        return await self.cursor('followers/ids.json', 'ids', count=self.IDS_PAGE_SIZE, params=params,
+            max_count=self.IDS_PAGE_SIZE).to_idset()
+
+    async def followers_list(self, id: [str, int] = None, screen_name: str = None, **kwargs) -> List[User]:
+        """
+        Async version of `APISession.followers_list`.
+        """
+
+        return [r async for r in self.followers_list_iter(id, screen_name, prefetch=False, **kwargs)]
+
+    def followers_list_iter(self, id: [str, int] = None, screen_name: str = None,
+        cursor: int = -1, prefetch: bool = True, projection: [str, List[str]] = None,
+        **kwargs) -> AsyncCursor:
+        """
+        Async version of `APISession.followers_list_iter`
+        returning an `AsyncCursor`.
+        """
+
+        params = self._user_params(id, screen_name, kwargs)
+        return self.cursor('followers/list.json', 'users', params=params,
+            cursor=cursor, prefetch=prefetch,
+            item_factory=self._projector(projection, lambda r: User(r, self)))
+
+    async def friends_ids(self, id: [str, int] = None, screen_name: str = None, **kwargs) -> List[str]:
+        """
+        Async version of `APISession.friends_ids`.
+        """
+
+        return [r async for r in self.friends_ids_iter(id, screen_name, prefetch=False, **kwargs)]
+
+    def friends_ids_iter(self, id: [str, int] = None, screen_name: str = None,
+        cursor: int = -1, prefetch: bool = True, **kwargs) -> AsyncCursor:
+        """
+        Async version of `APISession.friends_ids_iter`
+        returning an `AsyncCursor`.
+        """
+
+        params = self._user_params(id, screen_name, kwargs)
+        params['stringify_ids'] = True
+
+        return self.cursor('friends/ids.json', 'ids', params=params,
+            cursor=cursor, prefetch=prefetch)
+
+    async def friends_id_set(self, id: [str, int] = None, screen_name: str = None, **kwargs) -> IdSet:
+        """
+        Async version of `APISession.friends_id_set`.
+        """
+
+        params = self._user_params(id, screen_name, kwargs)
+        return await self.cursor('friends/ids.json', 'ids', count=self.IDS_PAGE_SIZE, params=params,
+            max_count=self.IDS_PAGE_SIZE).to_idset()
+
+    async def friends_list(self, id: [str, int] = None, screen_name: str = None, **kwargs) -> List[User]:
+        """
+        Async version of `APISession.friends_list`.
+        """
+
+        return [r async for r in self.friends_list_iter(id, screen_name, prefetch=False, **kwargs)]
+
+    def friends_list_iter(self, id: [str, int] = None, screen_name: str = None,
+        cursor: int = -1, prefetch: bool = True, projection: [str, List[str]] = None,
+        **kwargs) -> AsyncCursor:
+        """
+        Async version of `APISession.friends_list_iter`
+        returning an `AsyncCursor`.
+        """
+
+        params = self._user_params(id, screen_name, kwargs)
+        return self.cursor('friends/list.json', 'users', params=params,
+            cursor=cursor, prefetch=prefetch,
+            item_factory=self._projector(projection, lambda r: User(r, self)))
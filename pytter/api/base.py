@@ -0,0 +1,582 @@
+import base64
+import urllib
+from typing import Callable, Iterator, List, Dict, Tuple
+
+from .credentials import Credentials, CredentialPool, PooledCredentials
+from .exceptions import (
+    RateLimitException, NoneResponseException,
+    ParameterOutOfBoundsException,
+    ParameterNoneException,
+    RequestFailedException
+)
+from .ratelimit import RateLimitLedger, RATE_LIMIT_RAISE
+from .retry import RetryPolicy
+from .projection import projector
+from .media_cache import MediaCache
+from .chunking import AdaptiveChunkSizer
+from .response_cache import ResponseCache, NegativeCache, response_cache_key, request_tags
+
+from ..utils import utils
+from ..objects import Tweet, User
+from ..utils import FileInfo, FileRange, MultipartEncoder
+
+
+class BaseAPISession:
+    """
+    Part of `APISession` and `AsyncAPISession` which does not
+    depend on how requests are sent: the options of a session,
+    building the requests and validating the parameters of the
+    endpoints and parsing their responses. The sessions only
+    implement the transport and call these helpers, so both
+    behave the same.
+
+    See `APISession` for the parameters.
+    """
+
+    API_ROOT_URI        = 'https://api.twitter.com'
+    API_VERSION         = '1.1'
+    API_UPLOAD_ROOT_URI = 'https://upload.twitter.com/1.1'
+    UPLOAD_CHUNK_SIZE   = 1024 * 1024 # 1 MiB
+    UPLOAD_WORKERS      = 1
+    SEGMENT_RETRIES     = 2
+    SEGMENT_RETRY_STATUSES = (500, 502, 503, 504)
+    PIPELINE_URL_MEDIA  = False
+    PROCESSING_INTERVAL = 1
+    PROCESSING_TIMEOUT  = 300
+    LOOKUP_BATCH_SIZE   = 100
+    IDS_PAGE_SIZE       = 5000
+
+    def __init__(self, credentials: [Credentials, CredentialPool],
+        rate_limit_mode: str = RATE_LIMIT_RAISE,
+        retry_policy: RetryPolicy = None,
+        json_decoder: Callable[[bytes], object] = None,
+        projection: [str, List[str]] = None,
+        media_cache: MediaCache = None,
+        chunk_sizer: AdaptiveChunkSizer = None,
+        response_cache: ResponseCache = None,
+        negative_cache: NegativeCache = None):
+        self._retry_policy = retry_policy
+        self._media_cache = media_cache
+        self._chunk_sizer = chunk_sizer
+        self._response_cache = response_cache
+        self._negative_cache = negative_cache
+        self._single_flight = None
+        self._json_decoder = json_decoder or utils.json_loads
+        self._projection = projection
+        # Fails early on invalid projections.
+        projector(projection, None)
+
+        if isinstance(credentials, CredentialPool):
+            self._pool = credentials
+        else:
+            self._pool = CredentialPool([credentials], rate_limit_mode)
+        self._credentials = self._pool.primary().credentials
+        self._auth = {}
+
+    ###########
+    # OPTIONS #
+    ###########
+
+    def rate_limits(self) -> RateLimitLedger:
+        """
+        Returns the rate limit ledger tracking the
+        windows of all requested endpoints of the
+        sessions (primary) credentials.
+
+        **Returns**
+
+        - `RateLimitLedger`  
+          The sessions rate limit ledger.
+        """
+
+        return self._pool.primary().rate_limits
+
+    def credential_pool(self) -> CredentialPool:
+        """
+        Returns the credential pool of the session,
+        which only contains the passed credentials
+        if no pool was passed.
+
+        **Returns**
+
+        - `CredentialPool`  
+          The sessions credential pool.
+        """
+
+        return self._pool
+
+    def retry_policy(self) -> RetryPolicy:
+        """
+        Returns the retry policy of the session
+        or `None`, if no policy is set.
+
+        **Returns**
+
+        - `RetryPolicy`  
+          The sessions retry policy.
+        """
+
+        return self._retry_policy
+
+    def chunk_sizer(self) -> AdaptiveChunkSizer:
+        """
+        Returns the adaptive chunk sizer of the session
+        or `None`, if no sizer is set.
+
+        **Returns**
+
+        - `AdaptiveChunkSizer`  
+          The sessions chunk sizer.
+        """
+
+        return self._chunk_sizer
+
+    def response_cache(self) -> ResponseCache:
+        """
+        Returns the response cache of the session
+        or `None`, if no cache is set.
+
+        **Returns**
+
+        - `ResponseCache`  
+          The sessions response cache.
+        """
+
+        return self._response_cache
+
+    def negative_cache(self) -> NegativeCache:
+        """
+        Returns the negative cache of the session
+        or `None`, if no cache is set.
+
+        **Returns**
+
+        - `NegativeCache`  
+          The sessions negative cache.
+        """
+
+        return self._negative_cache
+
+    def single_flight(self):
+        """
+        Returns the `SingleFlight` (or `AsyncSingleFlight`)
+        coalescing the GET requests of the session or `None`,
+        if requests are not coalesced.
+
+        **Returns**
+
+        - `[SingleFlight, AsyncSingleFlight]`  
+          The sessions request coalescer.
+        """
+
+        return self._single_flight
+
+    ############################
+    # GENERAL REQUEST HANDLING #
+    ############################
+
+    def _projector(self, projection: [str, List[str]], factory: Callable[[dict], object]) -> Callable[[dict], object]:
+        """
+        Returns the function applied to each raw response
+        object for the given projection, falling back to
+        the sessions projection. See `projection.projector`.
+        """
+
+        return projector(self._projection if projection is None else projection, factory)
+
+    def _check_rate_limit(self, entry: PooledCredentials, endpoint: str, status_code: int, headers: dict):
+        """
+        Updates the rate limit ledger of the used credentials
+        from the response headers and raises a
+        `RateLimitException` if the response status is 429.
+        """
+
+        entry.rate_limits.update(endpoint, headers)
+
+        if status_code == 429:
+            reset = headers.get('x-rate-limit-reset')
+            reset = float(reset) if reset else None
+            entry.rate_limits.exhaust(endpoint, reset)
+            raise RateLimitException(reset=reset)
+
+    def _resource_url(self, resource_path: str) -> str:
+        """
+        Returns the URL of an API resource. A leading
+        '/' of `resource_path` is cut off.
+        """
+
+        return '{0}/{1}/{2}'.format(self.API_ROOT_URI, self.API_VERSION,
+            (resource_path[1:] if resource_path.startswith('/') else resource_path))
+
+    def _basic_token(self, entry: PooledCredentials) -> str:
+        """
+        Returns the basic authorization token used to
+        obtain a bearer token for the entries credentials.
+        """
+
+        key = urllib.parse.quote_plus(entry.credentials.consumer_key)
+        secret = urllib.parse.quote_plus(entry.credentials.consumer_secret)
+        return base64.b64encode(
+            '{0}:{1}'.format(key, secret).encode('utf8')).decode('utf8')
+
+    def _cache_get(self, endpoint: str, resource_path: str, params: dict) -> Tuple[tuple, int, object]:
+        """
+        Returns the response cache key of a GET request,
+        the cache generation the request started in and
+        its cached response or `None`, if the endpoint is
+        not cached or there is no valid entry.
+        """
+
+        key = response_cache_key(resource_path, params)
+        cache = self._response_cache
+        if cache is None or not cache.ttl(endpoint):
+            return key, None, None
+        generation = cache.generation()
+        return key, generation, cache.get(endpoint, key)
+
+    def _cache_set(self, endpoint: str, key: tuple, generation: int,
+        resource_path: str, params: dict, res: object):
+        """
+        Stores the response of a GET request in the
+        response cache, if the endpoint is cached and
+        no write invalidated its tags since the request
+        started.
+        """
+
+        cache = self._response_cache
+        if cache is not None and cache.ttl(endpoint):
+            cache.set(endpoint, key, res, request_tags(endpoint, resource_path, params), generation)
+
+    def _cache_invalidate(self, endpoint: str, resource_path: str, params: dict):
+        """
+        Invalidates the cached responses changed by a
+        write request. This is also done if the request
+        failed, as the write may have been applied
+        although no response arrived.
+        """
+
+        if self._response_cache is not None:
+            self._response_cache.invalidate(request_tags(endpoint, resource_path, params))
+
+    def _check_workers(self, workers: int):
+        if workers < 1:
+            raise ParameterOutOfBoundsException('workers must be larger than 0')
+
+    ######################
+    # REQUESTS & RESULTS #
+    ######################
+
+    def _required(self, res: object) -> object:
+        """
+        Returns the response body or raises a
+        `NoneResponseException`, if it is empty.
+        """
+
+        if not res:
+            raise NoneResponseException()
+        return res
+
+    def _user_params(self, id: [str, int], screen_name: str, params: dict) -> dict:
+        """
+        Adds the user specified by its ID or screen
+        name to the request parameters.
+        """
+
+        if not id and not screen_name:
+            raise ParameterNoneException()
+
+        if id:
+            params['user_id'] = id
+        if screen_name:
+            params['screen_name'] = screen_name
+        return params
+
+    def _count_param(self, count: int, params: dict) -> dict:
+        """
+        Adds `count` to the request parameters, if
+        passed, which must be in range of [1, 100].
+        """
+
+        if count:
+            if count < 1 or count > 100:
+                raise ParameterOutOfBoundsException('count must be in range of [1, 100]')
+            params['count'] = count
+        return params
+
+    def _retweets_of_me_params(self, count: int, since_id: [int, str], max_id: [int, str],
+        include_entities: bool, include_user_entities: bool, params: dict) -> dict:
+
+        params['include_entities'] = include_entities
+        params['include_user_entities'] = include_user_entities
+        self._count_param(count, params)
+
+        if since_id:
+            params['since_id'] = since_id
+        if max_id:
+            params['max_id'] = max_id
+        return params
+
+    def _check_negative(self, id: [str, int]):
+        """
+        Raises the cached `RequestFailedException` of a
+        Tweet ID contained in the negative cache.
+        """
+
+        if self._negative_cache is not None:
+            status_code = self._negative_cache.get(id)
+            if status_code is not None:
+                raise RequestFailedException(status_code, 'cached negative response')
+
+    def _add_negative(self, id: [str, int], e: RequestFailedException):
+        """
+        Adds a Tweet ID to the negative cache, if the
+        request of it failed with a cached status code.
+        """
+
+        negative = self._negative_cache
+        if negative is not None and e.status_code in negative.STATUS_CODES:
+            negative.add([id], e.status_code)
+
+    def _skip_negative(self, ids: List[str], raise_on_none: bool) -> Tuple[List[str], Dict[str, None]]:
+        """
+        Removes the IDs cached in the negative cache from
+        `ids` and returns the remaining IDs together with
+        the results of the removed IDs, which are `None`.
+        """
+
+        ids = [str(id) for id in ids]
+        if self._negative_cache is None:
+            return ids, {}
+
+        ids, cached = self._negative_cache.partition(ids)
+        if cached and raise_on_none:
+            raise NoneResponseException()
+        return ids, dict.fromkeys(cached)
+
+    def _statuses_lookup_ids(self, ids: List[str], raise_on_none: bool) -> Tuple[List[str], Dict[str, None]]:
+        """
+        Validates the IDs of `statuses_lookup`, see
+        `_skip_negative`.
+        """
+
+        ln = len(ids)
+        if ln < 1 or ln > 100:
+            raise ParameterOutOfBoundsException('index must be in range [1, 100]')
+        return self._skip_negative(ids, raise_on_none)
+
+    def _statuses_lookup_params(self, ids: List[str], params: dict) -> dict:
+        params['id'] = ','.join(ids)
+        params['map'] = True
+        return params
+
+    def _statuses_lookup_result(self, res: dict, raise_on_none: bool,
+        projection: [str, List[str]]) -> Dict[str, Tweet]:
+        """
+        Parses a `statuses/lookup` response and adds
+        the IDs returned as `None` to the negative cache.
+        """
+
+        if not res or 'id' not in res:
+            raise NoneResponseException()
+
+        if self._negative_cache is not None:
+            self._negative_cache.add([tid for tid, obj in res.get('id').items() if not obj])
+
+        project = self._projector(projection, lambda r: Tweet(r, self))
+        tweets = {}
+
+        for tid, obj in res.get('id').items():
+            if not obj and raise_on_none:
+                raise NoneResponseException()
+            if obj and project:
+                obj = project(obj)
+            tweets[tid] = obj or None
+
+        return tweets
+
+    def _statuses_lookup_batches(self, ids: List[str], raise_on_none: bool) -> Tuple[List[List[str]], Dict[str, None]]:
+        """
+        Splits the deduplicated IDs of `statuses_lookup_bulk`
+        not contained in the negative cache into batches.
+        """
+
+        if len(ids) < 1:
+            raise ParameterOutOfBoundsException('ids must not be empty')
+
+        ids = list(dict.fromkeys(str(id) for id in ids))
+        ids, tweets = self._skip_negative(ids, raise_on_none)
+        return list(utils.chunk_list(ids, self.LOOKUP_BATCH_SIZE)), tweets
+
+    def _users_lookup_params(self, ids: List[str], screen_names: List[str], params: dict) -> dict:
+        if not ids and not screen_names:
+            raise ParameterNoneException()
+
+        ln = 0
+        if ids and len(ids) > 0:
+            params['user_id'] = ','.join([str(id) for id in ids])
+            ln += len(ids)
+        if screen_names and len(screen_names) > 0:
+            params['screen_name'] = ','.join(screen_names)
+            ln += len(screen_names)
+
+        if ln < 1 or ln > 100:
+            raise ParameterOutOfBoundsException(
+                'ids + screen_names length must be in range [1, 100]')
+        return params
+
+    def _users_lookup_result(self, res: list, projection: [str, List[str]]) -> Dict[str, User]:
+        """
+        Parses a `users/lookup` response into a dict
+        keyed by the user IDs and user names.
+        """
+
+        if not res:
+            raise NoneResponseException()
+
+        project = self._projector(projection, lambda r: User(r, self))
+        users = {}
+        for r in res:
+            user = project(r) if project else r
+            users[r.get('id_str') or str(r.get('id'))] = user
+            users[r.get('username') or r.get('screen_name')] = user
+
+        return users
+
+    def _users_lookup_batches(self, ids: List[str], screen_names: List[str]) -> List[Tuple[str, List[str]]]:
+        """
+        Splits the deduplicated IDs and screen names of
+        `users_lookup_bulk` into batches of the keyword
+        argument of `users_lookup` and its values.
+        """
+
+        if not ids and not screen_names:
+            raise ParameterNoneException()
+
+        ids = list(dict.fromkeys(str(id) for id in ids or []))
+        screen_names = list(dict.fromkeys(screen_names or []))
+
+        batches = [('ids', b) for b in utils.chunk_list(ids, self.LOOKUP_BATCH_SIZE)]
+        batches += [('screen_names', b) for b in utils.chunk_list(screen_names, self.LOOKUP_BATCH_SIZE)]
+        return batches
+
+    ##########
+    # UPLOAD #
+    ##########
+
+    def _init_params(self, file_info: [FileInfo, utils.RemoteFileInfo]) -> dict:
+        """
+        Returns the parameters of the INIT request of
+        a file. Files which the chunk sizer cannot split
+        into the allowed number of segments are rejected
+        before the upload starts.
+        """
+
+        if self._chunk_sizer is not None:
+            self._chunk_sizer.check_size(file_info.size)
+        return {
+            'total_bytes': file_info.size,
+            'media_type': file_info.mime_type,
+        }
+
+    def _init_media_id(self, res_data: dict) -> int:
+        """
+        Returns the media ID of an INIT response.
+        """
+
+        if not res_data or 'media_id_string' not in res_data:
+            raise Exception('"media_id_string" not contained in response body')
+        return res_data['media_id']
+
+    def _upload_chunks(self, file_info: [FileInfo, utils.RemoteFileInfo],
+        workers: int) -> Iterator[utils.FileChunk]:
+        """
+        Returns the iterator of the APPEND segments of a
+        file, sized by the chunk sizer, if set. The data
+        of a `RemoteFileInfo` is downloaded while iterating.
+        """
+
+        self._check_workers(workers)
+        chunk_size = self.UPLOAD_CHUNK_SIZE
+        if self._chunk_sizer is not None:
+            chunk_size = self._chunk_sizer.next_size
+        if isinstance(file_info, utils.RemoteFileInfo):
+            return utils.stream_url_chunks(file_info, chunk_size, max_pending=workers)
+        return utils.chunk_ranges(file_info, chunk_size)
+
+    def _segment_body(self, media_id: int, file_info: FileInfo, chunk: utils.FileChunk) -> MultipartEncoder:
+        """
+        Returns the multipart body of the APPEND request
+        of a chunk. If the chunk carries no data, the body
+        is streamed from the file while sending, so the
+        segment is never held in memory as a whole.
+        """
+
+        data = chunk.data
+        if data is None:
+            data = FileRange(file_info, chunk.offset, chunk.size)
+
+        return MultipartEncoder([
+            ('command', 'APPEND'),
+            ('media_id', str(media_id)),
+            ('media', data, file_info.file_name, 'application/octet-stream'),
+            ('segment_index', str(chunk.index)),
+        ])
+
+    def _segment_retry_policy(self) -> RetryPolicy:
+        """
+        Returns the policy retrying single APPEND segments
+        failing with a connection error or a status code of
+        `SEGMENT_RETRY_STATUSES` up to `SEGMENT_RETRIES`
+        times without delay, or `None`, if the session has a
+        RetryPolicy, which then retries them instead.
+        """
+
+        if self._retry_policy is not None:
+            return None
+        return RetryPolicy(
+            max_retries=self.SEGMENT_RETRIES,
+            backoff_base=0,
+            backoff_max=0,
+            retry_statuses=self.SEGMENT_RETRY_STATUSES,
+            retry_rate_limited=False,
+            idempotent_methods=(),
+            idempotent_endpoints=('media/upload',))
+
+    def _attachment_files(self, media: list, pipelined: bool) -> Tuple[list, list]:
+        """
+        Resolves the media passed to `upload_attachments`
+        to FileInfo (or RemoteFileInfo) objects and checks
+        that they can be attached together. Returns the
+        files and the ones opened here, which are closed
+        again if this fails.
+        """
+
+        max_attachable = None
+        files = []
+        opened = []
+
+        try:
+            for m in media:
+                file_info = None
+                if type(m) in (FileInfo, utils.RemoteFileInfo):
+                    file_info = m
+                elif pipelined and m.startswith('http'):
+                    file_info = utils.probe_url(m)
+                if file_info is None:
+                    file_info = utils.try_get_file(m)
+                if file_info is not m:
+                    opened.append(file_info)
+                i = utils.check_upload_compatibility(file_info)
+                files.append(file_info)
+                if not max_attachable:
+                    max_attachable = i
+
+            if max_attachable and len(media) > max_attachable:
+                raise Exception('you can only attach up to {} files using this attachment type.'
+                    .format(max_attachable))
+        except:
+            for file_info in opened:
+                file_info.close()
+            raise
+
+        return files, opened
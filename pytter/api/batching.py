@@ -0,0 +1,182 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable, List
+
+
+class BatchLoader:
+    """
+    Collects single key lookups of concurrent threads and
+    resolves them with one call of `load`, like a
+    DataLoader.
+
+    The first key starts a window of `window` seconds.
+    All keys submitted within the window, or until
+    `max_batch` keys are pending, are passed to `load`
+    at once. Each caller gets a Future resolved with the
+    value `load` returned for its key, or `None`, if the
+    key is missing in the result. If `load` fails, the
+    exception is set on all Futures of the batch.
+    Submitting a key which is already pending returns
+    the pending Future.
+
+    **Parameters**
+
+    - `load : Callable[[List[Hashable]], Dict[Hashable, object]]`  
+      Function getting a list of keys and returning
+      the values by key.
+
+    - `window : float`  
+      Time in seconds keys are collected after the
+      first key of a batch.  
+      *Default: `0.005`*
+
+    - `max_batch : int`  
+      Maximum number of keys of a batch.  
+      *Default: `100`*
+    """
+
+    def __init__(self, load: Callable[[List[Hashable]], Dict[Hashable, object]],
+        window: float = 0.005, max_batch: int = 100):
+        if max_batch < 1:
+            raise ValueError('max_batch must be larger than 0')
+
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self._load = load
+        self._pending: Dict[Hashable, Future] = {}
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def submit(self, key: Hashable) -> Future:
+        """
+        Adds the key to the current batch and returns
+        the Future of its value.
+        """
+
+        batch = None
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+
+            future = self._pending[key] = Future()
+            if len(self._pending) >= self.max_batch:
+                batch = self._take()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if batch:
+            self._dispatch(batch)
+        return future
+
+    def load(self, key: Hashable) -> object:
+        """
+        Submits the key and waits for its value.
+        """
+
+        return self.submit(key).result()
+
+    def flush(self):
+        """
+        Dispatches the pending keys immediately.
+        """
+
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._dispatch(batch)
+
+    def _take(self) -> Dict[Hashable, Future]:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        return batch
+
+    def _dispatch(self, batch: Dict[Hashable, Future]):
+        self.batches += 1
+        try:
+            results = self._load(list(batch))
+        except BaseException as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+
+        for key, future in batch.items():
+            future.set_result(results.get(key))
+
+
+class AsyncBatchLoader:
+    """
+    asyncio counterpart of `BatchLoader`, where `load` is
+    a coroutine function and `load` of the loader returns
+    an awaitable resolved with the value of the key.
+    """
+
+    def __init__(self, load: Callable[[List[Hashable]], Awaitable[Dict[Hashable, object]]],
+        window: float = 0.005, max_batch: int = 100):
+        if max_batch < 1:
+            raise ValueError('max_batch must be larger than 0')
+
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self._load = load
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._handle = None
+        self._tasks = set()
+
+    async def load(self, key: Hashable) -> object:
+        """
+        Adds the key to the current batch and
+        returns its value once it is loaded.
+        """
+
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.max_batch:
+                self.flush()
+            elif self._handle is None:
+                self._handle = loop.call_later(self.window, self.flush)
+
+        return await asyncio.shield(future)
+
+    def flush(self):
+        """
+        Dispatches the pending keys immediately.
+        """
+
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: Dict[Hashable, asyncio.Future]):
+        self.batches += 1
+        try:
+            results = await self._load(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            # Cancelled dispatches cancel the waiting
+            # callers instead of leaving them pending.
+            for future in batch.values():
+                future.cancel()
+            raise
+
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
@@ -0,0 +1,177 @@
+import threading
+from collections import deque
+from typing import List, NamedTuple
+
+from .exceptions import ParameterOutOfBoundsException
+
+
+class SegmentMeasurement(NamedTuple):
+    """
+    Measurement of a single uploaded APPEND segment.
+    """
+
+    size: int
+    duration: float
+    throughput: float
+    next_size: int
+
+
+class AdaptiveChunkSizer:
+    """
+    Chooses the size of APPEND segments of chunked media
+    uploads from the measured upload throughput.
+
+    After each segment, the size is set to the number of
+    bytes which can be sent in `target_duration` at the
+    (exponentially smoothed) throughput measured so far,
+    so fast links use few large segments and slow links
+    small segments, which are cheaper to retry. As the
+    duration includes the latency of each request, small
+    segments on high-latency links measure a lower
+    throughput, which keeps the size from growing before
+    the latency is amortized. The size changes by at most
+    a factor of 2 per segment and stays within `min_size`
+    and `max_size`.
+
+    The sizer is shared by all uploads of a session, so
+    later uploads start with the size learned before. It
+    is thread safe.
+
+    **Parameters**
+
+    - `initial_size : int`  
+      Size of the first segment in bytes.  
+      *Default: `1048576` (1 MiB)*
+
+    - `min_size : int`  
+      Minimum segment size in bytes.  
+      *Default: `262144` (256 KiB)*
+
+    - `max_size : int`  
+      Maximum segment size in bytes. Twitter does
+      not accept segments larger than 5 MB.  
+      *Default: `5242880` (5 MiB)*
+
+    - `target_duration : float`  
+      Aimed upload duration of one segment in seconds.  
+      *Default: `2`*
+
+    - `smoothing : float`  
+      Weight of the latest measurement in the
+      smoothed throughput between 0 and 1.  
+      *Default: `0.5`*
+
+    - `history_size : int`  
+      Number of segment measurements kept in `history`.  
+      *Default: `1000`*
+    """
+
+    ALIGNMENT    = 64 * 1024 # 64 KiB
+    MAX_SEGMENTS = 1000
+
+    def __init__(self, initial_size: int = 1024 * 1024,
+        min_size: int = 256 * 1024,
+        max_size: int = 5 * 1024 * 1024,
+        target_duration: float = 2,
+        smoothing: float = 0.5,
+        history_size: int = 1000):
+
+        if not 0 < min_size <= initial_size <= max_size:
+            raise ValueError('sizes must satisfy 0 < min_size <= initial_size <= max_size')
+        if target_duration <= 0:
+            raise ValueError('target_duration must be larger than 0')
+        if not 0 < smoothing <= 1:
+            raise ValueError('smoothing must be in (0, 1]')
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_duration = target_duration
+        self.smoothing = smoothing
+        self._size = initial_size
+        self._throughput = None
+        self._history = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    @property
+    def chunk_size(self) -> int:
+        """
+        Size in bytes the next segment will have.
+        """
+
+        return self._size
+
+    @property
+    def throughput(self) -> float:
+        """
+        Smoothed measured throughput in bytes per second
+        or `None`, if no segment was uploaded yet.
+        """
+
+        return self._throughput
+
+    @property
+    def history(self) -> List[SegmentMeasurement]:
+        """
+        Measurements of the last uploaded segments,
+        oldest first.
+        """
+
+        with self._lock:
+            return list(self._history)
+
+    def check_size(self, total: int):
+        """
+        Raises a `ParameterOutOfBoundsException`, if a
+        file of `total` bytes does not fit into
+        `MAX_SEGMENTS` segments of `max_size` bytes.
+        """
+
+        if total > self.MAX_SEGMENTS * self.max_size:
+            raise ParameterOutOfBoundsException(
+                'file of {} bytes exceeds {} segments of {} bytes'
+                .format(total, self.MAX_SEGMENTS, self.max_size))
+
+    def next_size(self, index: int, remaining: int) -> int:
+        """
+        Returns the size of the segment with the given
+        index. Segments are enlarged up to `max_size`, if
+        the remaining bytes would not fit into
+        `MAX_SEGMENTS` segments otherwise. If they do not
+        fit even then, a `ParameterOutOfBoundsException`
+        is raised.
+        """
+
+        with self._lock:
+            size = self._size
+        left = max(self.MAX_SEGMENTS - index, 1)
+        if remaining > left * self.max_size:
+            raise ParameterOutOfBoundsException(
+                '{} remaining bytes exceed {} segments of {} bytes'
+                .format(remaining, left, self.max_size))
+        return min(max(size, -(-remaining // left)), remaining, self.max_size)
+
+    def record(self, size: int, duration: float):
+        """
+        Records the upload of a segment of `size` bytes
+        which took `duration` seconds and adapts the
+        size of the next segments.
+        """
+
+        if size <= 0:
+            return
+        throughput = size / max(duration, 1e-6)
+
+        with self._lock:
+            if self._throughput is None:
+                self._throughput = throughput
+            else:
+                self._throughput += self.smoothing * (throughput - self._throughput)
+
+            target = self._throughput * self.target_duration
+            target = min(max(target, self._size / 2), self._size * 2)
+            target = int(target)
+            if target > self.ALIGNMENT:
+                target -= target % self.ALIGNMENT
+            self._size = min(max(target, self.min_size), self.max_size)
+
+            self._history.append(SegmentMeasurement(size, duration, throughput, self._size))
@@ -1,5 +1,16 @@
+import time
+import threading
+from typing import List, Tuple
+
+from oauthlib import oauth1
 from requests_oauthlib import OAuth1
 
+from .exceptions import RateLimitException, ParameterNoneException
+from .ratelimit import (
+    RateLimitLedger, RATE_LIMIT_WAIT, RATE_LIMIT_RAISE,
+    RATE_LIMIT_IGNORE, RATE_LIMIT_MODES
+)
+
 
 class Credentials:
     """
@@ -43,4 +54,164 @@ class Credentials:
 
     def to_oauth1(self) -> OAuth1:
         return OAuth1(self.consumer_key, self.consumer_secret,
-            self.access_token_key, self.access_token_secret)
\ No newline at end of file
+            self.access_token_key, self.access_token_secret)
+
+    def to_oauth1_client(self) -> oauth1.Client:
+        return oauth1.Client(self.consumer_key, self.consumer_secret,
+            self.access_token_key, self.access_token_secret)
+
+    def is_user_context(self) -> bool:
+        return all([self.access_token_key,
+                    self.access_token_secret,
+                    self.consumer_key,
+                    self.consumer_secret])
+
+
+class PooledCredentials:
+    """
+    Entry of a `CredentialPool` pairing credentials
+    with their own rate limit ledger.
+    """
+
+    def __init__(self, credentials: Credentials):
+        self.credentials    = credentials
+        self.user_context   = credentials.is_user_context()
+        self.rate_limits    = RateLimitLedger(RATE_LIMIT_WAIT)
+
+
+class CredentialPool:
+    """
+    Pool of multiple APP and/or user credentials which can
+    be passed to `APISession` or `Client` instead of a single
+    `Credentials` object. Read requests are spread over all
+    credentials by picking the ones with the most remaining
+    quota for the requested endpoint, so that the throughput
+    grows with the number of tokens. Ties, like endpoints
+    whose windows are not known yet, are broken round-robin.
+    Credentials which hit the rate limit are parked until
+    their window resets, unless the mode is `'ignore'`.
+
+    Write requests (everything except GET), media uploads and
+    `account/` endpoints are always sent with the first user
+    context credentials of the pool, so that created tweets
+    and uploaded media belong to the same account.
+
+    **Parameters**
+
+    - `credentials: List[Credentials]`  
+      List of APP and/or user credentials.
+
+    - `rate_limit_mode: str`  
+      What to do when the windows of all credentials are
+      exhausted, see `APISession`.  
+      *Default: `'raise'`*
+    """
+
+    def __init__(self, credentials: List[Credentials], rate_limit_mode: str = RATE_LIMIT_RAISE):
+        if not credentials:
+            raise ParameterNoneException('credentials must not be empty')
+        if rate_limit_mode not in RATE_LIMIT_MODES:
+            raise ValueError('rate_limit_mode must be one of {}'.format(RATE_LIMIT_MODES))
+
+        self.mode       = rate_limit_mode
+        self.entries    = [PooledCredentials(c) for c in credentials]
+        self._lock      = threading.Lock()
+        self._turn      = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def primary(self) -> PooledCredentials:
+        """
+        Returns the first user context entry of the
+        pool or the first entry, if there is none.
+        """
+
+        for entry in self.entries:
+            if entry.user_context:
+                return entry
+        return self.entries[0]
+
+    def entry(self, credentials: Credentials) -> PooledCredentials:
+        """
+        Returns the pool entry of the given credentials.
+        """
+
+        for entry in self.entries:
+            if entry.credentials is credentials:
+                return entry
+        raise ValueError('credentials are not part of the pool')
+
+    def reserve(self, endpoint: str, method: str = 'GET',
+        entry: PooledCredentials = None) -> Tuple[PooledCredentials, float]:
+        """
+        Picks the entry with the most remaining quota for
+        the endpoint, round-robin among equal ones, and
+        reserves one request slot of it.
+
+        **Parameters**
+
+        - `endpoint: str`  
+          Normalized endpoint key.
+
+        - `method: str`  
+          Request method.  
+          *Default: `'GET'`*
+
+        - `entry: PooledCredentials`  
+          Reserve the slot of this entry instead of
+          picking one.  
+          *Default: `None`*
+
+        **Returns**
+
+        - `Tuple[PooledCredentials, float]`  
+          The picked entry and the seconds to wait until
+          its window resets, which is `0` if a slot was
+          reserved. In `'raise'` mode, a `RateLimitException`
+          is raised instead of returning a wait time, in
+          `'ignore'` mode the wait time is always `0`.
+        """
+
+        if entry is not None:
+            candidates = [entry]
+        elif method != 'GET' or endpoint.startswith('account/'):
+            candidates = [self.primary()]
+        else:
+            candidates = self.entries
+
+        with self._lock:
+            # Rotates the candidates, so that max() picks
+            # the next one of equal entries on each call.
+            turn = self._turn % len(candidates)
+            self._turn += 1
+            candidates = candidates[turn:] + candidates[:turn]
+            best = max(candidates, key=lambda e: (
+                e.rate_limits.remaining(endpoint),
+                -e.rate_limits.reset_in(endpoint)))
+            wait = best.rate_limits.reserve(endpoint)
+
+        if self.mode == RATE_LIMIT_IGNORE:
+            return best, 0
+        if wait > 0 and self.mode == RATE_LIMIT_RAISE:
+            raise RateLimitException(reset=time.time() + wait)
+
+        return best, wait
+
+    def acquire(self, endpoint: str, method: str = 'GET',
+        entry: PooledCredentials = None) -> PooledCredentials:
+        """
+        Same as `reserve`, but blocks until a slot is
+        available instead of returning a wait time.
+
+        **Returns**
+
+        - `PooledCredentials`  
+          The picked entry.
+        """
+
+        picked, wait = self.reserve(endpoint, method, entry)
+        while wait > 0:
+            time.sleep(wait)
+            picked, wait = self.reserve(endpoint, method, entry)
+        return picked
@@ -0,0 +1,206 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, AsyncIterator, List
+
+from .exceptions import ParameterOutOfBoundsException
+from ..utils import IdSet
+
+
+class Cursor:
+    """
+    Lazy iterator over a cursored Twitter API endpoint.
+    Pages are requested while iterating, so items are
+    available as soon as their page arrived instead of
+    after the last page. Iterating the cursor yields the
+    single items, `pages()` yields whole pages.
+
+    `next_cursor` always contains the cursor of the page
+    following the last yielded page, so it can be stored
+    as checkpoint and passed as `cursor` to resume the
+    crawl later on. It is `0` after the last page.
+
+    **Parameters**
+
+    - `session: APISession`  
+      Session used to issue the requests.
+
+    - `resource_path: str`  
+      Path to the requested resource (without root URI).
+
+    - `expected_key: str`  
+      Key expected to be contained in the response grouping
+      all response objects.
+
+    - `count: int`  
+      Ammount of objects which will be requested at once.
+      Must be in range of [1, max_count].  
+      *Default: `200`*
+
+    - `params: dict`  
+      Parameters passed to the single GET requests.  
+      *Default: `{}`*
+
+    - `cursor: int`  
+      Cursor to start from.  
+      *Default: `-1`*
+
+    - `prefetch: bool`  
+      Request the next page in the background while
+      the current page is processed.  
+      *Default: `True`*
+
+    - `item_factory: Callable`  
+      Function applied to each raw response object,
+      like `lambda r: User(r, session)`.  
+      *Default: `None`*
+
+    - `max_count: int`  
+      Maximum page size of the endpoint, which is 5000
+      for the `ids` endpoints.  
+      *Default: `200`*
+    """
+
+    def __init__(self, session, resource_path: str, expected_key: str,
+        count: int = 200,
+        params: dict = {},
+        cursor: int = -1,
+        prefetch: bool = True,
+        item_factory: Callable = None,
+        max_count: int = 200):
+
+        if count > max_count or count < 1:
+            raise ParameterOutOfBoundsException("must be in range of [1, {}]".format(max_count))
+
+        self._session       = session
+        self._resource_path = resource_path
+        self._expected_key  = expected_key
+        self._params        = dict(params)
+        self._params['count'] = count
+        self._prefetch      = prefetch
+        self._item_factory  = item_factory
+
+        self.cursor         = None
+        self.next_cursor    = cursor
+
+    def _fetch(self, cursor: int) -> dict:
+        params = dict(self._params)
+        params['cursor'] = cursor
+        return self._session.request('GET', self._resource_path, params=params)
+
+    def _page(self, res: dict) -> list:
+        data = res.get(self._expected_key) or []
+        if self._item_factory:
+            return [self._item_factory(r) for r in data]
+        return data
+
+    def pages(self) -> Iterator[List[object]]:
+        """
+        Yields the pages of the endpoint as lists
+        of objects contained in `expected_key`.
+
+        **Returns**
+
+        - `Iterator[List[object]]`  
+          Iterator of result pages.
+        """
+
+        executor = ThreadPoolExecutor(max_workers=1) if self._prefetch else None
+        future = None
+        try:
+            while self.next_cursor != 0:
+                if future is None:
+                    res = self._fetch(self.next_cursor)
+                else:
+                    res = future.result()
+                next_cursor = res.get('next_cursor') or 0
+                future = None
+                if executor is not None and next_cursor != 0:
+                    future = executor.submit(self._fetch, next_cursor)
+                self.cursor, self.next_cursor = self.next_cursor, next_cursor
+                yield self._page(res)
+        finally:
+            if executor is not None:
+                if future is not None:
+                    future.cancel()
+                executor.shutdown(wait=False)
+
+    def __iter__(self) -> Iterator[object]:
+        for page in self.pages():
+            yield from page
+
+    def to_idset(self) -> IdSet:
+        """
+        Collects the items of all remaining pages into an
+        `IdSet`. Each page is added to the set as soon as it
+        arrived, so no list of all IDs is built in between.
+
+        **Returns**
+
+        - `IdSet`  
+          Set of the collected IDs.
+        """
+
+        ids = IdSet()
+        for page in self.pages():
+            ids.extend(page)
+        return ids
+
+
+class AsyncCursor(Cursor):
+    """
+    asyncio version of `Cursor` for `AsyncAPISession`.
+    Iterate it with `async for`; `pages()` is an async
+    iterator as well. Prefetching is done with a
+    background task instead of a thread.
+    """
+
+    async def _fetch(self, cursor: int) -> dict:
+        params = dict(self._params)
+        params['cursor'] = cursor
+        return await self._session.request('GET', self._resource_path, params=params)
+
+    async def pages(self) -> AsyncIterator[List[object]]:
+        """
+        Yields the pages of the endpoint as lists
+        of objects contained in `expected_key`.
+
+        **Returns**
+
+        - `AsyncIterator[List[object]]`  
+          Async iterator of result pages.
+        """
+
+        task = None
+        try:
+            while self.next_cursor != 0:
+                if task is None:
+                    res = await self._fetch(self.next_cursor)
+                else:
+                    res = await task
+                next_cursor = res.get('next_cursor') or 0
+                task = None
+                if self._prefetch and next_cursor != 0:
+                    task = asyncio.ensure_future(self._fetch(next_cursor))
+                self.cursor, self.next_cursor = self.next_cursor, next_cursor
+                yield self._page(res)
+        finally:
+            if task is not None:
+                task.cancel()
+
+    def __iter__(self):
+        raise TypeError('AsyncCursor must be iterated with async for')
+
+    async def __aiter__(self) -> AsyncIterator[object]:
+        async for page in self.pages():
+            for obj in page:
+                yield obj
+
+    async def to_idset(self) -> IdSet:
+        """
+        Async version of `Cursor.to_idset`.
+        """
+
+        ids = IdSet()
+        async for page in self.pages():
+            ids.extend(page)
+        return ids
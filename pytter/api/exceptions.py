@@ -2,7 +2,8 @@
 
 class RateLimitException(Exception):
     MESSAGE = 'rate limit exceeded'
-    def __init__(self):
+    def __init__(self, reset: float = None):
+        self.reset = reset
         super().__init__(self.MESSAGE)
 
 class NoneResponseException(Exception):
@@ -22,4 +23,28 @@ class ParameterNoneException(Exception):
     def __init__(self, additional_description: str = None):
         if additional_description:
             self.MESSAGE += ': {}'.format(additional_description)
-        super().__init__(self.MESSAGE)
\ No newline at end of file
+        super().__init__(self.MESSAGE)
+
+class RequestFailedException(Exception):
+    MESSAGE = 'request failed with status code {}'
+    def __init__(self, status_code: int, message: str = None, headers: dict = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        msg = self.MESSAGE.format(status_code)
+        if message:
+            msg += ' and message: {}'.format(message)
+        super().__init__(msg)
+
+class MediaProcessingException(Exception):
+    MESSAGE = 'processing of media {} failed'
+    def __init__(self, media_id: str, message: str = None):
+        self.media_id = media_id
+        msg = self.MESSAGE.format(media_id)
+        if message:
+            msg += ': {}'.format(message)
+        super().__init__(msg)
+
+class UploadCancelledException(Exception):
+    MESSAGE = 'upload was cancelled'
+    def __init__(self):
+        super().__init__(self.MESSAGE)
@@ -0,0 +1,203 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Tuple
+
+from ..utils import FileInfo
+
+
+def media_cache_key(file_info: FileInfo, account: str = None) -> str:
+    """
+    media_cache_key returns the cache key of a file,
+    which is built from the SHA-256 hash of the uploading
+    account and the file content, its size and its MIME
+    type. Memory-mapped files are hashed without copying
+    their content.
+
+    **Parameters**
+
+    - `file_info : FileInfo`  
+      The file to build the key for.
+
+    - `account : str`  
+      Identifier of the uploading account, like its
+      access token key. Media IDs can only be used by
+      the account which uploaded the media, so the same
+      file gets a different key for each account.  
+      *Default: `None`*
+
+    **Returns**
+
+    - `str`  
+      The cache key.
+    """
+
+    BLOCK_SIZE = 1024 * 1024
+
+    digest = hashlib.sha256()
+    if account:
+        digest.update(account.encode() + b'\0')
+    if file_info.mapping is not None:
+        digest.update(file_info.mapping)
+    else:
+        for offset in range(0, file_info.size, BLOCK_SIZE):
+            digest.update(file_info.read_at(offset, BLOCK_SIZE))
+
+    return '{0}-{1}-{2}'.format(digest.hexdigest(), file_info.size,
+        (file_info.mime_type or '').replace('/', '_'))
+
+
+class MediaCache(ABC):
+    """
+    Base class of media ID caches, which map the content
+    of uploaded files to the resulting media objects, so
+    that uploading the same file again returns the known
+    media ID without any request.
+
+    Twitter media IDs expire after `expires_after_secs`,
+    as returned by the upload. Entries expire at this
+    time, minus `margin`, or after `ttl`, whichever is
+    earlier.
+
+    Subclasses implement `_get`, `_set` and `_delete`.
+
+    **Parameters**
+
+    - `ttl : float`  
+      Maximum time in seconds an entry is kept.
+      If `None`, only the media expiry is used.  
+      *Default: `None`*
+
+    - `margin : float`  
+      Seconds before the media expiry at which an
+      entry is considered expired, so the media ID
+      stays valid while it is used.  
+      *Default: `60`*
+    """
+
+    def __init__(self, ttl: float = None, margin: float = 60):
+        self.ttl = ttl
+        self.margin = margin
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> dict:
+        """
+        Returns the upload response of the media stored
+        under `key` or `None`, if there is no entry or
+        the entry is expired.
+        """
+
+        entry = self._get(key)
+        if entry is not None:
+            data, expires_at = entry
+            if expires_at > time.time():
+                self.hits += 1
+                return data
+            self._delete(key)
+        self.misses += 1
+        return None
+
+    def set(self, key: str, data: dict):
+        """
+        Stores the upload response `data` under `key`.
+        Responses without `expires_after_secs` are only
+        stored if a `ttl` is set.
+        """
+
+        ttls = []
+        if self.ttl is not None:
+            ttls.append(self.ttl)
+        if data.get('expires_after_secs') is not None:
+            ttls.append(data['expires_after_secs'] - self.margin)
+        if not ttls or min(ttls) <= 0:
+            return
+        self._set(key, data, time.time() + min(ttls))
+
+    @abstractmethod
+    def _get(self, key: str) -> Tuple[dict, float]:
+        pass
+
+    @abstractmethod
+    def _set(self, key: str, data: dict, expires_at: float):
+        pass
+
+    @abstractmethod
+    def _delete(self, key: str):
+        pass
+
+
+class MemoryMediaCache(MediaCache):
+    """
+    In-memory `MediaCache`. Expired entries are
+    removed when they are accessed or when a new
+    entry is stored.
+    """
+
+    def __init__(self, ttl: float = None, margin: float = 60):
+        super().__init__(ttl, margin)
+        self._entries: Dict[str, Tuple[dict, float]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Tuple[dict, float]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def _set(self, key: str, data: dict, expires_at: float):
+        now = time.time()
+        with self._lock:
+            for k in [k for k, (_, e) in self._entries.items() if e <= now]:
+                del self._entries[k]
+            self._entries[key] = (data, expires_at)
+
+    def _delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class DiskMediaCache(MediaCache):
+    """
+    On-disk `MediaCache` storing one JSON file per
+    entry in `directory`, so the cache is shared
+    between processes and survives restarts.
+
+    **Parameters**
+
+    - `directory : str`  
+      Directory to store the entries in. It is
+      created if it does not exist.
+    """
+
+    def __init__(self, directory: str, ttl: float = None, margin: float = 60):
+        super().__init__(ttl, margin)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.json')
+
+    def _get(self, key: str) -> Tuple[dict, float]:
+        try:
+            with open(self._path(key), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry.get('data'), entry.get('expires_at', 0)
+
+    def _set(self, key: str, data: dict, expires_at: float):
+        # Write to a temporary file first, so concurrent
+        # readers never see partially written entries.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'data': data, 'expires_at': expires_at}, f)
+        os.replace(tmp, self._path(key))
+
+    def _delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
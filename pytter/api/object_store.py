@@ -0,0 +1,213 @@
+import time
+import sqlite3
+import threading
+from typing import Dict, Iterable, List
+
+from ..utils import utils
+
+
+_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS users (
+        id          TEXT PRIMARY KEY,
+        screen_name TEXT COLLATE NOCASE,
+        data        BLOB NOT NULL,
+        fetched_at  REAL NOT NULL
+    )''',
+    'CREATE INDEX IF NOT EXISTS users_screen_name ON users (screen_name)',
+    '''CREATE TABLE IF NOT EXISTS tweets (
+        id          TEXT PRIMARY KEY,
+        data        BLOB NOT NULL,
+        fetched_at  REAL NOT NULL
+    )''',
+)
+
+
+class ObjectStore:
+    """
+    Persistent store of the raw response objects of
+    Users and Tweets in a local SQLite database, which
+    can be shared by multiple processes.
+
+    Passed as `object_store` to `Client`, the users and
+    tweets requested via `Client.user`, `Client.users`
+    and `Client.statuses` are read from the store first.
+    Only missing and stale objects are fetched in bulk
+    from the API, and the results are written back to
+    the store.
+
+    The database uses write-ahead logging, so readers
+    do not block writers. Each thread uses its own
+    connection. Objects are upserted in transactions
+    of up to `batch_size` objects.
+
+    **Parameters**
+
+    - `path : str`  
+      Path of the database file. It is created
+      if it does not exist.
+
+    - `max_age : float`  
+      Time in seconds after which stored objects are
+      considered stale and fetched again.  
+      *Default: `3600`*
+
+    - `batch_size : int`  
+      Maximum number of objects read or written
+      in a single statement or transaction.  
+      *Default: `500`*
+    """
+
+    def __init__(self, path: str, max_age: float = 3600, batch_size: int = 500):
+        if batch_size < 1:
+            raise ValueError('batch_size must be larger than 0')
+
+        self.path = path
+        self.max_age = max_age
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with conn:
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """
+        Closes the connections of all threads.
+        """
+
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def _select(self, query: str, values: List[str], max_age: float) -> List[tuple]:
+        max_age = self.max_age if max_age is None else max_age
+        min_fetched_at = time.time() - max_age
+        conn = self._connection()
+        rows = []
+        for start in range(0, len(values), self.batch_size):
+            batch = values[start:start + self.batch_size]
+            rows += conn.execute(query.format(','.join('?' * len(batch))),
+                batch + [min_fetched_at]).fetchall()
+        return rows
+
+    def _upsert(self, query: str, rows: List[tuple]):
+        conn = self._connection()
+        for start in range(0, len(rows), self.batch_size):
+            with conn:
+                conn.executemany(query, rows[start:start + self.batch_size])
+
+    def _count(self, found: int, requested: int):
+        with self._lock:
+            self.hits += found
+            self.misses += requested - found
+
+    def get_users(self, ids: Iterable[str] = (), screen_names: Iterable[str] = (),
+        max_age: float = None) -> Dict[str, dict]:
+        """
+        Returns the stored, not stale raw User objects of
+        the given IDs and screen names, keyed by ID and by
+        screen name like `APISession.users_lookup`.
+        Screen names are matched case-insensitively.
+
+        **Parameters**
+
+        - `ids : Iterable[str]`  
+          IDs of the users.  
+          *Default: `()`*
+
+        - `screen_names : Iterable[str]`  
+          Screen names of the users.  
+          *Default: `()`*
+
+        - `max_age : float`  
+          Maximum age in seconds of returned objects.
+          If not passed, the stores `max_age` is used.  
+          *Default: `None`*
+
+        **Returns**
+
+        - `Dict[str, dict]`  
+          Raw User objects of the found users.
+        """
+
+        ids = [str(id) for id in ids]
+        screen_names = list(screen_names)
+        rows = self._select('SELECT data FROM users WHERE id IN ({}) AND fetched_at >= ?',
+            ids, max_age)
+        rows += self._select('SELECT data FROM users WHERE screen_name IN ({}) AND fetched_at >= ?',
+            screen_names, max_age)
+
+        users = {}
+        for (data,) in rows:
+            user = utils.json_loads(data)
+            users[user.get('id_str') or str(user.get('id'))] = user
+            users[user.get('screen_name')] = user
+
+        lowered = {k.lower() for k in users if k}
+        found = sum(1 for id in ids if id in users)
+        found += sum(1 for name in screen_names if name.lower() in lowered)
+        self._count(found, len(ids) + len(screen_names))
+        return users
+
+    def put_users(self, users: Iterable[dict]):
+        """
+        Upserts the passed raw User objects.
+        """
+
+        now = time.time()
+        self._upsert(
+            'INSERT INTO users (id, screen_name, data, fetched_at) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (id) DO UPDATE SET screen_name = excluded.screen_name, '
+            'data = excluded.data, fetched_at = excluded.fetched_at',
+            [(u.get('id_str') or str(u.get('id')), u.get('screen_name'), utils.json_dumps(u), now)
+                for u in users if u])
+
+    def get_tweets(self, ids: Iterable[str], max_age: float = None) -> Dict[str, dict]:
+        """
+        Returns the stored, not stale raw Tweet objects
+        of the given IDs keyed by ID. See `get_users`.
+        """
+
+        ids = [str(id) for id in ids]
+        rows = self._select('SELECT id, data FROM tweets WHERE id IN ({}) AND fetched_at >= ?',
+            ids, max_age)
+        tweets = {id: utils.json_loads(data) for id, data in rows}
+        self._count(len(tweets), len(ids))
+        return tweets
+
+    def put_tweets(self, tweets: Iterable[dict]):
+        """
+        Upserts the passed raw Tweet objects.
+        """
+
+        now = time.time()
+        self._upsert(
+            'INSERT INTO tweets (id, data, fetched_at) VALUES (?, ?, ?) '
+            'ON CONFLICT (id) DO UPDATE SET data = excluded.data, fetched_at = excluded.fetched_at',
+            [(t.get('id_str') or str(t.get('id')), utils.json_dumps(t), now)
+                for t in tweets if t])
+
+    def delete_tweets(self, ids: Iterable[str]):
+        """
+        Removes the Tweets with the given IDs.
+        """
+
+        self._upsert('DELETE FROM tweets WHERE id = ?', [(str(id),) for id in ids])
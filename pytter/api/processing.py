@@ -0,0 +1,46 @@
+from ..objects import Media
+from .exceptions import MediaProcessingException
+
+
+PROCESSING_PENDING     = 'pending'
+PROCESSING_IN_PROGRESS = 'in_progress'
+PROCESSING_FAILED      = 'failed'
+PROCESSING_SUCCEEDED   = 'succeeded'
+
+
+def processing_delay(media: Media, default: float = 1) -> float:
+    """
+    processing_delay returns the number of seconds to wait
+    before checking the processing state of the media again,
+    as advised by `check_after_secs` of its `processing_info`.
+
+    **Parameters**
+
+    - `media : Media`  
+      Media object returned by FINALIZE or STATUS.
+
+    - `default : float`  
+      Delay used if the response does not contain
+      `check_after_secs`.  
+      *Default: `1`*
+
+    **Returns**
+
+    - `float`  
+      Delay in seconds or `None`, if the media needs
+      no processing or processing succeeded.
+    """
+
+    info = media.processing_info
+    if not info:
+        return None
+
+    state = info.get('state')
+    if state == PROCESSING_SUCCEEDED:
+        return None
+    if state == PROCESSING_FAILED:
+        error = info.get('error') or {}
+        raise MediaProcessingException(media.id_str, error.get('message') or error.get('name'))
+
+    check_after = info.get('check_after_secs')
+    return default if check_after is None else max(check_after, 0)
@@ -0,0 +1,62 @@
+from typing import Callable, List
+
+
+PROJECTION_OBJECTS = 'objects'
+PROJECTION_RAW     = 'raw'
+
+PROJECTION_MODES = (
+    PROJECTION_OBJECTS,
+    PROJECTION_RAW,
+)
+
+
+def projector(projection: [str, List[str]], factory: Callable[[dict], object]) -> Callable[[dict], object]:
+    """
+    projector returns the function which is applied to
+    each raw response object for the given projection.
+
+    - `PROJECTION_OBJECTS` (or `None`) returns `factory`,
+      which builds the usual `User` or `Tweet` objects,
+    - `PROJECTION_RAW` returns `None`, so the raw response
+      dicts are used as they are and
+    - a list of field names returns a function building
+      dicts only containing these fields. Nested fields
+      can be selected with dotted paths like
+      `'user.screen_name'`. Missing fields are `None`.
+
+    **Parameters**
+
+    - `projection : [str, List[str]]`  
+      Projection mode or list of field names.
+
+    - `factory : Callable[[dict], object]`  
+      Function building the object of a raw
+      response object.
+
+    **Returns**
+
+    - `Callable[[dict], object]`  
+      Function applied to each raw response object
+      or `None`, if the raw objects shall be returned.
+    """
+
+    if projection is None or projection == PROJECTION_OBJECTS:
+        return factory
+    if projection == PROJECTION_RAW:
+        return None
+    if isinstance(projection, str):
+        raise ValueError('projection must be one of {} or a list of fields'
+            .format(PROJECTION_MODES))
+
+    fields = [(f, f.split('.')) for f in projection]
+
+    def project(data: dict) -> dict:
+        out = {}
+        for field, path in fields:
+            value = data
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            out[field] = value
+        return out
+
+    return project
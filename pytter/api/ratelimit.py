@@ -0,0 +1,236 @@
+import re
+import time
+import threading
+from typing import Dict
+
+from .exceptions import RateLimitException
+
+
+RATE_LIMIT_WAIT   = 'wait'
+RATE_LIMIT_RAISE  = 'raise'
+RATE_LIMIT_IGNORE = 'ignore'
+
+RATE_LIMIT_MODES = (
+    RATE_LIMIT_WAIT,
+    RATE_LIMIT_RAISE,
+    RATE_LIMIT_IGNORE,
+)
+
+
+def endpoint_key(resource_path: str) -> str:
+    """
+    endpoint_key normalizes a resource path to the
+    endpoint identifier Twitter uses for rate limit
+    windows, so 'statuses/retweet/123.json' becomes
+    'statuses/retweet/:id'.
+
+    **Parameters**
+
+    - `resource_path : str`  
+      Path to the requested resource (without root URI).
+
+    **Returns**
+
+    - `str`  
+      Normalized endpoint key.
+    """
+
+    path = resource_path.strip('/')
+    if path.endswith('.json'):
+        path = path[:-5]
+    return re.sub(r'/\d+(?=/|$)', '/:id', path)
+
+
+class RateLimit:
+    """
+    Rate limit window state of a single endpoint
+    as reported by the `x-rate-limit-*` headers.
+    """
+
+    WINDOW = 15 * 60
+
+    def __init__(self, limit: int, remaining: int, reset: float):
+        self.limit      = limit
+        self.remaining  = remaining
+        self.reset      = reset
+
+    def reset_in(self, now: float = None) -> float:
+        """
+        Returns the seconds until the window
+        resets, or `0` if it already did.
+        """
+
+        return max(0.0, self.reset - (now or time.time()))
+
+
+class RateLimitLedger:
+    """
+    Thread safe per-endpoint book of rate limit windows.
+    Each response updates the ledger from its headers and
+    each request reserves one slot of the window before
+    it is sent, so callers are throttled before the window
+    is exhausted instead of after a 429 came back.
+
+    **Parameters**
+
+    - `mode: str`  
+      What to do when a window is exhausted. `'wait'` blocks
+      until the window resets, `'raise'` fails fast with a
+      `RateLimitException` and `'ignore'` sends the request
+      anyway.  
+      *Default: `'raise'`*
+    """
+
+    def __init__(self, mode: str = RATE_LIMIT_RAISE):
+        if mode not in RATE_LIMIT_MODES:
+            raise ValueError('mode must be one of {}'.format(RATE_LIMIT_MODES))
+        self.mode = mode
+        self._limits: Dict[str, RateLimit] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> RateLimit:
+        """
+        Returns the known rate limit window of
+        the endpoint or `None`.
+        """
+
+        return self._limits.get(endpoint)
+
+    def remaining(self, endpoint: str) -> float:
+        """
+        Returns the remaining requests of the endpoints
+        current window, or infinity if the window is
+        unknown or already reset.
+        """
+
+        rl = self._limits.get(endpoint)
+        if rl is None or rl.reset <= time.time():
+            return float('inf')
+        return rl.remaining
+
+    def reset_in(self, endpoint: str) -> float:
+        """
+        Returns the seconds until the endpoints window
+        resets, or `0` if it is unknown.
+        """
+
+        rl = self._limits.get(endpoint)
+        return rl.reset_in() if rl is not None else 0
+
+    def reserve(self, endpoint: str) -> float:
+        """
+        Tries to reserve one request slot of the endpoints
+        current window.
+
+        **Parameters**
+
+        - `endpoint: str`  
+          Normalized endpoint key.
+
+        **Returns**
+
+        - `float`  
+          `0` if a slot was reserved, else the seconds
+          to wait until the window resets. In `'raise'`
+          mode, a `RateLimitException` is raised instead.
+        """
+
+        if self.mode == RATE_LIMIT_IGNORE:
+            return 0
+
+        with self._lock:
+            rl = self._limits.get(endpoint)
+            if rl is None:
+                return 0
+
+            now = time.time()
+            if rl.reset <= now:
+                # Starts the next window, until the headers
+                # of the next response report the actual one.
+                rl.remaining = max(rl.limit, 1)
+                rl.reset = now + RateLimit.WINDOW
+            if rl.remaining > 0:
+                rl.remaining -= 1
+                return 0
+
+            wait = rl.reset_in(now)
+
+        if self.mode == RATE_LIMIT_RAISE:
+            raise RateLimitException(reset=rl.reset)
+
+        return wait
+
+    def acquire(self, endpoint: str):
+        """
+        Reserves one request slot of the endpoints
+        window, blocking until the window resets
+        if necessary.
+
+        **Parameters**
+
+        - `endpoint: str`  
+          Normalized endpoint key.
+        """
+
+        wait = self.reserve(endpoint)
+        while wait > 0:
+            time.sleep(wait)
+            wait = self.reserve(endpoint)
+
+    def update(self, endpoint: str, headers: dict):
+        """
+        Updates the endpoints window from the
+        `x-rate-limit-*` response headers. Responses
+        without those headers are ignored.
+
+        **Parameters**
+
+        - `endpoint: str`  
+          Normalized endpoint key.
+
+        - `headers: dict`  
+          Response headers.
+        """
+
+        try:
+            limit = int(headers['x-rate-limit-limit'])
+            remaining = int(headers['x-rate-limit-remaining'])
+            reset = float(headers['x-rate-limit-reset'])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        with self._lock:
+            rl = self._limits.get(endpoint)
+            if rl is None or rl.reset != reset:
+                self._limits[endpoint] = RateLimit(limit, remaining, reset)
+            else:
+                # Slots reserved by requests still in flight are
+                # not yet reflected by the server side count.
+                rl.limit = limit
+                rl.remaining = min(rl.remaining, remaining)
+
+    def exhaust(self, endpoint: str, reset: float = None):
+        """
+        Marks the endpoints window as exhausted, for
+        example after a 429 response.
+
+        **Parameters**
+
+        - `endpoint: str`  
+          Normalized endpoint key.
+
+        - `reset: float`  
+          Unix timestamp when the window resets.
+          If not passed, a 15 minute window is assumed.  
+          *Default: `None`*
+        """
+
+        reset = reset or time.time() + 15 * 60
+
+        with self._lock:
+            rl = self._limits.get(endpoint)
+            if rl is None:
+                self._limits[endpoint] = RateLimit(0, 0, reset)
+            else:
+                rl.remaining = 0
+                rl.reset = reset
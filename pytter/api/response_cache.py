@@ -0,0 +1,386 @@
+import copy
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+
+def response_cache_key(resource_path: str, params: dict) -> Tuple:
+    """
+    response_cache_key returns the key of a GET request
+    built from its resource path and its parameters.
+    """
+
+    params = params or {}
+    return (resource_path.strip('/'),
+        tuple(sorted((k, str(v)) for k, v in params.items() if v is not None)))
+
+
+def request_tags(endpoint: str, resource_path: str, params: dict) -> List[str]:
+    """
+    request_tags returns the tags of the Tweets and Users
+    a request reads or writes, like `'tweet:<id>'`,
+    `'user:<id>'` or `'user:@<screen_name>'`.
+
+    Cached responses are tagged with the tags of their
+    request, and write requests invalidate the cached
+    responses carrying their tags.
+
+    **Parameters**
+
+    - `endpoint : str`  
+      Endpoint key as returned by `endpoint_key`.
+
+    - `resource_path : str`  
+      Path of the requested resource.
+
+    - `params : dict`  
+      Query or body parameters of the request.
+
+    **Returns**
+
+    - `List[str]`  
+      Tags of the request.
+    """
+
+    params = params or {}
+
+    if endpoint in ('statuses/show', 'statuses/lookup', 'favorites/create', 'favorites/destroy'):
+        return ['tweet:' + id for id in str(params.get('id', '')).split(',') if id]
+
+    if endpoint in ('statuses/destroy/:id', 'statuses/retweet/:id', 'statuses/unretweet/:id'):
+        id = resource_path.strip('/').rsplit('/', 1)[-1]
+        return ['tweet:' + id.split('.', 1)[0]]
+
+    if endpoint in ('users/show', 'users/lookup'):
+        tags = ['user:' + id for id in str(params.get('user_id') or '').split(',') if id]
+        tags += ['user:@' + name.lower()
+            for name in str(params.get('screen_name') or '').split(',') if name]
+        return tags
+
+    if endpoint == 'account/verify_credentials':
+        return ['user:self']
+
+    return []
+
+
+class CacheStats:
+    """
+    Thread safe counters of a `ResponseCache`.
+
+    - `hits` and `misses` count the lookups of cacheable
+      requests, `hits_by_endpoint` and `misses_by_endpoint`
+      split them up per endpoint,
+    - `evictions` is the number of entries dropped to
+      keep the cache within `max_entries`,
+    - `expirations` the number of expired entries found
+      on lookup and
+    - `invalidations` the number of entries removed
+      by write requests.
+    """
+
+    def __init__(self):
+        self.hits: int          = 0
+        self.misses: int        = 0
+        self.evictions: int     = 0
+        self.expirations: int   = 0
+        self.invalidations: int = 0
+        self.hits_by_endpoint: Dict[str, int]   = {}
+        self.misses_by_endpoint: Dict[str, int] = {}
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        Ratio of lookups served from the cache
+        or `0`, if there was no lookup yet.
+        """
+
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResponseCache:
+    """
+    LRU cache of responses of read endpoints, so repeated
+    requests of the same Tweets or Users within the TTL of
+    their endpoint are served without a request.
+
+    Only GET requests of endpoints with a TTL are cached.
+    The cache holds at most `max_entries` responses and
+    drops the least recently used ones first. Entries are
+    tagged with the Tweets and Users they were requested
+    for, see `request_tags`. Write requests, like
+    `favorites_create`, `statuses_destroy` or
+    `statuses_retweet`, remove all entries of the written
+    Tweet once they completed. Responses of requests which
+    started before such a write are not stored, so a read
+    racing with a write cannot restore the old state, see
+    `generation`.
+
+    Responses are copied when they are stored and when
+    they are returned, so callers may modify them.
+
+    **Parameters**
+
+    - `max_entries : int`  
+      Maximum number of cached responses.  
+      *Default: `10000`*
+
+    - `ttls : Dict[str, float]`  
+      TTLs in seconds by endpoint key (like
+      `'users/show'`), which are merged into
+      `DEFAULT_TTLS`. A TTL of `0` or `None`
+      disables caching of the endpoint.  
+      *Default: `None`*
+    """
+
+    DEFAULT_TTLS = {
+        'account/verify_credentials': 60,
+        'statuses/show':              60,
+        'statuses/lookup':            60,
+        'users/show':                 300,
+        'users/lookup':               300,
+    }
+
+    def __init__(self, max_entries: int = 10000, ttls: Dict[str, float] = None):
+        if max_entries < 1:
+            raise ValueError('max_entries must be larger than 0')
+
+        self.max_entries = max_entries
+        self.ttls = dict(self.DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._tags: Dict[str, set] = {}
+        self._generation = 0
+        self._tag_generations = OrderedDict()
+        self._pruned_generation = 0
+        self._lock = threading.Lock()
+
+    def ttl(self, endpoint: str) -> float:
+        """
+        Returns the TTL of the endpoint or `None`,
+        if its responses are not cached.
+        """
+
+        return self.ttls.get(endpoint) or None
+
+    def generation(self) -> int:
+        """
+        Returns the current invalidation generation, which
+        is passed to `set` with the response of a request
+        started now.
+        """
+
+        with self._lock:
+            return self._generation
+
+    def get(self, endpoint: str, key: Tuple) -> object:
+        """
+        Returns the cached response stored under `key`
+        or `None`, if there is none or it is expired.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                self._remove(key)
+                self.stats.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.stats.misses += 1
+                self.stats.misses_by_endpoint[endpoint] = self.stats.misses_by_endpoint.get(endpoint, 0) + 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            self.stats.hits_by_endpoint[endpoint] = self.stats.hits_by_endpoint.get(endpoint, 0) + 1
+            value = entry[0]
+        return copy.deepcopy(value)
+
+    def set(self, endpoint: str, key: Tuple, value: object, tags: List[str] = (),
+        generation: int = None):
+        """
+        Stores the response `value` of the endpoint
+        under `key`, tagged with `tags`. If `generation`
+        is passed and one of the tags was invalidated
+        since `generation()` returned it, the response
+        may be stale and is not stored.
+        """
+
+        ttl = self.ttl(endpoint)
+        if ttl is None or value is None:
+            return
+        value = copy.deepcopy(value)
+
+        with self._lock:
+            if generation is not None and self._invalidated_since(tags, generation):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + ttl, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def invalidate(self, tags: List[str]) -> int:
+        """
+        Removes all entries tagged with one of `tags`
+        and returns the number of removed entries.
+        """
+
+        removed = 0
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                self._tag_generations.pop(tag, None)
+                self._tag_generations[tag] = self._generation
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+                    removed += 1
+            # Forgets the oldest tags, but remembers their
+            # generation, so requests started before it
+            # are not stored.
+            while len(self._tag_generations) > self.max_entries:
+                _, self._pruned_generation = self._tag_generations.popitem(last=False)
+            self.stats.invalidations += removed
+        return removed
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _invalidated_since(self, tags: List[str], generation: int) -> bool:
+        if generation < self._pruned_generation:
+            return True
+        return any(self._tag_generations.get(tag, 0) > generation for tag in tags)
+
+    def _remove(self, key: Tuple):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class NegativeCache:
+    """
+    Cache of Tweet IDs which could not be fetched, because
+    the Tweets are deleted, protected or otherwise not
+    accessible, so they are not requested again within
+    `ttl`.
+
+    IDs are added when `statuses_lookup` returns `None`
+    for them or when `statuses_show` fails with one of
+    the `STATUS_CODES`. `statuses_lookup_bulk` leaves
+    cached IDs out of its batches and returns `None`
+    for them, so each batch is filled with IDs which
+    can still be resolved.
+
+    The cache holds at most `max_entries` IDs and drops
+    the least recently added ones first.
+
+    **Parameters**
+
+    - `ttl : float`  
+      Time in seconds an ID is kept.  
+      *Default: `3600`*
+
+    - `max_entries : int`  
+      Maximum number of cached IDs.  
+      *Default: `100000`*
+    """
+
+    STATUS_CODES = (403, 404)
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 100000):
+        if max_entries < 1:
+            raise ValueError('max_entries must be larger than 0')
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, id: [str, int]) -> int:
+        """
+        Returns the status code recorded for the ID
+        or `None`, if it is not cached or expired.
+        """
+
+        id = str(id)
+        with self._lock:
+            entry = self._entries.get(id)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._entries[id]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def partition(self, ids: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Splits `ids` into the IDs which are not cached
+        and the cached IDs, keeping their order.
+        """
+
+        remaining, cached = [], []
+        for id in ids:
+            (cached if self.get(id) is not None else remaining).append(id)
+        return remaining, cached
+
+    def add(self, ids: List[str], status_code: int = 404):
+        """
+        Adds the IDs with the status code of the failed
+        request. IDs returned as `None` by `statuses_lookup`
+        are recorded as `404`.
+        """
+
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            for id in ids:
+                id = str(id)
+                self._entries.pop(id, None)
+                self._entries[id] = (status_code, expires)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, ids: List[str]):
+        """
+        Removes the IDs from the cache.
+        """
+
+        with self._lock:
+            for id in ids:
+                self._entries.pop(str(id), None)
+
+    def clear(self):
+        """
+        Removes all IDs.
+        """
+
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,282 @@
+import time
+import random
+import asyncio
+import threading
+import email.utils
+from typing import Callable, Dict
+
+import requests
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .exceptions import RateLimitException, RequestFailedException
+
+
+TRANSIENT_EXCEPTIONS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    ConnectionError,
+    TimeoutError,
+    asyncio.TimeoutError,
+) + ((aiohttp.ClientConnectionError,) if aiohttp else ())
+
+
+class RetryStats:
+    """
+    Thread safe counters of a `RetryPolicy`.
+
+    - `retries` is the total number of retried requests,
+    - `wait_time` the total time in seconds spent waiting
+      between attempts,
+    - `failures` the number of requests which failed after
+      the policy gave up or which were not retryable and
+    - `by_endpoint` the number of retries per endpoint.
+    """
+
+    def __init__(self):
+        self.retries: int       = 0
+        self.wait_time: float   = 0.0
+        self.failures: int      = 0
+        self.by_endpoint: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record_retry(self, endpoint: str, wait: float):
+        with self._lock:
+            self.retries += 1
+            self.wait_time += wait
+            self.by_endpoint[endpoint] = self.by_endpoint.get(endpoint, 0) + 1
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+
+class RetryPolicy:
+    """
+    Configures if and when failed requests are retried.
+
+    Rate limited requests (429 responses or requests which
+    were not sent because the rate limit window is exhausted)
+    are retried after the window resets, honoring the
+    `x-rate-limit-reset` header. Transient failures (server
+    errors and connection errors) are only retried for
+    idempotent requests, using exponential backoff with
+    full jitter or the `Retry-After` header, if sent.
+
+    Only the single failed request is retried, so a failing
+    page of a cursored request or a failing segment of a
+    chunked upload does not restart the whole operation.
+
+    **Parameters**
+
+    - `max_retries: int`  
+      Maximum number of retries per request.  
+      *Default: `3`*
+
+    - `backoff_base: float`  
+      Base delay in seconds of the exponential backoff.  
+      *Default: `1.0`*
+
+    - `backoff_max: float`  
+      Maximum backoff delay in seconds.  
+      *Default: `60.0`*
+
+    - `jitter: bool`  
+      Randomize the backoff delays (full jitter).  
+      *Default: `True`*
+
+    - `retry_statuses: tuple`  
+      Response status codes considered transient.  
+      *Default: `(500, 502, 503, 504)`*
+
+    - `retry_rate_limited: bool`  
+      Wait for the rate limit window reset and retry
+      rate limited requests.  
+      *Default: `True`*
+
+    - `max_rate_limit_wait: float`  
+      Rate limited requests are not retried if the window
+      resets later than this ammount of seconds.  
+      *Default: `900`*
+
+    - `idempotent_methods: tuple`  
+      Request methods which are safe to be retried.  
+      *Default: `('GET',)`*
+
+    - `idempotent_endpoints: tuple`  
+      Endpoints which are safe to be retried with any
+      request method.  
+      *Default: `('media/upload', 'oauth2/token')`*
+    """
+
+    def __init__(self,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        jitter: bool = True,
+        retry_statuses: tuple = (500, 502, 503, 504),
+        retry_rate_limited: bool = True,
+        max_rate_limit_wait: float = 15 * 60,
+        idempotent_methods: tuple = ('GET',),
+        idempotent_endpoints: tuple = ('media/upload', 'oauth2/token')):
+
+        self.max_retries            = max_retries
+        self.backoff_base           = backoff_base
+        self.backoff_max            = backoff_max
+        self.jitter                 = jitter
+        self.retry_statuses         = retry_statuses
+        self.retry_rate_limited     = retry_rate_limited
+        self.max_rate_limit_wait    = max_rate_limit_wait
+        self.idempotent_methods     = idempotent_methods
+        self.idempotent_endpoints   = idempotent_endpoints
+        self.stats                  = RetryStats()
+
+    def is_idempotent(self, method: str, endpoint: str) -> bool:
+        """
+        Returns `True` if a request with the given method
+        to the given endpoint is safe to be sent twice.
+        """
+
+        return method.upper() in self.idempotent_methods or endpoint in self.idempotent_endpoints
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Returns the backoff delay in seconds before
+        the retry with the given (zero based) index.
+        """
+
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def retry_delay(self, exc: Exception, method: str, endpoint: str, attempt: int) -> float:
+        """
+        Decides if a request which failed with the given
+        exception shall be retried.
+
+        **Parameters**
+
+        - `exc: Exception`  
+          The exception the request failed with.
+
+        - `method: str`  
+          Request method.
+
+        - `endpoint: str`  
+          Normalized endpoint key.
+
+        - `attempt: int`  
+          Zero based index of the retry.
+
+        **Returns**
+
+        - `float`  
+          The seconds to wait before retrying or `None`,
+          if the request shall not be retried.
+        """
+
+        if attempt >= self.max_retries:
+            return None
+
+        if isinstance(exc, RateLimitException):
+            if not self.retry_rate_limited:
+                return None
+            if exc.reset is None:
+                return self.backoff(attempt)
+            wait = max(0.0, exc.reset - time.time())
+            if wait > self.max_rate_limit_wait:
+                return None
+            # Spread the retries of concurrent callers a bit, so
+            # they do not hit the new window all at the same time.
+            return wait + (random.uniform(0, 1) if self.jitter else 0)
+
+        if not self.is_idempotent(method, endpoint):
+            return None
+
+        if isinstance(exc, RequestFailedException):
+            if exc.status_code not in self.retry_statuses:
+                return None
+            retry_after = _parse_retry_after(exc.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+            return self.backoff(attempt)
+
+        if isinstance(exc, TRANSIENT_EXCEPTIONS):
+            return self.backoff(attempt)
+
+        return None
+
+    def call(self, fn: Callable, method: str, endpoint: str) -> object:
+        """
+        Calls `fn` and retries it according to the policy.
+
+        **Parameters**
+
+        - `fn: Callable`  
+          Function sending the request.
+
+        - `method: str`  
+          Request method.
+
+        - `endpoint: str`  
+          Normalized endpoint key.
+
+        **Returns**
+
+        - `object`  
+          The result of `fn`.
+        """
+
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                delay = self.retry_delay(e, method, endpoint, attempt)
+                if delay is None:
+                    self.stats.record_failure()
+                    raise
+            self.stats.record_retry(endpoint, delay)
+            time.sleep(delay)
+            attempt += 1
+
+    async def call_async(self, fn: Callable, method: str, endpoint: str) -> object:
+        """
+        Async version of `RetryPolicy.call` awaiting
+        the coroutine function `fn`.
+        """
+
+        attempt = 0
+        while True:
+            try:
+                return await fn()
+            except Exception as e:
+                delay = self.retry_delay(e, method, endpoint, attempt)
+                if delay is None:
+                    self.stats.record_failure()
+                    raise
+            self.stats.record_retry(endpoint, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def _parse_retry_after(value: str) -> float:
+    """
+    Parses a `Retry-After` header value, which may
+    either be a number of seconds or a HTTP date.
+    """
+
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
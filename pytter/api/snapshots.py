@@ -0,0 +1,456 @@
+import os
+import re
+import sys
+import mmap
+import time
+import zlib
+import struct
+import tempfile
+import threading
+from array import array
+from typing import Iterator, NamedTuple, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ..utils import IdSet
+
+
+SNAPSHOT_FOLLOWERS = 'followers'
+SNAPSHOT_FRIENDS   = 'friends'
+
+SNAPSHOT_KINDS = (
+    SNAPSHOT_FOLLOWERS,
+    SNAPSHOT_FRIENDS,
+)
+
+# timestamp, total, number of gained IDs, number of lost IDs,
+# CRC32 of the snapshot file the entry leads to
+_DELTA_HEADER = struct.Struct('<dQQQI')
+# length and CRC32 of the preceding header and IDs
+_DELTA_TRAILER = struct.Struct('<QI')
+
+
+class SnapshotDiff(NamedTuple):
+    """
+    Difference of a snapshot to the previous snapshot
+    of the same account.
+
+    - `timestamp` is the time the snapshot was taken,
+    - `total` the number of IDs in the snapshot,
+    - `gained` the IDs added since the previous snapshot
+      (all IDs for the first snapshot) and
+    - `lost` the IDs removed since the previous snapshot.
+    """
+
+    timestamp: float
+    total: int
+    gained: IdSet
+    lost: IdSet
+
+
+class _MappedIds:
+    """
+    Context manager mapping a snapshot file into memory
+    and returning its IDs as read-only sequence of ints.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._file = None
+        self._mmap = None
+        self._view = None
+
+    def __enter__(self):
+        try:
+            self._file = open(self._path, 'rb')
+        except FileNotFoundError:
+            return array('Q')
+        size = os.fstat(self._file.fileno()).st_size
+        if size == 0:
+            return array('Q')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if sys.byteorder != 'little':
+            ids = array('Q')
+            ids.frombytes(self._mmap)
+            ids.byteswap()
+            return ids
+        self._view = memoryview(self._mmap).cast('Q')
+        return self._view
+
+    def __exit__(self, *args):
+        if self._view is not None:
+            self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def _to_le_bytes(ids: array) -> bytes:
+    if sys.byteorder == 'little':
+        return ids.tobytes()
+    ids = array('Q', ids)
+    ids.byteswap()
+    return ids.tobytes()
+
+
+def _from_le_bytes(data: bytes) -> array:
+    ids = array('Q')
+    ids.frombytes(data)
+    if sys.byteorder != 'little':
+        ids.byteswap()
+    return ids
+
+
+def diff_sorted(old, new, block_size: int = 1 << 20) -> Tuple[IdSet, IdSet]:
+    """
+    diff_sorted compares two ascending, duplicate free
+    sequences of IDs, like `IdSet.ids` or memory-mapped
+    snapshots, and returns the gained and lost IDs.
+
+    Without NumPy, both sequences are walked once in a
+    linear merge. With NumPy, `old` is looked up in `new`
+    and vice versa in blocks of `block_size` IDs, so the
+    memory used besides the results stays bounded.
+
+    **Parameters**
+
+    - `old : Sequence[int]`  
+      IDs of the previous snapshot.
+
+    - `new : Sequence[int]`  
+      IDs of the current snapshot.
+
+    - `block_size : int`  
+      Number of IDs compared at once with NumPy.  
+      *Default: `1048576`*
+
+    **Returns**
+
+    - `Tuple[IdSet, IdSet]`  
+      Gained and lost IDs.
+    """
+
+    if numpy is not None:
+        a = numpy.frombuffer(old, dtype=numpy.uint64) if len(old) else numpy.empty(0, numpy.uint64)
+        b = numpy.frombuffer(new, dtype=numpy.uint64) if len(new) else numpy.empty(0, numpy.uint64)
+        return _missing_numpy(b, a, block_size), _missing_numpy(a, b, block_size)
+
+    gained, lost = array('Q'), array('Q')
+    i, j = 0, 0
+    n, m = len(old), len(new)
+    while i < n and j < m:
+        a, b = old[i], new[j]
+        if a == b:
+            i, j = i + 1, j + 1
+        elif a < b:
+            lost.append(a)
+            i += 1
+        else:
+            gained.append(b)
+            j += 1
+    lost.extend(old[i:])
+    gained.extend(new[j:])
+    return IdSet.from_array(gained, True), IdSet.from_array(lost, True)
+
+
+def _missing_numpy(a, b, block_size: int) -> IdSet:
+    """
+    Returns the IDs of the sorted array `a` which
+    are not contained in the sorted array `b`.
+    """
+
+    missing = array('Q')
+    for start in range(0, len(a), block_size):
+        block = a[start:start + block_size]
+        if len(b) == 0:
+            missing.frombytes(block.tobytes())
+            continue
+        idx = numpy.searchsorted(b, block)
+        idx[idx == len(b)] = len(b) - 1
+        missing.frombytes(block[b[idx] != block].tobytes())
+    return IdSet.from_array(missing, True)
+
+
+def _file_crc(path: str) -> int:
+    """
+    Returns the CRC32 of a file, which is 0 for
+    empty and missing files.
+    """
+
+    crc = 0
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return crc
+    with f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            crc = zlib.crc32(block, crc)
+    return crc
+
+
+def _fsync_dir(directory: str):
+    """
+    Flushes the directory entry of a replaced file to
+    disk. Directories can not be opened on Windows, where
+    this is not needed.
+    """
+
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _read_entries(f) -> Iterator[Tuple[int, SnapshotDiff, int]]:
+    """
+    Yields the entries of a history file together with
+    the offset of their end and the CRC32 of the snapshot
+    they lead to, until the first entry which is
+    incomplete or does not match its CRC32.
+    """
+
+    end = 0
+    while True:
+        header = f.read(_DELTA_HEADER.size)
+        if len(header) < _DELTA_HEADER.size:
+            return
+        timestamp, total, n_gained, n_lost, snapshot_crc = _DELTA_HEADER.unpack(header)
+        data = f.read((n_gained + n_lost) * 8)
+        trailer = f.read(_DELTA_TRAILER.size)
+        if len(trailer) < _DELTA_TRAILER.size:
+            return
+        length, crc = _DELTA_TRAILER.unpack(trailer)
+        if length != len(header) + len(data) or crc != zlib.crc32(header + data):
+            return
+        end += length + _DELTA_TRAILER.size
+        gained = _from_le_bytes(data[:n_gained * 8])
+        lost = _from_le_bytes(data[n_gained * 8:])
+        yield end, SnapshotDiff(timestamp, total,
+            IdSet.from_array(gained, True), IdSet.from_array(lost, True)), snapshot_crc
+
+
+class SnapshotStore:
+    """
+    On-disk store of follower and friend ID snapshots.
+
+    The latest snapshot of each account is kept as file
+    of ascending little-endian uint64 IDs, which is
+    memory-mapped when compared, so only the gained and
+    lost IDs are held in memory. Each saved snapshot
+    appends its difference to the previous one to a
+    history file of the account. As the first entry
+    contains the full first snapshot, every earlier
+    snapshot can be rebuilt from the history. Entries
+    end with their length and CRC32, so an entry torn
+    by a crash while saving is detected and dropped.
+    The history entry is written before the snapshot is
+    replaced and holds the CRC32 of the new snapshot, so
+    an entry whose snapshot was never written, because
+    of a crash in between, is ignored and dropped as well.
+
+    Saving is serialized per account by locks of the
+    store instance, which only guard against concurrent
+    writers within one process. Only one `SnapshotStore`
+    instance may write to a directory at a time.
+
+        store = SnapshotStore('./snapshots')
+        diff = store.save('zekroTJA', client.followers_id_set(screen_name='zekroTJA'))
+        print(len(diff.gained), len(diff.lost))
+
+    **Parameters**
+
+    - `directory : str`  
+      Directory to store the snapshots in. It is
+      created if it does not exist.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _path(self, account: [str, int], kind: str, ext: str) -> str:
+        if kind not in SNAPSHOT_KINDS:
+            raise ValueError('kind must be one of {}'.format(SNAPSHOT_KINDS))
+        name = re.sub(r'[^\w.-]', '_', str(account))
+        return os.path.join(self.directory, '{0}.{1}.{2}'.format(name, kind, ext))
+
+    def _lock(self, path: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def load(self, account: [str, int], kind: str = SNAPSHOT_FOLLOWERS) -> IdSet:
+        """
+        Returns the latest snapshot of the account or
+        an empty IdSet, if there is none.
+        """
+
+        ids = array('Q')
+        try:
+            with open(self._path(account, kind, 'ids'), 'rb') as f:
+                ids.fromfile(f, os.fstat(f.fileno()).st_size // ids.itemsize)
+        except FileNotFoundError:
+            pass
+        if sys.byteorder != 'little':
+            ids.byteswap()
+        return IdSet.from_array(ids, True)
+
+    def diff(self, account: [str, int], ids: IdSet, kind: str = SNAPSHOT_FOLLOWERS) -> SnapshotDiff:
+        """
+        Compares `ids` with the latest snapshot of the
+        account without saving them.
+        """
+
+        ids = ids if isinstance(ids, IdSet) else IdSet(ids)
+        with _MappedIds(self._path(account, kind, 'ids')) as old:
+            gained, lost = diff_sorted(old, ids.ids)
+        return SnapshotDiff(time.time(), len(ids), gained, lost)
+
+    def save(self, account: [str, int], ids: IdSet, kind: str = SNAPSHOT_FOLLOWERS,
+        timestamp: float = None) -> SnapshotDiff:
+        """
+        Saves `ids` as the latest snapshot of the account,
+        appends the difference to the previous snapshot to
+        the history and returns it.
+
+        **Parameters**
+
+        - `account : [str, int]`  
+          ID or screen name of the account.
+
+        - `ids : IdSet`  
+          IDs of the crawled followers or friends.
+
+        - `kind : str`  
+          `SNAPSHOT_FOLLOWERS` or `SNAPSHOT_FRIENDS`.  
+          *Default: `'followers'`*
+
+        - `timestamp : float`  
+          Time the snapshot was taken.
+          If not passed, the current time is used.  
+          *Default: `None`*
+
+        **Returns**
+
+        - `SnapshotDiff`  
+          Difference to the previous snapshot.
+        """
+
+        ids = ids if isinstance(ids, IdSet) else IdSet(ids)
+        timestamp = time.time() if timestamp is None else timestamp
+        path = self._path(account, kind, 'ids')
+
+        with self._lock(path):
+            with _MappedIds(path) as old:
+                gained, lost = diff_sorted(old, ids.ids)
+
+            # The difference is appended before the snapshot
+            # is replaced, so it is never lost.
+            data = _to_le_bytes(ids.ids)
+            entry = b''.join((
+                _DELTA_HEADER.pack(timestamp, len(ids), len(gained), len(lost), zlib.crc32(data)),
+                _to_le_bytes(gained.ids),
+                _to_le_bytes(lost.ids),
+            ))
+            history = self._path(account, kind, 'history')
+            self._repair_history(history, path)
+            with open(history, 'ab') as f:
+                f.write(entry)
+                f.write(_DELTA_TRAILER.pack(len(entry), zlib.crc32(entry)))
+                f.flush()
+                os.fsync(f.fileno())
+
+            # Write to a temporary file first, so readers
+            # never see partially written snapshots.
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+            _fsync_dir(self.directory)
+
+        return SnapshotDiff(timestamp, len(ids), gained, lost)
+
+    def _repair_history(self, path: str, snapshot: str):
+        """
+        Truncates the history file after its last valid
+        entry, if its end was torn while saving, and drops
+        the last entry, if its snapshot was not written, so
+        new entries are not appended behind them.
+        """
+
+        try:
+            f = open(path, 'r+b')
+        except FileNotFoundError:
+            return
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return
+            if size >= _DELTA_TRAILER.size:
+                f.seek(size - _DELTA_TRAILER.size)
+                length, crc = _DELTA_TRAILER.unpack(f.read(_DELTA_TRAILER.size))
+                start = size - _DELTA_TRAILER.size - length
+                if start >= 0 and length >= _DELTA_HEADER.size:
+                    f.seek(start)
+                    entry = f.read(length)
+                    if zlib.crc32(entry) == crc:
+                        if _DELTA_HEADER.unpack_from(entry)[-1] != _file_crc(snapshot):
+                            f.truncate(start)
+                        return
+
+            start, end, snapshot_crc = 0, 0, None
+            f.seek(0)
+            for entry_end, _, entry_crc in _read_entries(f):
+                start, end, snapshot_crc = end, entry_end, entry_crc
+            if snapshot_crc is not None and snapshot_crc != _file_crc(snapshot):
+                end = start
+            f.truncate(end)
+
+    def history(self, account: [str, int], kind: str = SNAPSHOT_FOLLOWERS) -> Iterator[SnapshotDiff]:
+        """
+        Yields the differences of all saved snapshots
+        of the account, oldest first.
+        """
+
+        path = self._path(account, kind, 'ids')
+        with self._lock(path):
+            try:
+                f = open(self._path(account, kind, 'history'), 'rb')
+            except FileNotFoundError:
+                return
+            with f:
+                entries = list(_read_entries(f))
+            # The last entry is left out if its snapshot
+            # was not written.
+            if entries and entries[-1][2] != _file_crc(path):
+                entries.pop()
+
+        for _, delta, _ in entries:
+            yield delta
+
+    def snapshot_at(self, account: [str, int], index: int, kind: str = SNAPSHOT_FOLLOWERS) -> IdSet:
+        """
+        Rebuilds the snapshot with the given index in the
+        history (0 is the first, -1 the latest snapshot)
+        by applying the saved differences.
+        """
+
+        deltas = list(self.history(account, kind))
+        if not -len(deltas) <= index < len(deltas):
+            raise IndexError('snapshot index out of range')
+
+        ids = IdSet()
+        for delta in deltas[:index % len(deltas) + 1]:
+            ids = (ids - delta.lost) | delta.gained
+        return ids
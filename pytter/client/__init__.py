@@ -1 +1,2 @@
-from .client import *
\ No newline at end of file
+from .client import *
+from .async_client import *
\ No newline at end of file
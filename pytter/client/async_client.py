@@ -0,0 +1,539 @@
+import asyncio
+from typing import Callable, Dict, List
+
+from ..api import AsyncAPISession, Credentials, CredentialPool, RetryPolicy, MediaCache, AdaptiveChunkSizer, ResponseCache, NegativeCache, RATE_LIMIT_RAISE
+from ..api import SnapshotStore, SnapshotDiff, SNAPSHOT_FOLLOWERS, SNAPSHOT_FRIENDS
+from ..api import ObjectStore, NoneResponseException, ParameterNoneException, PROJECTION_RAW
+from ..api import AsyncBatchLoader
+from ..objects import Tweet, Place, User
+from ..utils import IdSet
+
+
+class AsyncClient:
+    """
+    asyncio based counterpart of `Client` which wraps
+    around AsyncAPISession. All API methods are coroutines
+    with the same parameters and results as in `Client`.
+
+    The client must be started before usage, either by
+    awaiting `start()` or by using it as async context manager:
+
+        async with AsyncClient(creds) as client:
+            user = await client.user(screen_name='zekroTJA')
+
+    **Parameters**
+
+    - `credentials : [Credentials, CredentialPool]`  
+      Twitter APP or user credentials object or a
+      pool of multiple credentials.
+
+    - `rate_limit_mode : str`  
+      Behaviour on exhausted rate limit windows, see
+      `APISession`.  
+      *Default: `'raise'`*
+
+    - `max_concurrency : int`  
+      Maximum number of requests in flight at once.  
+      *Default: `100`*
+
+    - `retry_policy : RetryPolicy`  
+      Policy for retrying rate limited and transiently
+      failing requests, see `APISession`.  
+      *Default: `None`*
+
+    - `json_decoder : Callable[[bytes], object]`  
+      Function decoding the raw response bodies,
+      see `APISession`.  
+      *Default: `None`*
+
+    - `projection : [str, List[str]]`  
+      `PROJECTION_RAW` or a list of fields to get raw or
+      projected dicts instead of `User` and `Tweet` objects
+      from `statuses`, `users`, `followers` and `following`,
+      see `APISession`.  
+      *Default: `None`*
+
+    - `media_cache : MediaCache`  
+      Cache of uploaded media by file content, so
+      attaching the same file again skips the upload,
+      see `APISession`.  
+      *Default: `None`*
+
+    - `chunk_sizer : AdaptiveChunkSizer`  
+      Adapts the size of upload segments to the
+      measured throughput, see `APISession`.  
+      *Default: `None`*
+
+    - `response_cache : ResponseCache`  
+      Cache of responses of read endpoints, so the same
+      users and tweets are not requested again within
+      their TTL, see `APISession`.  
+      *Default: `None`*
+
+    - `negative_cache : NegativeCache`  
+      Cache of IDs of deleted and inaccessible tweets,
+      which are not requested again within its TTL,
+      see `APISession`.  
+      *Default: `None`*
+
+    - `coalesce_requests : bool`  
+      Whether concurrent identical GET requests share
+      one request, see `APISession`.  
+      *Default: `False`*
+
+    - `object_store : ObjectStore`  
+      Persistent store of users and tweets, see
+      `Client`. It is accessed in the default
+      executor of the event loop.  
+      *Default: `None`*
+
+    - `batching : bool`  
+      Whether single lookups via `user` and `status` of
+      concurrent tasks are requested at once, see
+      `Client`.  
+      *Default: `False`*
+    """
+
+    BATCH_WINDOW = 0.005
+
+    #################
+    # GENERAL FUNCS #
+    #################
+
+    def __init__(self, credentials: [Credentials, CredentialPool],
+        rate_limit_mode: str = RATE_LIMIT_RAISE,
+        max_concurrency: int = 100,
+        retry_policy: RetryPolicy = None,
+        json_decoder: Callable[[bytes], object] = None,
+        projection: [str, List[str]] = None,
+        media_cache: MediaCache = None,
+        chunk_sizer: AdaptiveChunkSizer = None,
+        response_cache: ResponseCache = None,
+        negative_cache: NegativeCache = None,
+        coalesce_requests: bool = False,
+        object_store: ObjectStore = None,
+        batching: bool = False):
+        self._object_store = object_store
+        self._batching = batching
+        self._loaders = {}
+        self._session = AsyncAPISession(credentials,
+            rate_limit_mode=rate_limit_mode,
+            max_concurrency=max_concurrency,
+            retry_policy=retry_policy,
+            json_decoder=json_decoder,
+            projection=projection,
+            media_cache=media_cache,
+            chunk_sizer=chunk_sizer,
+            response_cache=response_cache,
+            negative_cache=negative_cache,
+            coalesce_requests=coalesce_requests)
+
+    def session(self) -> AsyncAPISession:
+        """
+        Returns the clients AsyncAPISession
+        instance.
+
+        **Returns**
+
+        - `AsyncAPISession`  
+          Initialized AsyncAPISession instance.
+        """
+
+        return self._session
+
+    def object_store(self) -> ObjectStore:
+        """
+        Returns the clients ObjectStore instance
+        or `None`, if not set.
+        """
+
+        return self._object_store
+
+    async def _in_store(self, fn: Callable, *args):
+        """
+        Runs the object store operation `fn` in the
+        default executor, so the event loop is not
+        blocked by the database.
+        """
+
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    def _loader(self, kind: str, **kwargs) -> AsyncBatchLoader:
+        """
+        Async version of `Client._loader`.
+        """
+
+        key = (kind,) + tuple(sorted(kwargs.items()))
+        loader = self._loaders.get(key)
+        if loader is not None:
+            return loader
+
+        if kind == 'statuses':
+            async def load(ids):
+                return await self.statuses(ids, **kwargs)
+        elif kind == 'ids':
+            async def load(ids):
+                return await self.users(ids=ids, **kwargs)
+        else:
+            async def load(names):
+                users = await self.users(screen_names=names, **kwargs)
+                return {k.lower(): u for k, u in users.items() if k}
+
+        loader = self._loaders[key] = AsyncBatchLoader(load,
+            window=self.BATCH_WINDOW, max_batch=AsyncAPISession.LOOKUP_BATCH_SIZE)
+        return loader
+
+    async def _forget_status(self, tweet_id: [str, int]):
+        """
+        Async version of `Client._forget_status`.
+        """
+
+        if self._object_store is not None:
+            await self._in_store(self._object_store.delete_tweets, [tweet_id])
+
+    async def _users_through_store(self, ids: List[str], screen_names: List[str], **kwargs) -> Dict[str, User]:
+        """
+        Async version of `Client._users_through_store`.
+        """
+
+        if not ids and not screen_names:
+            raise ParameterNoneException()
+
+        ids = list(dict.fromkeys(str(id) for id in ids or []))
+        screen_names = list(dict.fromkeys(screen_names or []))
+        raw = await self._in_store(self._object_store.get_users, ids, screen_names)
+
+        found_names = {k.lower() for k in raw if k}
+        missing_ids = [id for id in ids if id not in raw]
+        missing_names = [n for n in screen_names if n.lower() not in found_names]
+        if missing_ids or missing_names:
+            fetched = await self._session.users_lookup_bulk(
+                ids=missing_ids, screen_names=missing_names, projection=PROJECTION_RAW, **kwargs)
+            await self._in_store(self._object_store.put_users,
+                list({id(u): u for u in fetched.values()}.values()))
+            raw.update(fetched)
+
+        project = self._session._projector(None, lambda r: User(r, self._session))
+        if not project:
+            return raw
+        objects = {id(u): project(u) for u in raw.values()}
+        return {k: objects[id(u)] for k, u in raw.items()}
+
+    async def start(self):
+        """
+        Starts the underlying AsyncAPISession.
+        """
+
+        await self._session.start()
+
+    async def close(self):
+        """
+        Closes the underlying AsyncAPISession.
+        """
+
+        await self._session.close()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    ############
+    # STATUSES #
+    ############
+
+    async def status_update(self,
+        text: str,
+        media: list = [],
+        possibly_sensitive: bool = False,
+        lat: float = None,
+        long: float = None,
+        place: [Place, int, str] = None,
+        display_coordinates: bool = False) -> Tweet:
+        """
+        Async version of `Client.status_update`.
+        """
+
+        return await self._session.statuses_update(
+            status=text,
+            media=media,
+            possibly_sensitive=possibly_sensitive,
+            lat=lat,
+            long=long,
+            place=((place.id if type(place) == Place else place) if place else None),
+            display_coordinates=display_coordinates)
+
+    async def status_delete(self, tweet_id: [str, int]) -> Tweet:
+        """
+        Async version of `Client.status_delete`.
+        """
+
+        try:
+            return await self._session.statuses_destroy(tweet_id)
+        finally:
+            await self._forget_status(tweet_id)
+
+    async def status_retweet(self, tweet_id: [str, int]) -> Tweet:
+        """
+        Async version of `Client.status_retweet`.
+        """
+
+        try:
+            return await self._session.statuses_retweet(id=tweet_id)
+        finally:
+            await self._forget_status(tweet_id)
+
+    async def status_unretweet(self, tweet_id: [str, int]) -> Tweet:
+        """
+        Async version of `Client.status_unretweet`.
+        """
+
+        try:
+            return await self._session.statuses_unretweet(id=tweet_id)
+        finally:
+            await self._forget_status(tweet_id)
+
+    async def status(self, tweet_id: [str, int],
+        include_entities: bool = True,
+        include_ext_alt_text: bool = True) -> Tweet:
+        """
+        Async version of `Client.status`.
+        """
+
+        if self._batching:
+            tweet = await self._loader('statuses',
+                include_entities=include_entities,
+                include_ext_alt_text=include_ext_alt_text).load(str(tweet_id))
+            if tweet is None:
+                raise NoneResponseException()
+            return tweet
+
+        return await self._session.statuses_show(id=tweet_id,
+            include_entities=include_entities,
+            include_ext_alt_text=include_ext_alt_text)
+
+    async def statuses(self, tweet_ids: list,
+        include_entities: bool = True,
+        include_ext_alt_text: bool = True,
+        raise_on_none = False) -> Dict[str, Tweet]:
+        """
+        Async version of `Client.statuses`.
+        """
+
+        if self._object_store is None or not (include_entities and include_ext_alt_text):
+            return await self._session.statuses_lookup_bulk(
+                ids=tweet_ids,
+                raise_on_none=raise_on_none,
+                include_entities=include_entities,
+                include_ext_alt_text=include_ext_alt_text)
+
+        tweet_ids = list(dict.fromkeys(str(id) for id in tweet_ids))
+        raw = await self._in_store(self._object_store.get_tweets, tweet_ids)
+        missing = [id for id in tweet_ids if id not in raw]
+        if missing:
+            fetched = await self._session.statuses_lookup_bulk(
+                ids=missing,
+                raise_on_none=raise_on_none,
+                projection=PROJECTION_RAW,
+                include_entities=include_entities,
+                include_ext_alt_text=include_ext_alt_text)
+            await self._in_store(self._object_store.put_tweets, [t for t in fetched.values() if t])
+            raw.update(fetched)
+
+        project = self._session._projector(None, lambda r: Tweet(r, self._session))
+        return {id: (project(raw[id]) if project else raw[id]) if raw.get(id) else None
+            for id in tweet_ids}
+
+    async def status_retweets(self, tweet_id: [str, int], count: int = None) -> List[Tweet]:
+        """
+        Async version of `Client.status_retweets`.
+        """
+
+        return await self._session.statuses_retweets(id=tweet_id, count=count)
+
+    async def favorite(self, tweet_id: [str, int], include_entities: bool = True) -> Tweet:
+        """
+        Async version of `Client.favorite`.
+        """
+
+        try:
+            return await self._session.favorites_create(
+                id=tweet_id,
+                include_entities=include_entities)
+        finally:
+            await self._forget_status(tweet_id)
+
+    async def unfavorite(self, tweet_id: [str, int], include_entities: bool = True) -> Tweet:
+        """
+        Async version of `Client.unfavorite`.
+        """
+
+        try:
+            return await self._session.favorites_destroy(
+                id=tweet_id,
+                include_entities=include_entities)
+        finally:
+            await self._forget_status(tweet_id)
+
+    #########
+    # USERS #
+    #########
+
+    async def me(self, include_entities: bool = True, skip_status: bool = True) -> User:
+        """
+        Async version of `Client.me`.
+        """
+
+        return await self._session.verify_credentials(
+            include_entities=include_entities,
+            skip_status=skip_status)
+
+    async def user(self,
+        id: [str, int] = None,
+        screen_name: str = None,
+        include_entities: bool = True) -> User:
+        """
+        Async version of `Client.user`.
+        """
+
+        if self._batching:
+            if id:
+                user = await self._loader('ids', include_entities=include_entities).load(str(id))
+            elif screen_name:
+                user = await self._loader('screen_names',
+                    include_entities=include_entities).load(screen_name.lower())
+            else:
+                raise ParameterNoneException()
+            if user is None:
+                raise NoneResponseException()
+            return user
+
+        if self._object_store is None or not include_entities:
+            return await self._session.users_show(
+                id=id,
+                screen_name=screen_name,
+                include_entities=include_entities)
+
+        users = await self._users_through_store(
+            [id] if id else [],
+            [screen_name] if screen_name else [],
+            include_entities=include_entities)
+        if id:
+            user = users.get(str(id))
+        else:
+            user = next((u for k, u in users.items() if k and k.lower() == screen_name.lower()), None)
+        if user is None:
+            raise NoneResponseException()
+        return user
+
+    async def users(self,
+        ids: List[str] = None,
+        screen_names: List[str] = None,
+        include_entities: bool = True) -> Dict[str, User]:
+        """
+        Async version of `Client.users`.
+        """
+
+        if self._object_store is None or not include_entities:
+            return await self._session.users_lookup_bulk(
+                ids=ids,
+                screen_names=screen_names,
+                include_entities=include_entities)
+
+        return await self._users_through_store(ids, screen_names, include_entities=include_entities)
+
+    async def followers_ids(self, id: [str, int] = None, screen_name: str = None) -> List[str]:
+        """
+        Async version of `Client.followers_ids`.
+        """
+
+        return await self._session.followers_ids(id=id, screen_name=screen_name)
+
+    async def followers_id_set(self, id: [str, int] = None, screen_name: str = None) -> IdSet:
+        """
+        Async version of `Client.followers_id_set`.
+        """
+
+        return await self._session.followers_id_set(id=id, screen_name=screen_name)
+
+    async def followers(self,
+        id: [str, int] = None,
+        screen_name: str = None,
+        skip_status: bool = True,
+        include_user_entities: bool = True) -> List[User]:
+        """
+        Async version of `Client.followers`.
+        """
+
+        return await self._session.followers_list(id=id, screen_name=screen_name,
+            skip_status=skip_status, include_user_entities=include_user_entities)
+
+    async def following_ids(self, id: [str, int] = None, screen_name: str = None) -> List[str]:
+        """
+        Async version of `Client.following_ids`.
+        """
+
+        return await self._session.friends_ids(id=id, screen_name=screen_name)
+
+    async def following_id_set(self, id: [str, int] = None, screen_name: str = None) -> IdSet:
+        """
+        Async version of `Client.following_id_set`.
+        """
+
+        return await self._session.friends_id_set(id=id, screen_name=screen_name)
+
+    async def followers_snapshot(self, store: SnapshotStore,
+        id: [str, int] = None,
+        screen_name: str = None) -> SnapshotDiff:
+        """
+        Async version of `Client.followers_snapshot`.
+        The snapshot is compared and saved in the
+        default executor.
+        """
+
+        ids = await self._session.followers_id_set(id=id, screen_name=screen_name)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, store.save, id or screen_name, ids, SNAPSHOT_FOLLOWERS)
+
+    async def following_snapshot(self, store: SnapshotStore,
+        id: [str, int] = None,
+        screen_name: str = None) -> SnapshotDiff:
+        """
+        Async version of `Client.following_snapshot`.
+        """
+
+        ids = await self._session.friends_id_set(id=id, screen_name=screen_name)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, store.save, id or screen_name, ids, SNAPSHOT_FRIENDS)
+
+    async def following(self,
+        id: [str, int] = None,
+        screen_name: str = None,
+        skip_status: bool = True,
+        include_user_entities: bool = True) -> List[User]:
+        """
+        Async version of `Client.following`.
+        """
+
+        return await self._session.friends_list(id=id, screen_name=screen_name,
+            skip_status=skip_status, include_user_entities=include_user_entities)
+
+    ###########
+    # ALIASES #
+    ###########
+
+    async def tweet(self, **kwargs) -> Tweet:
+        """
+        Alias for AsyncClient#status.
+        """
+
+        return await self.status(**kwargs)
+
+    async def tweets(self, **kwargs) -> Dict[str, Tweet]:
+        """
+        Alias for AsyncClient#statuses.
+        """
+
+        return await self.statuses(**kwargs)
@@ -1,10 +1,15 @@
+import threading
 from typing import NamedTuple
 from requests_oauthlib import OAuth1
-from typing import Dict, List
+from typing import Callable, Dict, List
 
 from ..utils import utils
-from ..api import APISession, Credentials
+from ..api import APISession, Credentials, CredentialPool, Cursor, RetryPolicy, MediaCache, AdaptiveChunkSizer, ResponseCache, NegativeCache, RATE_LIMIT_RAISE
+from ..api import SnapshotStore, SnapshotDiff, SNAPSHOT_FOLLOWERS, SNAPSHOT_FRIENDS
+from ..api import ObjectStore, NoneResponseException, ParameterNoneException, PROJECTION_RAW
+from ..api import BatchLoader
 from ..objects import Tweet, Place, User
+from ..utils import IdSet
 
 
 class Client:
@@ -14,16 +19,111 @@ class Client:
 
     **Parameters**
 
-    - `credentials : Credentials`  
-      Twitter APP or user credentials object.
+    - `credentials : [Credentials, CredentialPool]`  
+      Twitter APP or user credentials object or a
+      pool of multiple credentials.
+
+    - `rate_limit_mode : str`  
+      Behaviour on exhausted rate limit windows, see
+      `APISession`.  
+      *Default: `'raise'`*
+
+    - `retry_policy : RetryPolicy`  
+      Policy for retrying rate limited and transiently
+      failing requests, see `APISession`.  
+      *Default: `None`*
+
+    - `json_decoder : Callable[[bytes], object]`  
+      Function decoding the raw response bodies,
+      see `APISession`.  
+      *Default: `None`*
+
+    - `projection : [str, List[str]]`  
+      `PROJECTION_RAW` or a list of fields to get raw or
+      projected dicts instead of `User` and `Tweet` objects
+      from `statuses`, `users`, `followers` and `following`,
+      see `APISession`.  
+      *Default: `None`*
+
+    - `media_cache : MediaCache`  
+      Cache of uploaded media by file content, so
+      attaching the same file again skips the upload,
+      see `APISession`.  
+      *Default: `None`*
+
+    - `chunk_sizer : AdaptiveChunkSizer`  
+      Adapts the size of upload segments to the
+      measured throughput, see `APISession`.  
+      *Default: `None`*
+
+    - `response_cache : ResponseCache`  
+      Cache of responses of read endpoints, so the same
+      users and tweets are not requested again within
+      their TTL, see `APISession`.  
+      *Default: `None`*
+
+    - `negative_cache : NegativeCache`  
+      Cache of IDs of deleted and inaccessible tweets,
+      which are not requested again within its TTL,
+      see `APISession`.  
+      *Default: `None`*
+
+    - `coalesce_requests : bool`  
+      Whether concurrent identical GET requests share
+      one request, see `APISession`.  
+      *Default: `False`*
+
+    - `object_store : ObjectStore`  
+      Persistent store of users and tweets, which
+      `user`, `users` and `statuses` read from first.
+      Only missing and stale objects are requested.
+      Lookups with other than the default entity
+      options bypass the store.  
+      *Default: `None`*
+
+    - `batching : bool`  
+      Whether single lookups via `user` and `status` of
+      concurrent threads are collected for `BATCH_WINDOW`
+      seconds, or up to 100 IDs, and requested at once
+      via `users` and `statuses`. Results then follow the
+      projection of the client like the bulk lookups, and
+      a missing user or tweet raises a
+      `NoneResponseException`.  
+      *Default: `False`*
     """
 
+    BATCH_WINDOW = 0.005
+
     #################
     # GENERAL FUNCS #
     #################
 
-    def __init__(self, credentials: Credentials):
-        self._session = APISession(credentials)
+    def __init__(self, credentials: [Credentials, CredentialPool],
+        rate_limit_mode: str = RATE_LIMIT_RAISE,
+        retry_policy: RetryPolicy = None,
+        json_decoder: Callable[[bytes], object] = None,
+        projection: [str, List[str]] = None,
+        media_cache: MediaCache = None,
+        chunk_sizer: AdaptiveChunkSizer = None,
+        response_cache: ResponseCache = None,
+        negative_cache: NegativeCache = None,
+        coalesce_requests: bool = False,
+        object_store: ObjectStore = None,
+        batching: bool = False):
+        self._object_store = object_store
+        self._batching = batching
+        self._loaders = {}
+        self._loaders_lock = threading.Lock()
+        self._session = APISession(credentials,
+            rate_limit_mode=rate_limit_mode,
+            retry_policy=retry_policy,
+            json_decoder=json_decoder,
+            projection=projection,
+            media_cache=media_cache,
+            chunk_sizer=chunk_sizer,
+            response_cache=response_cache,
+            negative_cache=negative_cache,
+            coalesce_requests=coalesce_requests)
 
     def session(self) -> APISession:
         """
@@ -38,6 +138,83 @@ class Client:
         
         return self._session
 
+    def object_store(self) -> ObjectStore:
+        """
+        Returns the clients ObjectStore instance
+        or `None`, if not set.
+
+        **Returns**
+
+        - `ObjectStore`  
+          The object store of the client.
+        """
+
+        return self._object_store
+
+    def _loader(self, kind: str, **kwargs) -> BatchLoader:
+        """
+        Returns the batch loader of users by `'ids'` or
+        `'screen_names'` or of `'statuses'` for the passed
+        request parameters.
+        """
+
+        key = (kind,) + tuple(sorted(kwargs.items()))
+        with self._loaders_lock:
+            loader = self._loaders.get(key)
+            if loader is not None:
+                return loader
+
+            if kind == 'statuses':
+                load = lambda ids: self.statuses(ids, **kwargs)
+            elif kind == 'ids':
+                load = lambda ids: self.users(ids=ids, **kwargs)
+            else:
+                load = lambda names: {k.lower(): u
+                    for k, u in self.users(screen_names=names, **kwargs).items() if k}
+
+            loader = self._loaders[key] = BatchLoader(load,
+                window=self.BATCH_WINDOW, max_batch=APISession.LOOKUP_BATCH_SIZE)
+            return loader
+
+    def _forget_status(self, tweet_id: [str, int]):
+        """
+        Removes a written Tweet from the object store,
+        so it is requested again on the next read. This
+        is called after the write, so a read racing with
+        it can not store the Tweet as before the write.
+        """
+
+        if self._object_store is not None:
+            self._object_store.delete_tweets([tweet_id])
+
+    def _users_through_store(self, ids: List[str], screen_names: List[str], **kwargs) -> Dict[str, User]:
+        """
+        Reads the users from the object store and requests
+        the missing and stale ones, which are then stored.
+        """
+
+        if not ids and not screen_names:
+            raise ParameterNoneException()
+
+        ids = list(dict.fromkeys(str(id) for id in ids or []))
+        screen_names = list(dict.fromkeys(screen_names or []))
+        raw = self._object_store.get_users(ids, screen_names)
+
+        found_names = {k.lower() for k in raw if k}
+        missing_ids = [id for id in ids if id not in raw]
+        missing_names = [n for n in screen_names if n.lower() not in found_names]
+        if missing_ids or missing_names:
+            fetched = self._session.users_lookup_bulk(
+                ids=missing_ids, screen_names=missing_names, projection=PROJECTION_RAW, **kwargs)
+            self._object_store.put_users({id(u): u for u in fetched.values()}.values())
+            raw.update(fetched)
+
+        project = self._session._projector(None, lambda r: User(r, self._session))
+        if not project:
+            return raw
+        objects = {id(u): project(u) for u in raw.values()}
+        return {k: objects[id(u)] for k, u in raw.items()}
+
     ############
     # STATUSES #
     ############
@@ -124,7 +301,10 @@ class Client:
           The tweet object of the deleted tweet.
         """
         
-        return self._session.statuses_destroy(tweet_id)
+        try:
+            return self._session.statuses_destroy(tweet_id)
+        finally:
+            self._forget_status(tweet_id)
 
     def status_retweet(self, tweet_id: [str, int]) -> Tweet:
         """
@@ -142,7 +322,10 @@ class Client:
           retweet information.
         """
 
-        return self._session.statuses_retweet(id=tweet_id)
+        try:
+            return self._session.statuses_retweet(id=tweet_id)
+        finally:
+            self._forget_status(tweet_id)
 
     def status_unretweet(self, tweet_id: [str, int]) -> Tweet:
         """
@@ -159,7 +342,10 @@ class Client:
           The Tweet object of the revoked retweet.
         """
 
-        return self._session.statuses_unretweet(id=tweet_id)
+        try:
+            return self._session.statuses_unretweet(id=tweet_id)
+        finally:
+            self._forget_status(tweet_id)
 
     def status(self, tweet_id: [str, int],
         include_entities: bool = True,
@@ -187,6 +373,14 @@ class Client:
           Resulting Tweet or `None`.
         """
 
+        if self._batching:
+            tweet = self._loader('statuses',
+                include_entities=include_entities,
+                include_ext_alt_text=include_ext_alt_text).load(str(tweet_id))
+            if tweet is None:
+                raise NoneResponseException()
+            return tweet
+
         return self._session.statuses_show(id=tweet_id,
             include_entities=include_entities,
             include_ext_alt_text=include_ext_alt_text)
@@ -196,10 +390,11 @@ class Client:
         include_ext_alt_text: bool = True,
         raise_on_none = False) -> Dict[str, Tweet]:
         """
-        Gets up to 100 tweets by their IDs.The result will be
-        a dictionary with keys representing the originally
+        Gets tweets by their IDs. The result will be a
+        dictionary with keys representing the originally
         requested Tweet ID paired with the fetched Tweet
         object, if found. Else, the value will be `None`.
+        More than 100 IDs are fetched in concurrent batches.
 
         **Parameters**
         
@@ -226,11 +421,29 @@ class Client:
           result Tweet object, which can be `None`.
         """
 
-        return self._session.statuses_lookup(
-            ids=tweet_ids,
-            raise_on_none=raise_on_none,
-            include_entities=include_entities,
-            include_ext_alt_text=include_ext_alt_text)
+        if self._object_store is None or not (include_entities and include_ext_alt_text):
+            return self._session.statuses_lookup_bulk(
+                ids=tweet_ids,
+                raise_on_none=raise_on_none,
+                include_entities=include_entities,
+                include_ext_alt_text=include_ext_alt_text)
+
+        tweet_ids = list(dict.fromkeys(str(id) for id in tweet_ids))
+        raw = self._object_store.get_tweets(tweet_ids)
+        missing = [id for id in tweet_ids if id not in raw]
+        if missing:
+            fetched = self._session.statuses_lookup_bulk(
+                ids=missing,
+                raise_on_none=raise_on_none,
+                projection=PROJECTION_RAW,
+                include_entities=include_entities,
+                include_ext_alt_text=include_ext_alt_text)
+            self._object_store.put_tweets(t for t in fetched.values() if t)
+            raw.update(fetched)
+
+        project = self._session._projector(None, lambda r: Tweet(r, self._session))
+        return {id: (project(raw[id]) if project else raw[id]) if raw.get(id) else None
+            for id in tweet_ids}
 
     def status_retweets(self, tweet_id: [str, int], count: int = None) -> List[Tweet]:
         """
@@ -277,9 +490,12 @@ class Client:
           The favorized/liked Tweets object.
         """
 
-        return self._session.favorites_create(
-            id=tweet_id, 
-            include_entities=include_entities)
+        try:
+            return self._session.favorites_create(
+                id=tweet_id, 
+                include_entities=include_entities)
+        finally:
+            self._forget_status(tweet_id)
 
     def unfavorite(self, tweet_id: [str, int], include_entities: bool = True) -> Tweet:
         """
@@ -301,9 +517,12 @@ class Client:
           The un- favorized/liked Tweets object.
         """
 
-        return self._session.favorites_destroy(
-            id=tweet_id, 
-            include_entities=include_entities)
+        try:
+            return self._session.favorites_destroy(
+                id=tweet_id, 
+                include_entities=include_entities)
+        finally:
+            self._forget_status(tweet_id)
 
     #########
     # USERS #
@@ -363,22 +582,46 @@ class Client:
           Resulting User object.
         """
 
-        return self._session.users_show(
-            id=id, 
-            screen_name=screen_name,
+        if self._batching:
+            if id:
+                user = self._loader('ids', include_entities=include_entities).load(str(id))
+            elif screen_name:
+                user = self._loader('screen_names',
+                    include_entities=include_entities).load(screen_name.lower())
+            else:
+                raise ParameterNoneException()
+            if user is None:
+                raise NoneResponseException()
+            return user
+
+        if self._object_store is None or not include_entities:
+            return self._session.users_show(
+                id=id, 
+                screen_name=screen_name,
+                include_entities=include_entities)
+
+        users = self._users_through_store(
+            [id] if id else [], 
+            [screen_name] if screen_name else [],
             include_entities=include_entities)
+        if id:
+            user = users.get(str(id))
+        else:
+            user = next((u for k, u in users.items() if k and k.lower() == screen_name.lower()), None)
+        if user is None:
+            raise NoneResponseException()
+        return user
 
     def users(self, 
         ids: List[str] = None, 
         screen_names: List[str] = None,
         include_entities: bool = True) -> Dict[str, User]:
         """
-        Get a list of up to 100 users specified by their
-        IDs OR screen names (Twitter handles). Neither
-        the list of IDs as same as the list of screen
-        names must not be empty.
-        IDs and screen names can no be mixed. Screen names
-        value list will be prefered.
+        Get a list of users specified by their IDs and/or
+        screen names (Twitter handles). Neither the list
+        of IDs as same as the list of screen names must
+        not be empty. More than 100 users are fetched in
+        concurrent batches.
 
         **Parameters**
 
@@ -407,10 +650,13 @@ class Client:
           key.
         """
 
-        return self._session.users_lookup(
-            ids=ids,
-            screen_names=screen_names,
-            include_entities=include_entities)
+        if self._object_store is None or not include_entities:
+            return self._session.users_lookup_bulk(
+                ids=ids,
+                screen_names=screen_names,
+                include_entities=include_entities)
+
+        return self._users_through_store(ids, screen_names, include_entities=include_entities)
 
     def followers_ids(self, id: [str, int] = None, screen_name: str = None) -> List[str]:
         """
@@ -436,6 +682,32 @@ class Client:
 
         return self._session.followers_ids(id=id, screen_name=screen_name)
 
+    def followers_id_set(self, id: [str, int] = None, screen_name: str = None) -> IdSet:
+        """
+        Returns the numeric user IDs of all followers of
+        the user as compact, sorted `IdSet`, which needs
+        far less memory than `followers_ids` for large
+        accounts and supports fast set operations.
+
+        **Parameters**
+
+        - `id: [str, int]`  
+          ID of the user to get followers from.  
+          *Default: `None`*
+
+        - `screen_name: str`  
+          Screen name (handle) of the user to get 
+          followers from.  
+          *Default: `None`*
+
+        **Returns**
+
+        - `IdSet`  
+          Set of IDs of all followers of the desired user.
+        """
+
+        return self._session.followers_id_set(id=id, screen_name=screen_name)
+
     def followers(self, 
         id: [str, int] = None, 
         screen_name: str = None,
@@ -502,6 +774,58 @@ class Client:
 
         return self._session.friends_ids(id=id, screen_name=screen_name)
 
+    def following_id_set(self, id: [str, int] = None, screen_name: str = None) -> IdSet:
+        """
+        Returns the numeric user IDs of all friends of
+        the user as compact, sorted `IdSet`. See
+        `Client.followers_id_set`.
+        """
+
+        return self._session.friends_id_set(id=id, screen_name=screen_name)
+
+    def followers_snapshot(self, store: SnapshotStore,
+        id: [str, int] = None,
+        screen_name: str = None) -> SnapshotDiff:
+        """
+        Crawls the follower IDs of the user, saves them
+        as the latest snapshot of the user in `store` and
+        returns the followers gained and lost since the
+        previous snapshot.
+
+        **Parameters**
+
+        - `store: SnapshotStore`  
+          Store the snapshot is saved in.
+
+        - `id: [str, int]`  
+          ID of the user.  
+          *Default: `None`*
+
+        - `screen_name: str`  
+          Screen name (handle) of the user. The
+          snapshot is stored under the ID, if passed.  
+          *Default: `None`*
+
+        **Returns**
+
+        - `SnapshotDiff`  
+          Gained and lost followers.
+        """
+
+        ids = self._session.followers_id_set(id=id, screen_name=screen_name)
+        return store.save(id or screen_name, ids, SNAPSHOT_FOLLOWERS)
+
+    def following_snapshot(self, store: SnapshotStore,
+        id: [str, int] = None,
+        screen_name: str = None) -> SnapshotDiff:
+        """
+        Crawls the friend IDs of the user and saves them
+        in `store`. See `Client.followers_snapshot`.
+        """
+
+        ids = self._session.friends_id_set(id=id, screen_name=screen_name)
+        return store.save(id or screen_name, ids, SNAPSHOT_FRIENDS)
+
     def following(self, 
         id: [str, int] = None, 
         screen_name: str = None,
@@ -543,6 +867,81 @@ class Client:
         return self._session.friends_list(id=id, screen_name=screen_name,
             skip_status=skip_status, include_user_entities=include_user_entities)
 
+    def followers_ids_iter(self,
+        id: [str, int] = None,
+        screen_name: str = None,
+        cursor: int = -1) -> Cursor:
+        """
+        Returns a lazy Cursor over the user IDs (as strings)
+        of all followers of the user, which requests the
+        pages while iterating. The cursors `next_cursor`
+        can be stored to resume the crawl later on.
+
+        **Parameters**
+
+        - `id: [str, int]`  
+          ID of the user to get followers list from.  
+          *Default: `None`*
+
+        - `screen_name: str`  
+          Screen name (handle) of the user to get 
+          followers list from.  
+          *Default: `None`*
+
+        - `cursor: int`  
+          Cursor to start or resume from.  
+          *Default: `-1`*
+
+        **Returns**
+
+        - `Cursor`  
+          Iterator of IDs of all followers of the desired user.
+        """
+
+        return self._session.followers_ids_iter(id=id, screen_name=screen_name, cursor=cursor)
+
+    def followers_iter(self,
+        id: [str, int] = None,
+        screen_name: str = None,
+        cursor: int = -1,
+        skip_status: bool = True,
+        include_user_entities: bool = True) -> Cursor:
+        """
+        Returns a lazy Cursor over the User objects of the
+        users following the target user. See
+        `Client.followers_ids_iter` and `Client.followers`.
+        """
+
+        return self._session.followers_list_iter(id=id, screen_name=screen_name, cursor=cursor,
+            skip_status=skip_status, include_user_entities=include_user_entities)
+
+    def following_ids_iter(self,
+        id: [str, int] = None,
+        screen_name: str = None,
+        cursor: int = -1) -> Cursor:
+        """
+        Returns a lazy Cursor over the user IDs (as strings)
+        of all friends of the user. See
+        `Client.followers_ids_iter` and `Client.following_ids`.
+        """
+
+        return self._session.friends_ids_iter(id=id, screen_name=screen_name, cursor=cursor)
+
+    def following_iter(self,
+        id: [str, int] = None,
+        screen_name: str = None,
+        cursor: int = -1,
+        skip_status: bool = True,
+        include_user_entities: bool = True) -> Cursor:
+        """
+        Returns a lazy Cursor over the User objects of the
+        users the target user is following. See
+        `Client.followers_ids_iter` and `Client.following`.
+        """
+
+        return self._session.friends_list_iter(id=id, screen_name=screen_name, cursor=cursor,
+            skip_status=skip_status, include_user_entities=include_user_entities)
+
     ###########
     # ALIASES #
     ###########
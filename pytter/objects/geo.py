@@ -4,6 +4,8 @@ class Coordinates:
     Geo location coordinates.
     Reference: https://developer.twitter.com/en/docs/tweets/data-dictionary/overview/geo-objects#coordinates
     """
+
+    __slots__ = ('coordinates', 'type')
     
     def __init__(self, data: dict = {}):
         if not data:
@@ -16,6 +18,8 @@ class BoundingBox:
     Describes an area by coordinates.
     Reference: https://developer.twitter.com/en/docs/tweets/data-dictionary/overview/geo-objects#bounding-box
     """
+
+    __slots__ = ('coordinates', 'type')
     
     def __init__(self, data: dict = {}):
         if not data:
@@ -30,6 +34,11 @@ class Place:
     Reference: https://developer.twitter.com/en/docs/tweets/data-dictionary/overview/geo-objects#place
     """
 
+    __slots__ = (
+        'id', 'url', 'place_type', 'name', 'full_name', 'country_code',
+        'country', 'bounding_box', 'attributes',
+    )
+
     def __init__(self, data: dict = {}):
         if not data:
             return None
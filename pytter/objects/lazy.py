@@ -0,0 +1,49 @@
+from typing import Callable, Tuple
+
+
+class LazyField:
+    """
+    Descriptor for object attributes which are built from
+    the raw response data on first access instead of on
+    instantiation.
+
+    The owning class must store the raw data dict in the
+    slot `_raw` and provide a slot `_<name>` where the built
+    value is cached. Assigning the attribute overwrites the
+    cached value. Once built, the keys the value was built
+    from are removed from `_raw`, so the raw data is not
+    kept alive longer than needed.
+
+    **Parameters**
+
+    - `factory : Callable[[dict], object]`  
+      Function building the attribute value from
+      the raw data dict.
+
+    - `keys : Tuple[str, ...]`  
+      Keys of the raw data dict the value is built from.  
+      *Default: `()`*
+    """
+
+    def __init__(self, factory: Callable[[dict], object], keys: Tuple[str, ...] = ()):
+        self._factory = factory
+        self._keys = keys
+        self._slot = None
+
+    def __set_name__(self, owner, name: str):
+        self._slot = '_' + name
+
+    def __get__(self, obj, owner=None) -> object:
+        if obj is None:
+            return self
+        try:
+            return getattr(obj, self._slot)
+        except AttributeError:
+            value = self._factory(obj._raw)
+            setattr(obj, self._slot, value)
+            for key in self._keys:
+                obj._raw.pop(key, None)
+            return value
+
+    def __set__(self, obj, value: object):
+        setattr(obj, self._slot, value)
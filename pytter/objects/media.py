@@ -5,6 +5,13 @@ class Media:
     Media object for videos, images or gifs attached to tweets.
     Reference: https://developer.twitter.com/en/docs/tweets/data-dictionary/overview/entities-object#media
     """
+
+    __slots__ = (
+        'display_url', 'expanded_url', 'id', 'id_str', 'media_url',
+        'media_url_https', 'size', 'url', 'source_status_id',
+        'source_status_id_str', 'type', 'expires_after_secs',
+        'processing_info',
+    )
     
     def __init__(self, data: dict = {}):
         if not data:
@@ -20,4 +27,6 @@ class Media:
         self.expanded_url           = data.get('expanded_url')
         self.source_status_id       = data.get('source_status_id')
         self.source_status_id_str   = data.get('source_status_id_str')
-        self.type                   = data.get('type')
\ No newline at end of file
+        self.type                   = data.get('type')
+        self.expires_after_secs     = data.get('expires_after_secs')
+        self.processing_info        = data.get('processing_info')
\ No newline at end of file
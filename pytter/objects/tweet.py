@@ -1,6 +1,7 @@
 from .media import Media
 from .user import User
 from .geo import Coordinates, Place
+from .lazy import LazyField
 
 
 class NoSessionException(Exception):
@@ -15,6 +16,8 @@ class TweetEntities:
     Reference: https://developer.twitter.com/en/docs/tweets/data-dictionary/overview/tweet-object
     """
 
+    __slots__ = ('hashtags', 'media', 'user_mentions')
+
     def __init__(self, data: dict = {}, data_extended: dict = {}):
         if not data or not data_extended:
             return None
@@ -26,13 +29,49 @@ class Tweet:
     """
     Tweet object.
     Reference: https://developer.twitter.com/en/docs/tweets/data-dictionary/overview/tweet-object
+
+    The nested objects `user`, `coordinates`, `place`,
+    `quote_status`, `retweeted_status` and `entities` are
+    built from the raw tweet data on first access. Only the
+    parts of the raw data these are built from are kept.
     """
 
+    __slots__ = (
+        '_session', '_raw', 'created_at', 'id', 'id_str', 'text', 'source', 'trucated',
+        'in_reply_to_status_id', 'in_reply_to_status_id_str',
+        'in_reply_to_user_id_str', 'in_reply_to_screen_name',
+        '_user', '_coordinates', '_place',
+        'is_quote_status', 'quoted_status_id', 'quoted_status_id_str',
+        '_quote_status', '_retweeted_status',
+        'contributors', 'retweet_count', 'quote_count', 'favorite_count',
+        'possibly_sensitive', 'lang', 'urls', '_entities', 'favorited',
+    )
+
+    LAZY_KEYS = (
+        'user', 'coordinates', 'place', 'quote_status',
+        'retweeted_status', 'entities', 'extended_entities',
+    )
+
+    user                = LazyField(lambda data:
+        User(data.get('user')) if 'user' in data else None, ('user',))
+    coordinates         = LazyField(lambda data:
+        Coordinates(data.get('coordinates')) if 'coordinates' in data else None, ('coordinates',))
+    place               = LazyField(lambda data:
+        Place(data.get('place')) if 'place' in data else None, ('place',))
+    quote_status        = LazyField(lambda data:
+        Tweet(data.get('quote_status')) if 'quote_status' in data else None, ('quote_status',))
+    retweeted_status    = LazyField(lambda data:
+        Tweet(data.get('retweeted_status')) if 'retweeted_status' in data else None, ('retweeted_status',))
+    entities            = LazyField(lambda data:
+        TweetEntities(data=data.get('entities'), data_extended=data.get('extended_entities')),
+        ('entities', 'extended_entities'))
+
     def __init__(self, data: dict = {}, session = None):
         if not data:
             return None
 
         self._session = session
+        self._raw = {k: data[k] for k in self.LAZY_KEYS if k in data}
 
         self.created_at     = data.get('created_at')
         self.id             = data.get('id')
@@ -46,16 +85,9 @@ class Tweet:
         self.in_reply_to_user_id_str    = data.get('in_reply_to_user_id_str')
         self.in_reply_to_screen_name    = data.get('in_reply_to_screen_name')
 
-        self.user = User(data.get('user')) if 'user' in data else None
-
-        self.coordinates    = Coordinates(data.get('coordinates')) if 'coordinates' in data else None
-        self.place          = Place(data.get('place')) if 'place' in data else None
-
         self.is_quote_status        = data.get('contributors')
         self.quoted_status_id       = data.get('quoted_status_id')
         self.quoted_status_id_str   = data.get('quoted_status_id_str')
-        self.quote_status           = Tweet(data.get('quote_status')) if 'quote_status' in data else None
-        self.retweeted_status       = Tweet(data.get('retweeted_status')) if 'retweeted_status' in data else None
 
         self.contributors       = data.get('contributors')
         self.retweet_count      = data.get('retweet_count')
@@ -65,7 +97,6 @@ class Tweet:
         self.lang               = data.get('lang')
 
         self.urls       = data.get('urls')
-        self.entities   = TweetEntities(data=data.get('entities'), data_extended=data.get('extended_entities'))
         
         self.favorited  = data.get('favorited')
         self.favorited  = data.get('retweeted')
@@ -11,6 +11,11 @@ class UserStats:
     following count, tweet cound and listed count.
     """
 
+    __slots__ = (
+        'followers_count', 'following_count', 'tweet_count',
+        'listed_count', 'favorites_count',
+    )
+
     def __init__(self, data: dict = {}, data_stats: dict = {}):
         self.followers_count    = data.get('followers_count') or data_stats.get('followers_count')
         self.following_count    = data.get('friends_count') or data_stats.get('following_count')
@@ -24,6 +29,12 @@ class User:
     Reference: https://developer.twitter.com/en/docs/tweets/data-dictionary/overview/user-object
     """
 
+    __slots__ = (
+        '_session', 'id', 'id_str', 'name', 'screen_name', 'location',
+        'url', 'description', 'protected', 'verified', 'created_at',
+        'username', 'profile_image_url', 'profile_banner_url', 'stats',
+    )
+
     def __init__(self, data: dict = {}, session = None):
         self._session = session
 
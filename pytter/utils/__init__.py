@@ -1,2 +1,4 @@
 from .utils import *
-from .fileinfo import *
\ No newline at end of file
+from .fileinfo import *
+from .multipart import *
+from .idset import *
\ No newline at end of file
@@ -1,5 +1,7 @@
 import os
+import mmap
 import urllib
+import threading
 import mimetypes
 
 
@@ -10,9 +12,11 @@ class FileInfo:
     file_name: str = None
     full_path: str = None
     from_url: bool = False
+    mapping: mmap.mmap = None
 
-    def __init__(self, file_handler, full_media_path: str):
+    def __init__(self, file_handler, full_media_path: str, use_mmap: bool = False):
         self.handler = file_handler
+        self._lock = threading.Lock()
 
         if full_media_path.startswith('http'):
             self.from_url = True
@@ -21,28 +25,86 @@ class FileInfo:
             self.full_path = full_media_path
         self.file_name = os.path.basename(self.full_path)
 
-        file_handler.seek(0, 2)
-        self.size = file_handler.tell()
-        try:
-            file_handler.seek(0)
-        except:
-            pass
+        if use_mmap:
+            try:
+                self.mapping = mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # Empty files and handlers without file
+                # descriptor can not be mapped.
+                self.mapping = None
+
+        if self.mapping is not None:
+            self.size = len(self.mapping)
+        else:
+            file_handler.seek(0, 2)
+            self.size = file_handler.tell()
+            try:
+                file_handler.seek(0)
+            except:
+                pass
 
         self.mime_type = mimetypes.guess_type(self.file_name)[0]
 
+    def read_at(self, offset: int, size: int) -> bytes:
+        """
+        Reads up to `size` bytes starting at `offset`.
+        Safe to be called from multiple threads. If the
+        file is memory-mapped, a memoryview slice of the
+        mapping is returned instead of a copy.
+        """
+
+        if self.mapping is not None:
+            return memoryview(self.mapping)[offset:offset + size]
+
+        with self._lock:
+            self.handler.seek(offset)
+            return self.handler.read(size)
+
     def close(self):
+        if self.mapping is not None:
+            try:
+                self.mapping.close()
+            except BufferError:
+                # Chunks still referencing the mapping keep it
+                # alive until they are garbage collected.
+                pass
         self.handler.close()
 
 
+class RemoteFileInfo:
+    """
+    Describes an online file which is not downloaded
+    yet. Size and MIME type are taken from a HEAD
+    request, so the file can be checked and uploaded
+    while it is being downloaded.
+    """
+
+    handler             = None
+    mapping: mmap.mmap  = None
+    from_url: bool      = True
+
+    def __init__(self, url: str, size: int, mime_type: str = None):
+        self.url = url
+        self.size = size
+        self.full_path = urllib.parse.urlparse(url).path
+        self.file_name = os.path.basename(self.full_path)
+        self.mime_type = mimetypes.guess_type(self.file_name)[0] or mime_type
+
+    def close(self):
+        pass
+
+
 class FileChunk:
     size: int = 0
     data = []
     index: int = 0
+    offset: int = 0
 
-    def __init__(self, size: int, index: int, data):
+    def __init__(self, size: int, index: int, data, offset: int = 0):
         self.size = size
         self.index = index
         self.data = data
+        self.offset = offset
 
 
 class Megabyte:
@@ -0,0 +1,247 @@
+import heapq
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _unique(ids: Iterable[int]) -> Iterator[int]:
+    """
+    Drops repeated values of a sorted iterable.
+    """
+
+    last = None
+    for id in ids:
+        if id != last:
+            yield id
+            last = id
+
+
+def _intersect(a: array, b: array) -> Iterator[int]:
+    i, j = 0, 0
+    while i < len(a) and j < len(b):
+        if a[i] < b[j]:
+            i += 1
+        elif a[i] > b[j]:
+            j += 1
+        else:
+            yield a[i]
+            i, j = i + 1, j + 1
+
+
+def _difference(a: array, b: array) -> Iterator[int]:
+    j = 0
+    for id in a:
+        while j < len(b) and b[j] < id:
+            j += 1
+        if j >= len(b) or b[j] != id:
+            yield id
+
+
+class IdSet:
+    """
+    Compact, sorted set of numeric Twitter IDs backed
+    by an `array('Q')`, which stores each ID in 8 bytes
+    instead of as boxed int or str object.
+
+    IDs can be added page by page via `extend`. They
+    are sorted and deduplicated lazily on the first
+    read, so appending is cheap. Union, intersection
+    and difference merge the sorted arrays and are
+    vectorized with NumPy, if it is installed.
+    Without NumPy, each added page is sorted in runs
+    of up to `RUN_SIZE` IDs, which are merged on the
+    first read, so only one run at a time is boxed as
+    int objects.
+
+    Iterating the set yields the IDs as ascending ints.
+
+    **Parameters**
+
+    - `ids : Iterable`  
+      Initial IDs as ints or numeric strings.  
+      *Default: `()`*
+    """
+
+    __slots__ = ('_ids', '_sorted', '_runs')
+
+    RUN_SIZE = 1 << 16
+
+    def __init__(self, ids: Iterable = ()):
+        self._ids = array('Q')
+        self._sorted = True
+        self._runs = [0]
+        self.extend(ids)
+
+    @classmethod
+    def from_array(cls, ids: array, is_sorted: bool = False) -> 'IdSet':
+        """
+        Creates an IdSet using the passed `array('Q')`
+        as storage without copying it. If `is_sorted`
+        is passed, the array must be sorted ascending
+        and free of duplicates.
+        """
+
+        if ids.typecode != 'Q':
+            raise TypeError("ids must be an array of typecode 'Q'")
+        idset = cls()
+        idset._ids = ids
+        idset._sorted = is_sorted or len(ids) < 2
+        if not idset._sorted and numpy is None:
+            idset._sort_runs(0)
+        return idset
+
+    @classmethod
+    def frombytes(cls, data: bytes, is_sorted: bool = False) -> 'IdSet':
+        """
+        Creates an IdSet from the machine representation
+        of the IDs as returned by `tobytes`.
+        """
+
+        ids = array('Q')
+        ids.frombytes(data)
+        return cls.from_array(ids, is_sorted)
+
+    def extend(self, ids: Iterable):
+        """
+        Adds the passed IDs, given as ints, numeric
+        strings or an `array('Q')`, to the set.
+        """
+
+        n = len(self._ids)
+        if isinstance(ids, IdSet):
+            self._ids.extend(ids.ids)
+        elif isinstance(ids, array) and ids.typecode == 'Q':
+            self._ids.extend(ids)
+        else:
+            self._ids.extend(int(id) for id in ids)
+        if len(self._ids) > n:
+            self._sorted = False
+            if numpy is None:
+                self._sort_runs(n)
+
+    def add(self, id: [str, int]):
+        """
+        Adds a single ID to the set.
+        """
+
+        self.extend((id,))
+
+    @property
+    def ids(self) -> array:
+        """
+        Sorted `array('Q')` of the IDs. It must not be
+        modified, as it is the storage of the set.
+        """
+
+        self._normalize()
+        return self._ids
+
+    def tobytes(self) -> bytes:
+        """
+        Returns the sorted IDs in machine representation.
+        """
+
+        return self.ids.tobytes()
+
+    def union(self, other: 'IdSet') -> 'IdSet':
+        """
+        Returns a new IdSet of the IDs contained
+        in this or the other set.
+        """
+
+        a, b = self.ids, _as_idset(other).ids
+        if numpy is not None:
+            return _from_numpy(numpy.union1d(_as_numpy(a), _as_numpy(b)))
+        return IdSet.from_array(array('Q', _unique(heapq.merge(a, b))), True)
+
+    def intersection(self, other: 'IdSet') -> 'IdSet':
+        """
+        Returns a new IdSet of the IDs contained
+        in both this and the other set.
+        """
+
+        a, b = self.ids, _as_idset(other).ids
+        if numpy is not None:
+            return _from_numpy(numpy.intersect1d(_as_numpy(a), _as_numpy(b), assume_unique=True))
+        return IdSet.from_array(array('Q', _intersect(a, b)), True)
+
+    def difference(self, other: 'IdSet') -> 'IdSet':
+        """
+        Returns a new IdSet of the IDs contained
+        in this but not in the other set.
+        """
+
+        a, b = self.ids, _as_idset(other).ids
+        if numpy is not None:
+            return _from_numpy(numpy.setdiff1d(_as_numpy(a), _as_numpy(b), assume_unique=True))
+        return IdSet.from_array(array('Q', _difference(a, b)), True)
+
+    def _sort_runs(self, start: int):
+        """
+        Sorts the IDs from `start` on in place in runs of
+        up to `RUN_SIZE` IDs and records where runs begin
+        which do not continue the preceding IDs.
+        """
+
+        ids = self._ids
+        for i in range(start, len(ids), self.RUN_SIZE):
+            end = min(i + self.RUN_SIZE, len(ids))
+            ids[i:end] = array('Q', sorted(ids[i:end]))
+            if i > 0 and ids[i - 1] > ids[i]:
+                self._runs.append(i)
+
+    def _normalize(self):
+        if self._sorted:
+            return
+        if numpy is not None:
+            self._ids = array('Q', numpy.unique(_as_numpy(self._ids)).tobytes())
+        else:
+            # The runs are merged as views of the array,
+            # so the IDs are never boxed all at once.
+            view = memoryview(self._ids)
+            bounds = self._runs + [len(self._ids)]
+            runs = [view[a:b] for a, b in zip(bounds, bounds[1:])]
+            self._ids = array('Q', _unique(heapq.merge(*runs)))
+        self._sorted = True
+        self._runs = [0]
+
+    __or__  = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def __contains__(self, id: [str, int]) -> bool:
+        ids = self.ids
+        id = int(id)
+        i = bisect_left(ids, id)
+        return i < len(ids) and ids[i] == id
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, IdSet):
+            return NotImplemented
+        return self.ids == other.ids
+
+    def __repr__(self) -> str:
+        return 'IdSet({0} ids)'.format(len(self))
+
+
+def _as_idset(ids: Iterable) -> IdSet:
+    return ids if isinstance(ids, IdSet) else IdSet(ids)
+
+
+def _as_numpy(ids: array):
+    return numpy.frombuffer(ids, dtype=numpy.uint64) if ids else numpy.empty(0, dtype=numpy.uint64)
+
+
+def _from_numpy(ids) -> IdSet:
+    return IdSet.from_array(array('Q', ids.astype(numpy.uint64).tobytes()), True)
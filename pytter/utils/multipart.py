@@ -0,0 +1,173 @@
+import io
+import uuid
+from typing import List, Tuple
+
+from .fileinfo import FileInfo
+
+
+class FileRange(io.RawIOBase):
+    """
+    Readable, seekable view on a byte range of a file.
+    The data is read from the file on demand via
+    `FileInfo.read_at`, so multiple ranges of the same
+    file can be read concurrently.
+
+    **Parameters**
+
+    - `file_info : FileInfo`  
+      The file to read from.
+
+    - `offset : int`  
+      Start of the range in bytes.
+
+    - `size : int`  
+      Length of the range in bytes.
+    """
+
+    def __init__(self, file_info: FileInfo, offset: int, size: int):
+        super().__init__()
+        self.file_info = file_info
+        self.offset = offset
+        self.size = size
+        self._pos = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            pos += self._pos
+        elif whence == io.SEEK_END:
+            pos += self.size
+        self._pos = min(max(pos, 0), self.size)
+        return self._pos
+
+    def readinto(self, b) -> int:
+        n = min(len(b), self.size - self._pos)
+        if n <= 0:
+            return 0
+        data = self.file_info.read_at(self.offset + self._pos, n)
+        b[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+
+class MultipartEncoder(io.RawIOBase):
+    """
+    Streaming `multipart/form-data` request body.
+
+    The body is produced while it is read, so only the
+    part headers are held in memory. File parts passed
+    as `FileRange` are read from the file in blocks of
+    the size the HTTP client requests; `bytes` and
+    `memoryview` values are sent without being copied
+    into a joined body.
+
+    The encoder has a length and can be seeked back to
+    the start, so the same body can be sent again.
+
+    **Parameters**
+
+    - `fields : List[Tuple]`  
+      List of `(name, value)` or
+      `(name, value, filename, content_type)` tuples.
+      Values may be `str`, `bytes`, `memoryview` or
+      `FileRange` instances.
+    """
+
+    def __init__(self, fields: List[Tuple]):
+        super().__init__()
+        self.boundary = uuid.uuid4().hex
+        self._parts = []
+
+        boundary = '--{0}\r\n'.format(self.boundary).encode('utf8')
+        for field in fields:
+            name, value = field[0], field[1]
+            filename = field[2] if len(field) > 2 else None
+            content_type = field[3] if len(field) > 3 else None
+
+            header = 'Content-Disposition: form-data; name="{0}"'.format(name)
+            if filename is not None:
+                header += '; filename="{0}"'.format(filename)
+            header += '\r\n'
+            if content_type is not None:
+                header += 'Content-Type: {0}\r\n'.format(content_type)
+            header += '\r\n'
+
+            if isinstance(value, str):
+                value = value.encode('utf8')
+            if isinstance(value, bytes):
+                value = memoryview(value)
+
+            self._parts.append(memoryview(boundary + header.encode('utf8')))
+            self._parts.append(value)
+            self._parts.append(memoryview(b'\r\n'))
+        self._parts.append(memoryview('--{0}--\r\n'.format(self.boundary).encode('utf8')))
+
+        self._size = sum(len(p) for p in self._parts)
+        self._pos = 0
+        self._part = 0
+        self._part_pos = 0
+
+    @property
+    def content_type(self) -> str:
+        """
+        Value of the `Content-Type` header for
+        this body including the boundary.
+        """
+
+        return 'multipart/form-data; boundary={0}'.format(self.boundary)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            pos += self._pos
+        elif whence == io.SEEK_END:
+            pos += self._size
+        self._pos = min(max(pos, 0), self._size)
+
+        # Locate the part containing the new position.
+        self._part, self._part_pos = 0, self._pos
+        while self._part < len(self._parts) and self._part_pos >= len(self._parts[self._part]):
+            self._part_pos -= len(self._parts[self._part])
+            self._part += 1
+        return self._pos
+
+    def readinto(self, b) -> int:
+        n = 0
+        view = memoryview(b).cast('B')
+        while n < len(view) and self._part < len(self._parts):
+            part = self._parts[self._part]
+            if isinstance(part, FileRange):
+                part.seek(self._part_pos)
+                read = part.readinto(view[n:])
+            else:
+                read = min(len(view) - n, len(part) - self._part_pos)
+                view[n:n + read] = part[self._part_pos:self._part_pos + read]
+            n += read
+            self._part_pos += read
+            if self._part_pos >= len(part) or read == 0:
+                self._part += 1
+                self._part_pos = 0
+        self._pos += n
+        return n
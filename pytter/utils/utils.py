@@ -1,8 +1,17 @@
 import os
+import json
+import queue
 import requests
 import tempfile
+import threading
+from typing import Callable
 
-from .fileinfo import FileInfo, FileChunk, Megabyte
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .fileinfo import FileInfo, RemoteFileInfo, FileChunk, Megabyte
 
 def file_from_url(url: str):
     """
@@ -34,10 +43,131 @@ def file_from_url(url: str):
     return file
 
 
+def probe_url(url: str) -> RemoteFileInfo:
+    """
+    probe_url requests the headers of an online file
+    to get its size and MIME type without downloading
+    it.
+
+    **Parameters**
+
+    - `url : str`  
+      The resource URL.
+
+    **Returns**
+
+    - `RemoteFileInfo`  
+      Info of the online file or `None`, if the
+      server does not send a `Content-Length`.
+    """
+
+    try:
+        res = requests.head(url, allow_redirects=True)
+    except requests.RequestException:
+        return None
+
+    size = res.headers.get('Content-Length')
+    if not res.ok or not size or not size.isdigit():
+        return None
+
+    mime_type = (res.headers.get('Content-Type') or '').split(';')[0].strip() or None
+    return RemoteFileInfo(res.url, int(size), mime_type)
+
+
+def stream_url_chunks(file_info: RemoteFileInfo, chunk_size: int, max_pending: int = 2):
+    """
+    stream_url_chunks downloads an online file in a
+    background thread and yields it in chunks of the
+    defined chunk_size as soon as they are complete.
+    At most max_pending downloaded chunks are held
+    back in a queue, so the download is paused if the
+    consumer is slower. Raises an exception if the
+    download fails or its size differs from the size
+    of the file info. This function must be used as
+    an iterator.
+
+    **Parameters**
+
+    - `file_info : RemoteFileInfo`  
+      The online file to be downloaded.
+
+    - `chunk_size : [int, Callable[[int, int], int]]`  
+      The byte-size of a single chunk or a function
+      returning the size of the chunk with the given
+      index and number of remaining bytes, which is
+      called in the background thread.
+
+    - `max_pending : int`  
+      Maximum number of downloaded chunks waiting
+      to be consumed.  
+      *Default: `2`*
+    """
+
+    next_size = _chunk_sizer(chunk_size)
+    chunks = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def download():
+        try:
+            with requests.get(file_info.url, stream=True) as res:
+                if not res.ok:
+                    raise Exception('request failed with status code {0}'.format(res.status_code))
+
+                index, offset = 0, 0
+                size = next_size(0, file_info.size)
+                buffer = bytearray()
+                for data in res.iter_content(chunk_size=64 * 1024):
+                    buffer += data
+                    while len(buffer) >= size:
+                        chunk = bytes(buffer[:size])
+                        del buffer[:size]
+                        if not put(FileChunk(size=size, index=index, data=chunk, offset=offset)):
+                            return
+                        index, offset = index + 1, offset + size
+                        size = next_size(index, max(file_info.size - offset, 1))
+                if buffer:
+                    if not put(FileChunk(size=len(buffer), index=index, data=bytes(buffer), offset=offset)):
+                        return
+                    offset += len(buffer)
+
+                if offset != file_info.size:
+                    raise Exception('downloaded {0} bytes but expected {1} bytes'
+                        .format(offset, file_info.size))
+            put(done)
+        except Exception as e:
+            put(e)
+
+    thread = threading.Thread(target=download, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = chunks.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
 def try_get_file(media: str) -> FileInfo:
     """
     try_get_file tries to get a file either by a
     local file path or by a HTTP(S) URL.
+    Local files are memory-mapped, so their data
+    is not copied into memory when read in chunks.
 
     **Parameters**
 
@@ -55,18 +185,20 @@ def try_get_file(media: str) -> FileInfo:
 
     if media.startswith('http'):
         file_handler = file_from_url(media)
-    else:
-        media = os.path.realpath(media)
-        file_handler = open(media, 'rb')
+        return FileInfo(file_handler, media)
+
+    media = os.path.realpath(media)
+    file_handler = open(media, 'rb')
 
-    return FileInfo(file_handler, media)
+    return FileInfo(file_handler, media, use_mmap=True)
 
 
 def chunk_file(file_info: FileInfo, chunk_size: int):
     """
     chunk_file splits a file by its size into chunks of
     the defined chunk_size. This function must be used
-    as an interator.
+    as an interator. For memory-mapped files, the
+    chunks data are memoryview slices of the mapping.
 
     ```python
     for chunk in chunk_file(file_info, 1024):
@@ -83,6 +215,13 @@ def chunk_file(file_info: FileInfo, chunk_size: int):
       The byte-size of a single chunk.
     """
 
+    if file_info.mapping is not None:
+        view = memoryview(file_info.mapping)
+        for i, offset in enumerate(range(0, file_info.size, chunk_size)):
+            data = view[offset:offset + chunk_size]
+            yield FileChunk(size=len(data), index=i, data=data, offset=offset)
+        return
+
     n_chunks = int(file_info.size / chunk_size)
     rest = file_info.size - n_chunks * chunk_size
 
@@ -90,13 +229,125 @@ def chunk_file(file_info: FileInfo, chunk_size: int):
         yield FileChunk(
             size=chunk_size,
             index=i,
-            data=file_info.handler.read(chunk_size))
+            data=file_info.handler.read(chunk_size),
+            offset=i * chunk_size)
 
     if rest > 0:
         yield FileChunk(
             size=rest,
             index=n_chunks,
-            data=file_info.handler.read(rest))
+            data=file_info.handler.read(rest),
+            offset=n_chunks * chunk_size)
+
+
+def chunk_ranges(file_info: FileInfo, chunk_size: int):
+    """
+    chunk_ranges splits a file by its size into chunks of
+    the defined chunk_size like chunk_file, but without
+    reading the data. The chunks only contain their
+    offset and size, so their data can be streamed
+    from the file later on via `FileRange`.
+
+    **Parameters**
+
+    - `file_info : FileInfo`  
+      FileInfo instance of an open file.
+
+    - `chunk_size : [int, Callable[[int, int], int]]`  
+      The byte-size of a single chunk or a function
+      returning the size of the chunk with the given
+      index and number of remaining bytes. It is called
+      when the chunk is taken from the iterator, so the
+      size can adapt to previously uploaded chunks.
+    """
+
+    next_size = _chunk_sizer(chunk_size)
+    index, offset = 0, 0
+    while offset < file_info.size:
+        size = min(next_size(index, file_info.size - offset), file_info.size - offset)
+        yield FileChunk(
+            size=size,
+            index=index,
+            data=None,
+            offset=offset)
+        index, offset = index + 1, offset + size
+
+
+def _chunk_sizer(chunk_size: [int, Callable[[int, int], int]]) -> Callable[[int, int], int]:
+    """
+    Returns chunk_size, if it is a function,
+    else a function returning chunk_size.
+    """
+
+    if callable(chunk_size):
+        return chunk_size
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be larger than 0')
+    return lambda index, remaining: chunk_size
+
+
+def chunk_list(l: list, chunk_size: int):
+    """
+    chunk_list splits a list into consecutive slices
+    of up to chunk_size elements. This function must
+    be used as an iterator.
+
+    **Parameters**
+
+    - `l : list`  
+      List to be split.
+
+    - `chunk_size : int`  
+      The maximum ammount of elements of a
+      single slice.
+    """
+
+    for i in range(0, len(l), chunk_size):
+        yield l[i:i + chunk_size]
+
+
+def json_loads(data: bytes) -> object:
+    """
+    json_loads decodes a JSON document directly from
+    the raw response bytes. orjson is used if it is
+    installed, otherwise the standard libraries json
+    module is used.
+
+    **Parameters**
+
+    - `data : bytes`  
+      The raw JSON document.
+
+    **Returns**
+
+    - `object`  
+      The decoded JSON document.
+    """
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: object) -> bytes:
+    """
+    json_dumps encodes an object as JSON document, using
+    orjson if it is installed, like json_loads.
+
+    **Parameters**
+
+    - `obj : object`  
+      The object to encode.
+
+    **Returns**
+
+    - `bytes`  
+      The UTF-8 encoded JSON document.
+    """
+
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf8')
 
 
 def sort_dict_alphabetically(d: dict) -> dict:
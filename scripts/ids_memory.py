@@ -0,0 +1,68 @@
+"""
+Measures the memory footprint of follower ID collections.
+
+N random user IDs are collected page by page, as returned by
+the `followers/ids` endpoint, once into a list of strings
+(`followers_ids`) and once into an `IdSet`
+(`followers_id_set`). The allocated bytes are measured with
+tracemalloc.
+
+    PYTHONPATH=. python scripts/ids_memory.py [N]
+"""
+
+import sys
+import gc
+import random
+import tracemalloc
+
+from pytter import IdSet
+
+
+PAGE_SIZE = 5000
+
+
+def pages(n: int):
+    rand = random.Random(0)
+    for offset in range(0, n, PAGE_SIZE):
+        yield [str(rand.randrange(1, 2 ** 62)) for _ in range(min(PAGE_SIZE, n - offset))]
+
+
+def measure(collect, n: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    ids = collect(pages(n))
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(s.size_diff for s in end.compare_to(start, 'filename'))
+    del ids
+    return size
+
+
+def collect_list(pages) -> list:
+    ids = []
+    for page in pages:
+        ids.extend(page)
+    return ids
+
+
+def collect_idset(pages) -> IdSet:
+    ids = IdSet()
+    for page in pages:
+        ids.extend(page)
+    len(ids)
+    return ids
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    as_list = measure(collect_list, n)
+    as_idset = measure(collect_idset, n)
+    print('{:<10} {:>12} {:>8}'.format('collection', 'MiB', 'B/id'))
+    for name, size in (('list[str]', as_list), ('IdSet', as_idset)):
+        print('{:<10} {:>12.1f} {:>8.1f}'.format(name, size / 2 ** 20, size / n))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Measures the memory footprint of hydrated pytter objects.
+
+For each model, N objects are created, each from its own
+decoded copy of a sample payload like from an API response,
+and the bytes per object still allocated after the payload
+is dropped are measured with tracemalloc. As reference, the same objects are rebuilt in
+the former layout, where every instance carries its own
+attribute `__dict__`.
+
+    PYTHONPATH=. python scripts/objects_memory.py [N]
+"""
+
+import sys
+import gc
+import json
+import tracemalloc
+
+from pytter.objects import Tweet, User, Media, Place
+
+
+USER = {
+    'id': 221839115,
+    'id_str': '221839115',
+    'name': 'zekro',
+    'screen_name': 'zekroTJA',
+    'location': 'Germany',
+    'url': 'https://zekro.de',
+    'description': 'Software developer',
+    'protected': False,
+    'verified': False,
+    'created_at': 'Wed Dec 01 20:14:29 +0000 2010',
+    'profile_image_url_https': 'https://pbs.twimg.com/profile_images/1/a.jpg',
+    'profile_banner_url': 'https://pbs.twimg.com/profile_banners/1/2',
+    'followers_count': 1234,
+    'friends_count': 321,
+    'statuses_count': 4567,
+    'listed_count': 12,
+    'favourites_count': 890,
+}
+
+PLACE = {
+    'id': '01a9a39529b27f36',
+    'url': 'https://api.twitter.com/1.1/geo/id/01a9a39529b27f36.json',
+    'place_type': 'city',
+    'name': 'Berlin',
+    'full_name': 'Berlin, Germany',
+    'country_code': 'DE',
+    'country': 'Germany',
+    'bounding_box': {
+        'coordinates': [{'coordinates': [13.08, 52.33], 'type': 'Point'}],
+        'type': 'Polygon',
+    },
+    'attributes': {},
+}
+
+MEDIA = {
+    'id': 1170000000000000000,
+    'id_str': '1170000000000000000',
+    'display_url': 'pic.twitter.com/abc',
+    'expanded_url': 'https://twitter.com/zekroTJA/status/1/photo/1',
+    'media_url': 'http://pbs.twimg.com/media/abc.jpg',
+    'media_url_https': 'https://pbs.twimg.com/media/abc.jpg',
+    'url': 'https://t.co/abc',
+    'type': 'photo',
+}
+
+TWEET = {
+    'created_at': 'Wed Sep 11 10:00:00 +0000 2019',
+    'id': 1171744000000000000,
+    'id_str': '1171744000000000000',
+    'text': 'Hello world #pytter',
+    'source': 'pytter',
+    'truncated': False,
+    'user': USER,
+    'place': PLACE,
+    'retweet_count': 3,
+    'favorite_count': 7,
+    'lang': 'en',
+    'entities': {'hashtags': [{'text': 'pytter'}], 'media': [MEDIA]},
+    'extended_entities': {'media': [MEDIA]},
+}
+
+
+class _DictBacked:
+    pass
+
+
+def as_dict_backed(obj: object) -> object:
+    """
+    Rebuilds a slotted object (recursively) as plain
+    object storing its attributes in a `__dict__`.
+    """
+
+    if isinstance(obj, list):
+        return [as_dict_backed(o) for o in obj]
+    slots = [s for c in type(obj).__mro__ for s in getattr(c, '__slots__', ())]
+    if not slots:
+        return obj
+    out = _DictBacked()
+    for s in slots:
+        if hasattr(obj, s):
+            out.__dict__[s] = as_dict_backed(getattr(obj, s))
+    return out
+
+
+def measure(factory, n: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    objs = [factory() for _ in range(n)]
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(s.size_diff for s in end.compare_to(start, 'filename'))
+    del objs
+    return size / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    def payload(data: dict):
+        encoded = json.dumps(data)
+        return lambda: json.loads(encoded)
+
+    models = (
+        ('User', User, payload(USER)),
+        ('Media', Media, payload(MEDIA)),
+        ('Place', Place, payload(PLACE)),
+        ('Tweet', Tweet, payload(TWEET)),
+    )
+
+    print('{:<8} {:>14} {:>15} {:>7}'.format('model', '__dict__ B/obj', '__slots__ B/obj', 'saved'))
+    for name, model, data in models:
+        factory = lambda: model(data())
+        slotted = measure(factory, n)
+        # The temporary slotted objects are freed right after being
+        # rebuilt, so only the dict backed object graphs are measured.
+        dict_backed = measure(lambda: as_dict_backed(factory()), n)
+        print('{:<8} {:>14.0f} {:>15.0f} {:>7.0%}'.format(
+            name, dict_backed, slotted, 1 - slotted / dict_backed))
+
+
+if __name__ == '__main__':
+    main()
@@ -18,6 +18,9 @@ setuptools.setup(
     download_url='https://github.com/zekrotja/pytter/archive/master.tar.gz',
     packages=setuptools.find_packages(),
     install_requires=requirements,
+    extras_require={
+        'async': ['aiohttp'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
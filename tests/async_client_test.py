@@ -0,0 +1,304 @@
+import io
+import json
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+try:
+    from aiohttp import web
+except ImportError:
+    web = None
+
+from pytter import (AsyncClient, Credentials, ResponseCache, NoneResponseException,
+    ParameterOutOfBoundsException, RequestFailedException)
+from pytter.objects import Media
+from pytter.utils import FileInfo, utils
+
+
+class StandInServer:
+    """
+    Minimal local stand-in for the Twitter API
+    serving the endpoints used in the tests.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.app = web.Application()
+        self.app.router.add_get('/1.1/account/verify_credentials.json', self.verify_credentials)
+        self.app.router.add_get('/1.1/users/show.json', self.users_show)
+        self.app.router.add_get('/1.1/followers/ids.json', self.followers_ids)
+        self.app.router.add_get('/1.1/statuses/lookup.json', self.statuses_lookup)
+        self.app.router.add_get('/1.1/media/upload.json', self.media_status)
+        self.app.router.add_post('/1.1/media/upload.json', self.media_upload)
+        self.lookup_batches = []
+        self.status_checks = {}
+        self.users_show_calls = 0
+        self.commands = []
+        self.total_bytes = {}
+        self.segments = {}
+        self.finalized = []
+        self.appending = asyncio.Event()
+        self.release = asyncio.Event()
+        self.aborted_appends = 0
+
+    async def start(self) -> str:
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return 'http://127.0.0.1:{}'.format(port)
+
+    async def stop(self):
+        self.release.set()
+        await self.runner.cleanup()
+
+    async def verify_credentials(self, req):
+        return web.json_response({'id': 1, 'id_str': '1', 'screen_name': 'me'})
+
+    async def users_show(self, req):
+        self.users_show_calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        uid = req.query['user_id']
+        return web.json_response({'id': int(uid), 'id_str': uid, 'screen_name': 'u' + uid})
+
+    async def statuses_lookup(self, req):
+        ids = req.query['id'].split(',')
+        self.lookup_batches.append(ids)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return web.json_response({'id': {
+            id: ({'id': int(id), 'id_str': id, 'text': 't' + id} if int(id) % 2 else None)
+            for id in ids}})
+
+    async def media_status(self, req):
+        # Media with ID n finishes processing on the n-th check.
+        media_id = req.query['media_id']
+        checks = self.status_checks[media_id] = self.status_checks.get(media_id, 0) + 1
+        state = 'succeeded' if checks >= int(media_id) else 'in_progress'
+        return web.json_response({'media_id': int(media_id), 'media_id_string': media_id,
+            'processing_info': {'state': state, 'check_after_secs': 0.05}})
+
+    async def media_upload(self, req):
+        # APPENDs of media with 1 byte fail, of media
+        # with 2 bytes they hang until the server stops.
+        form = await req.post()
+        command = form['command']
+        self.commands.append(command)
+        if command == 'INIT':
+            media_id = str(len(self.total_bytes) + 1)
+            self.total_bytes[media_id] = int(form['total_bytes'])
+            self.segments[media_id] = {}
+            return web.json_response({'media_id': int(media_id), 'media_id_string': media_id})
+        media_id = form['media_id']
+        if command == 'APPEND':
+            if self.total_bytes[media_id] == 1:
+                return web.Response(status=400)
+            if self.total_bytes[media_id] == 2:
+                self.appending.set()
+                await self.release.wait()
+                if req.transport is None or req.transport.is_closing():
+                    self.aborted_appends += 1
+            self.segments[media_id][int(form['segment_index'])] = form['media'].file.read()
+            return web.Response(status=204)
+        self.finalized.append(media_id)
+        return web.json_response({'media_id': int(media_id), 'media_id_string': media_id,
+            'size': self.total_bytes[media_id]})
+
+    async def followers_ids(self, req):
+        cursor = int(req.query['cursor'])
+        if cursor == -1:
+            return web.json_response({'ids': ['1', '2'], 'next_cursor': 5})
+        return web.json_response({'ids': ['3'], 'next_cursor': 0})
+
+
+@unittest.skipIf(web is None, 'aiohttp is not installed')
+class AsyncClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.credentials = Credentials('ck', 'cs', 'atk', 'ats')
+
+    def run_with_client(self, coro_fn, max_concurrency: int = 100, **kwargs):
+        async def run():
+            server = StandInServer()
+            uri = await server.start()
+            client = AsyncClient(self.credentials, max_concurrency=max_concurrency, **kwargs)
+            client.session().API_ROOT_URI = uri
+            client.session().API_UPLOAD_ROOT_URI = uri + '/1.1'
+            try:
+                async with client:
+                    return await coro_fn(client), server
+            finally:
+                await server.stop()
+        return asyncio.run(run())
+
+    def test_user(self):
+        async def fn(client):
+            return await client.user(id='42')
+        user, _ = self.run_with_client(fn)
+        self.assertEqual(user.id_str, '42')
+        self.assertEqual(user.username, 'u42')
+
+    def test_response_cache(self):
+        cache = ResponseCache()
+        async def fn(client):
+            return [await client.user(id='42') for _ in range(3)]
+        users, server = self.run_with_client(fn, response_cache=cache)
+        self.assertEqual([u.id_str for u in users], ['42', '42', '42'])
+        self.assertEqual(server.users_show_calls, 1)
+        self.assertEqual(cache.stats.hits, 2)
+
+    def test_coalesce_requests(self):
+        async def fn(client):
+            return await asyncio.gather(*[client.user(id=str(i % 2 + 1)) for i in range(10)])
+        users, server = self.run_with_client(fn, coalesce_requests=True)
+        self.assertEqual([u.id_str for u in users], [str(i % 2 + 1) for i in range(10)])
+        self.assertEqual(server.users_show_calls, 2)
+
+    def test_concurrency_limit(self):
+        async def fn(client):
+            return await asyncio.gather(*[client.user(id=str(i)) for i in range(1, 50)])
+        users, server = self.run_with_client(fn, max_concurrency=5)
+        self.assertEqual([u.id_str for u in users], [str(i) for i in range(1, 50)])
+        self.assertLessEqual(server.max_in_flight, 5)
+
+    def test_cursor_request(self):
+        async def fn(client):
+            return await client.followers_ids(id='42')
+        ids, _ = self.run_with_client(fn)
+        self.assertEqual(ids, ['1', '2', '3'])
+
+    def test_followers_id_set(self):
+        async def fn(client):
+            return await client.followers_id_set(id='42')
+        ids, _ = self.run_with_client(fn)
+        self.assertEqual(list(ids), [1, 2, 3])
+
+    def test_statuses_bulk(self):
+        ids = [str(i) for i in range(1, 251)]
+        async def fn(client):
+            return await client.statuses(ids)
+        tweets, server = self.run_with_client(fn)
+        self.assertEqual(sorted(len(b) for b in server.lookup_batches), [50, 100, 100])
+        self.assertEqual(len(tweets), 250)
+        self.assertEqual(tweets['7'].text, 't7')
+        self.assertIsNone(tweets['8'])
+
+    def test_statuses_bulk_workers(self):
+        ids = [str(i) for i in range(1, 301)]
+        async def fn(client):
+            with self.assertRaises(ParameterOutOfBoundsException):
+                await client.session().statuses_lookup_bulk(ids, workers=0)
+            return await client.session().statuses_lookup_bulk(ids, workers=2)
+        tweets, server = self.run_with_client(fn)
+        self.assertEqual(len(server.lookup_batches), 3)
+        self.assertEqual(len(tweets), 300)
+        self.assertEqual(server.max_in_flight, 2)
+
+    def test_batching(self):
+        async def fn(client):
+            return await asyncio.gather(*[client.status(str(i)) for i in range(1, 121)],
+                return_exceptions=True)
+        tweets, server = self.run_with_client(fn, batching=True)
+        self.assertEqual(sorted(len(b) for b in server.lookup_batches), [20, 100])
+        self.assertEqual(tweets[6].text, 't7')
+        self.assertIsInstance(tweets[7], NoneResponseException)
+
+    def test_json_decoder(self):
+        decoded = []
+        def decoder(data):
+            decoded.append(data)
+            return json.loads(data)
+        async def fn(client):
+            return await client.user(id='42')
+        user, _ = self.run_with_client(fn, json_decoder=decoder)
+        self.assertEqual(user.id_str, '42')
+        self.assertTrue(all(isinstance(d, bytes) for d in decoded))
+        self.assertEqual(len(decoded), 2)
+
+    def test_wait_for_processing_many(self):
+        media = [Media({'media_id': i, 'media_id_string': str(i),
+            'processing_info': {'state': 'pending', 'check_after_secs': 0.05}})
+            for i in (3, 1, 2)]
+        async def fn(client):
+            return await client.session().wait_for_processing_many(media, timeout=5)
+        done, server = self.run_with_client(fn)
+        self.assertEqual([m.id_str for m in done], ['3', '1', '2'])
+        self.assertTrue(all(m.processing_info['state'] == 'succeeded' for m in done))
+        self.assertEqual(server.status_checks, {'3': 3, '1': 1, '2': 2})
+
+    def test_wait_for_processing_timeout(self):
+        media = Media({'media_id': 100, 'media_id_string': '100',
+            'processing_info': {'state': 'pending', 'check_after_secs': 0.05}})
+        async def fn(client):
+            return await client.session().wait_for_processing(media, timeout=0.2)
+        with self.assertRaises(TimeoutError):
+            self.run_with_client(fn)
+
+    def test_upload_file_cunked(self):
+        data = bytes(range(10))
+        async def fn(client):
+            session = client.session()
+            session.UPLOAD_CHUNK_SIZE = 4
+            return await session.upload_file_cunked(FileInfo(io.BytesIO(data), 'media.mp4'), workers=2)
+        media, server = self.run_with_client(fn)
+        self.assertEqual(media.id_str, '1')
+        self.assertEqual(server.commands, ['INIT', 'APPEND', 'APPEND', 'APPEND', 'FINALIZE'])
+        self.assertEqual(sorted(server.segments['1']), [0, 1, 2])
+        self.assertEqual(b''.join(server.segments['1'][i] for i in range(3)), data)
+
+    def test_upload_cancelled_while_reading(self):
+        reading = threading.Event()
+        release = threading.Event()
+        closed = threading.Event()
+
+        def chunk_ranges(file_info, chunk_size):
+            try:
+                yield utils.FileChunk(size=4, index=0, data=None, offset=0)
+                reading.set()
+                release.wait(5)
+                yield utils.FileChunk(size=4, index=1, data=None, offset=4)
+            finally:
+                closed.set()
+
+        async def fn(client):
+            loop = asyncio.get_running_loop()
+            task = asyncio.ensure_future(client.session().upload_file_cunked(
+                FileInfo(io.BytesIO(bytes(8)), 'media.mp4')))
+            await loop.run_in_executor(None, reading.wait, 5)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # The generator is closed once the pending next() returned.
+            self.assertFalse(closed.is_set())
+            release.set()
+            return await loop.run_in_executor(None, closed.wait, 5)
+
+        with mock.patch.object(utils, 'chunk_ranges', chunk_ranges):
+            closed_after, server = self.run_with_client(fn)
+        self.assertTrue(closed_after)
+        self.assertNotIn('FINALIZE', server.commands)
+
+    def test_upload_attachments_cancelled_on_failure(self):
+        files = [FileInfo(io.BytesIO(b'x' * n), 'image.png') for n in (2, 1)]
+        async def fn(client):
+            with self.assertRaises(RequestFailedException):
+                await asyncio.wait_for(client.session().upload_attachments(files), 5)
+            return files
+        _, server = self.run_with_client(fn)
+        self.assertEqual(server.commands.count('INIT'), 2)
+        self.assertTrue(server.appending.is_set())
+        self.assertEqual(server.finalized, [])
+        # The hanging upload was cancelled, which aborted its request.
+        self.assertEqual(server.aborted_appends, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
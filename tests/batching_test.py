@@ -0,0 +1,157 @@
+import time
+import asyncio
+import threading
+import unittest
+
+from pytter import BatchLoader, AsyncBatchLoader, NoneResponseException
+
+from tests.stubs import StubTransport, stub_client
+
+
+class LookupApi(StubTransport):
+    """
+    Answers bulk lookups, where only odd Tweet IDs
+    exist, and records the requested values.
+    """
+
+    def __init__(self):
+        super().__init__(self.answer)
+
+    def answer(self, req):
+        if req.path == 'users/lookup.json':
+            ids = split(req.params, 'user_id')
+            ids += [name.lower().replace('user', '') for name in split(req.params, 'screen_name')]
+            return [{'id_str': id, 'screen_name': 'User' + id} for id in ids]
+        return {'id': {id: ({'id_str': id} if int(id) % 2 else None) for id in split(req.params, 'id')}}
+
+    def lookups(self) -> list:
+        lookups = []
+        for req in self.requests:
+            if req.path == 'users/lookup.json':
+                lookups.append(('users', sorted(split(req.params, 'user_id')),
+                    sorted(split(req.params, 'screen_name'))))
+            else:
+                lookups.append(('statuses', sorted(split(req.params, 'id'))))
+        return lookups
+
+
+def split(params: dict, key: str) -> list:
+    return params[key].split(',') if params.get(key) else []
+
+
+def run_threads(n, fn):
+    results = [None] * n
+    barrier = threading.Barrier(n)
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = fn(i)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+class BatchLoaderTest(unittest.TestCase):
+
+    def test_window(self):
+        batches = []
+        def load(keys):
+            batches.append(sorted(keys))
+            return {k: k * 2 for k in keys if k != 3}
+
+        loader = BatchLoader(load, window=0.05)
+        results = run_threads(6, lambda i: loader.load(i % 4))
+        self.assertEqual(results, [0, 2, 4, None, 0, 2])
+        self.assertEqual(batches, [[0, 1, 2, 3]])
+
+        # Later keys start a new batch.
+        self.assertEqual(loader.load(1), 2)
+        self.assertEqual(loader.batches, 2)
+
+    def test_max_batch(self):
+        batches = []
+        def load(keys):
+            batches.append(len(keys))
+            return {k: k for k in keys}
+
+        loader = BatchLoader(load, window=10, max_batch=3)
+        futures = [loader.submit(i) for i in range(7)]
+        self.assertEqual(batches, [3, 3])
+        loader.flush()
+        self.assertEqual([f.result(timeout=1) for f in futures], list(range(7)))
+        self.assertEqual(batches, [3, 3, 1])
+
+    def test_exception(self):
+        def load(keys):
+            raise ValueError('failed')
+
+        loader = BatchLoader(load, window=0.01)
+        results = run_threads(3, lambda i: loader.load(i))
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertEqual(loader.batches, 1)
+
+    def test_async(self):
+        batches = []
+        async def load(keys):
+            batches.append(sorted(keys))
+            await asyncio.sleep(0.01)
+            return {k: str(k) for k in keys}
+
+        async def run():
+            loader = AsyncBatchLoader(load, window=0.01, max_batch=4)
+            first = await asyncio.gather(*[loader.load(i % 6) for i in range(6)])
+            # Repeated keys of one batch are loaded once.
+            second = await asyncio.gather(*[loader.load(i % 3) for i in range(6)])
+            return first + second
+
+        self.assertEqual(asyncio.run(run()), [str(i % 6) for i in range(6)] + [str(i % 3) for i in range(6)])
+        self.assertEqual(batches, [[0, 1, 2, 3], [4, 5], [0, 1, 2]])
+
+    def test_async_cancelled(self):
+        async def load(keys):
+            await asyncio.sleep(10)
+
+        async def run():
+            loader = AsyncBatchLoader(load, window=0)
+            waiter = asyncio.ensure_future(loader.load(1))
+            await asyncio.sleep(0.01)
+            for task in loader._tasks:
+                task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await asyncio.wait_for(waiter, 1)
+
+        asyncio.run(run())
+
+    def test_client(self):
+        api = LookupApi()
+        client = stub_client(api, batching=True)
+
+        def fetch(i):
+            if i % 3 == 0:
+                return client.user(id=str(i)).id_str
+            if i % 3 == 1:
+                return client.user(screen_name='USER{}'.format(i)).id_str
+            return client.status(str(i))
+
+        results = run_threads(12, fetch)
+        lookups = api.lookups()
+        self.assertEqual(sorted(lookups), [
+            ('statuses', ['11', '2', '5', '8']),
+            ('users', [], ['user1', 'user10', 'user4', 'user7']),
+            ('users', ['0', '3', '6', '9'], []),
+        ])
+        self.assertEqual(results[3], '3')
+        self.assertEqual(results[4], '4')
+        self.assertEqual(results[5].id_str, '5')
+        self.assertIsInstance(results[2], NoneResponseException)
+
+
+if __name__ == '__main__':
+    unittest.main()
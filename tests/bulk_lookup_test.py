@@ -0,0 +1,84 @@
+import time
+import unittest
+
+from pytter import ParameterOutOfBoundsException, Tweet, User
+
+from tests.stubs import StubTransport, stub_session
+
+
+class LookupApi(StubTransport):
+    """
+    Answers users and statuses lookups, where only odd
+    Tweet IDs exist, and records the maximum number of
+    concurrent lookups.
+    """
+
+    def __init__(self):
+        super().__init__(self.answer)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def answer(self, req):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+
+        if req.path == 'users/lookup.json':
+            ids = split(req.params, 'user_id')
+            ids += [name[1:] for name in split(req.params, 'screen_name')]
+            return [{'id': int(id), 'id_str': id, 'screen_name': 'u' + id} for id in ids]
+        return {'id': {id: ({'id': int(id), 'id_str': id, 'text': 't' + id} if int(id) % 2 else None)
+            for id in split(req.params, 'id')}}
+
+    def batches(self, path: str, key: str) -> list:
+        return sorted(len(split(req.params, key)) for req in self.requests
+            if req.path == path and key in req.params)
+
+
+def split(params: dict, key: str) -> list:
+    return params[key].split(',') if params.get(key) else []
+
+
+class BulkLookupTest(unittest.TestCase):
+
+    def test_statuses_lookup_bulk(self):
+        api = LookupApi()
+        session = stub_session(api)
+        ids = [str(i) for i in range(1, 251)]
+        tweets = session.statuses_lookup_bulk(ids + ['7'], workers=2)
+        self.assertEqual(api.batches('statuses/lookup.json', 'id'), [50, 100, 100])
+        self.assertEqual(len(tweets), 250)
+        self.assertIsInstance(tweets['7'], Tweet)
+        self.assertEqual(tweets['249'].text, 't249')
+        self.assertIsNone(tweets['8'])
+        self.assertEqual(api.max_in_flight, 2)
+
+    def test_users_lookup_bulk(self):
+        api = LookupApi()
+        session = stub_session(api)
+        ids = [str(i) for i in range(150)]
+        names = ['u{}'.format(i) for i in range(1000, 1120)]
+        users = session.users_lookup_bulk(ids=ids, screen_names=names, workers=8)
+        self.assertEqual(api.batches('users/lookup.json', 'user_id'), [50, 100])
+        self.assertEqual(api.batches('users/lookup.json', 'screen_name'), [20, 100])
+        self.assertEqual(len(users), 2 * 270)
+        self.assertIsInstance(users['149'], User)
+        self.assertIs(users['1119'], users['u1119'])
+        self.assertLessEqual(api.max_in_flight, 4)
+        self.assertGreater(api.max_in_flight, 1)
+
+    def test_workers(self):
+        api = LookupApi()
+        session = stub_session(api)
+        session.statuses_lookup_bulk([str(i) for i in range(300)], workers=1)
+        self.assertEqual(len(api.requests), 3)
+        self.assertEqual(api.max_in_flight, 1)
+        with self.assertRaises(ParameterOutOfBoundsException):
+            session.statuses_lookup_bulk(['1'], workers=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from pytter import AdaptiveChunkSizer, ParameterOutOfBoundsException
+
+
+KiB = 1024
+MiB = 1024 * KiB
+
+
+class AdaptiveChunkSizerTest(unittest.TestCase):
+
+    def test_grows_on_fast_link(self):
+        sizer = AdaptiveChunkSizer(target_duration=2)
+        sizes = []
+        for _ in range(5):
+            size = sizer.next_size(len(sizes), 100 * MiB)
+            sizes.append(size)
+            # 10 MiB/s
+            sizer.record(size, size / (10 * MiB))
+        self.assertEqual(sizes, [1 * MiB, 2 * MiB, 4 * MiB, 5 * MiB, 5 * MiB])
+        self.assertAlmostEqual(sizer.throughput, 10 * MiB)
+
+    def test_shrinks_on_slow_link(self):
+        sizer = AdaptiveChunkSizer(target_duration=2)
+        for _ in range(5):
+            size = sizer.chunk_size
+            # 50 KiB/s
+            sizer.record(size, size / (50 * KiB))
+        self.assertEqual(sizer.chunk_size, 256 * KiB)
+
+    def test_bounded_change_and_alignment(self):
+        sizer = AdaptiveChunkSizer(target_duration=1, smoothing=1)
+        sizer.record(1 * MiB, 1 / 3)
+        self.assertEqual(sizer.chunk_size, 2 * MiB)
+        sizer.record(2 * MiB, 1.3)
+        self.assertEqual(sizer.chunk_size, 1536 * KiB)
+        self.assertEqual(sizer.chunk_size % AdaptiveChunkSizer.ALIGNMENT, 0)
+
+    def test_history(self):
+        sizer = AdaptiveChunkSizer(history_size=2)
+        for duration in (1, 2, 4):
+            sizer.record(1 * MiB, duration)
+        history = sizer.history
+        self.assertEqual([m.duration for m in history], [2, 4])
+        self.assertEqual(history[-1].throughput, MiB / 4)
+        self.assertEqual(history[-1].next_size, sizer.chunk_size)
+
+    def test_segment_limit(self):
+        sizer = AdaptiveChunkSizer(initial_size=256 * KiB)
+        self.assertEqual(sizer.next_size(0, 10 * MiB), 256 * KiB)
+        self.assertEqual(sizer.next_size(998, 10 * MiB), 5 * MiB)
+        self.assertEqual(sizer.next_size(990, 10 * MiB), MiB)
+        self.assertEqual(sizer.next_size(0, 100), 100)
+        self.assertEqual(sizer.next_size(0, 1000 * 5 * MiB), 5 * MiB)
+        with self.assertRaises(ParameterOutOfBoundsException):
+            sizer.next_size(999, 10 * MiB)
+        with self.assertRaises(ParameterOutOfBoundsException):
+            sizer.check_size(1000 * 5 * MiB + 1)
+        sizer.check_size(1000 * 5 * MiB)
+
+    def test_invalid_sizes(self):
+        with self.assertRaises(ValueError):
+            AdaptiveChunkSizer(initial_size=10 * MiB)
+        with self.assertRaises(ValueError):
+            AdaptiveChunkSizer(target_duration=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
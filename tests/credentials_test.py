@@ -0,0 +1,83 @@
+import time
+import unittest
+
+from pytter import (
+    Credentials, CredentialPool, RateLimitException,
+    RATE_LIMIT_RAISE, RATE_LIMIT_WAIT, RATE_LIMIT_IGNORE
+)
+
+
+def headers(limit: int, remaining: int, reset: float) -> dict:
+    return {
+        'x-rate-limit-limit': str(limit),
+        'x-rate-limit-remaining': str(remaining),
+        'x-rate-limit-reset': str(reset),
+    }
+
+
+class CredentialPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.user = Credentials('ck', 'cs', 'atk', 'ats')
+        self.app_1 = Credentials('ck1', 'cs1', '', '')
+        self.app_2 = Credentials('ck2', 'cs2', '', '')
+
+    def test_primary(self):
+        pool = CredentialPool([self.app_1, self.user, self.app_2])
+        self.assertIs(pool.primary().credentials, self.user)
+        self.assertFalse(pool.entry(self.app_1).user_context)
+
+    def test_picks_most_remaining(self):
+        pool = CredentialPool([self.user, self.app_1, self.app_2])
+        reset = time.time() + 60
+        pool.entry(self.user).rate_limits.update('users/show', headers(900, 5, reset))
+        pool.entry(self.app_1).rate_limits.update('users/show', headers(900, 50, reset))
+        pool.entry(self.app_2).rate_limits.update('users/show', headers(900, 20, reset))
+        self.assertIs(pool.acquire('users/show').credentials, self.app_1)
+
+    def test_unknown_windows_are_preferred(self):
+        pool = CredentialPool([self.user, self.app_1])
+        pool.entry(self.user).rate_limits.update('users/show', headers(900, 899, time.time() + 60))
+        self.assertIs(pool.acquire('users/show').credentials, self.app_1)
+
+    def test_writes_use_primary(self):
+        pool = CredentialPool([self.app_1, self.user])
+        pool.entry(self.user).rate_limits.update('statuses/update', headers(300, 1, time.time() + 60))
+        self.assertIs(pool.acquire('statuses/update', 'POST').credentials, self.user)
+        self.assertIs(pool.acquire('account/verify_credentials').credentials, self.user)
+
+    def test_parked_credentials(self):
+        pool = CredentialPool([self.user, self.app_1], RATE_LIMIT_RAISE)
+        reset = time.time() + 60
+        pool.entry(self.user).rate_limits.exhaust('users/show', reset)
+        pool.entry(self.app_1).rate_limits.update('users/show', headers(900, 1, reset))
+        self.assertIs(pool.acquire('users/show').credentials, self.app_1)
+        with self.assertRaises(RateLimitException):
+            pool.acquire('users/show')
+
+    def test_wait_for_earliest_reset(self):
+        pool = CredentialPool([self.user, self.app_1], RATE_LIMIT_WAIT)
+        pool.entry(self.user).rate_limits.exhaust('users/show', time.time() + 60)
+        pool.entry(self.app_1).rate_limits.exhaust('users/show', time.time() + 0.2)
+        self.assertIs(pool.acquire('users/show').credentials, self.app_1)
+
+    def test_round_robin(self):
+        pool = CredentialPool([self.user, self.app_1, self.app_2], RATE_LIMIT_WAIT)
+        picked = [pool.acquire('users/show').credentials for _ in range(6)]
+        self.assertEqual(picked, [self.user, self.app_1, self.app_2] * 2)
+
+    def test_ignore_mode_spreads(self):
+        pool = CredentialPool([self.user, self.app_1], RATE_LIMIT_IGNORE)
+        reset = time.time() + 60
+        pool.entry(self.user).rate_limits.update('users/show', headers(900, 0, reset))
+        pool.entry(self.app_1).rate_limits.update('users/show', headers(900, 2, reset))
+        picked = [pool.reserve('users/show') for _ in range(4)]
+        self.assertEqual([e.credentials for e, _ in picked[:2]], [self.app_1, self.app_1])
+        self.assertEqual(set(e.credentials for e, _ in picked[2:]), {self.user, self.app_1})
+        self.assertEqual([wait for _, wait in picked], [0, 0, 0, 0])
+        self.assertEqual(len(set(e.credentials for e, _ in
+            (pool.reserve('statuses/lookup') for _ in range(4)))), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import threading
+import unittest
+
+from pytter import Cursor, IdSet, ParameterOutOfBoundsException
+
+
+class PagedSession:
+    """
+    Stand-in for APISession serving three pages
+    of a cursored endpoint.
+    """
+
+    PAGES = {
+        -1: {'ids': ['1', '2'], 'next_cursor': 10},
+        10: {'ids': ['3', '4'], 'next_cursor': 20},
+        20: {'ids': ['5'], 'next_cursor': 0},
+    }
+
+    def __init__(self):
+        self.requested = []
+        self.lock = threading.Lock()
+
+    def request(self, method, resource_path, params=None):
+        with self.lock:
+            self.requested.append(params['cursor'])
+        return self.PAGES[params['cursor']]
+
+
+class CursorTest(unittest.TestCase):
+
+    def test_items(self):
+        session = PagedSession()
+        cursor = Cursor(session, 'followers/ids.json', 'ids', prefetch=False)
+        self.assertEqual(list(cursor), ['1', '2', '3', '4', '5'])
+        self.assertEqual(cursor.next_cursor, 0)
+
+    def test_pages_and_resume(self):
+        session = PagedSession()
+        cursor = Cursor(session, 'followers/ids.json', 'ids', prefetch=False)
+        pages = cursor.pages()
+        self.assertEqual(next(pages), ['1', '2'])
+        checkpoint = cursor.next_cursor
+        self.assertEqual(checkpoint, 10)
+        pages.close()
+
+        resumed = Cursor(session, 'followers/ids.json', 'ids', cursor=checkpoint)
+        self.assertEqual(list(resumed), ['3', '4', '5'])
+
+    def test_to_idset(self):
+        session = PagedSession()
+        cursor = Cursor(session, 'followers/ids.json', 'ids', count=5000, max_count=5000)
+        ids = cursor.to_idset()
+        self.assertIsInstance(ids, IdSet)
+        self.assertEqual(list(ids), [1, 2, 3, 4, 5])
+        self.assertEqual(cursor.next_cursor, 0)
+        with self.assertRaises(ParameterOutOfBoundsException):
+            Cursor(session, 'followers/ids.json', 'ids', count=5000)
+
+    def test_prefetch(self):
+        session = PagedSession()
+        cursor = Cursor(session, 'followers/ids.json', 'ids', prefetch=True)
+        pages = cursor.pages()
+        next(pages)
+        # The second page is requested before the caller asks for it.
+        for _ in range(100):
+            if len(session.requested) == 2:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(session.requested, [-1, 10])
+        self.assertEqual([p for p in pages], [['3', '4'], ['5']])
+
+    def test_item_factory(self):
+        session = PagedSession()
+        cursor = Cursor(session, 'followers/ids.json', 'ids', item_factory=int)
+        self.assertEqual(list(cursor), [1, 2, 3, 4, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
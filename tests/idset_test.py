@@ -0,0 +1,74 @@
+import unittest
+from array import array
+from unittest import mock
+
+from pytter import IdSet
+from pytter.utils import idset
+
+
+class IdSetTest(unittest.TestCase):
+
+    def test_sorted_unique(self):
+        ids = IdSet(['5', 3, '18446744073709551615', 3])
+        ids.extend([1, 5])
+        self.assertEqual(list(ids), [1, 3, 5, 18446744073709551615])
+        self.assertEqual(len(ids), 4)
+        self.assertIn('3', ids)
+        self.assertIn(18446744073709551615, ids)
+        self.assertNotIn(4, ids)
+        self.assertEqual(ids.ids.typecode, 'Q')
+
+    def test_set_operations(self):
+        a = IdSet([1, 2, 3, 5, 8, 13])
+        b = IdSet([2, 3, 4, 5, 6])
+        self.assertEqual(list(a | b), [1, 2, 3, 4, 5, 6, 8, 13])
+        self.assertEqual(list(a & b), [2, 3, 5])
+        self.assertEqual(list(a - b), [1, 8, 13])
+        self.assertEqual(list(b - a), [4, 6])
+        self.assertEqual(list(a - IdSet()), list(a))
+        self.assertEqual(list(IdSet() & a), [])
+        self.assertEqual(list(a.union([21])), [1, 2, 3, 5, 8, 13, 21])
+
+    def test_bytes_roundtrip(self):
+        a = IdSet([9, 2, 7])
+        b = IdSet.frombytes(a.tobytes(), is_sorted=True)
+        self.assertEqual(a, b)
+        self.assertEqual(IdSet.from_array(array('Q', [3, 1, 3])), IdSet([1, 3]))
+        with self.assertRaises(TypeError):
+            IdSet.from_array(array('q', [1]))
+
+    def test_pure_python(self):
+        with mock.patch.object(idset, 'numpy', None):
+            self.test_sorted_unique()
+            self.test_set_operations()
+            self.test_bytes_roundtrip()
+
+    def test_pure_python_runs(self):
+        with mock.patch.object(idset, 'numpy', None), mock.patch.object(IdSet, 'RUN_SIZE', 3):
+            ids = IdSet([9, 4, 7, 1])
+            ids.extend(array('Q', [10, 12, 11]))
+            ids.extend([2, 9, 8, 3, 0])
+            self.assertEqual(ids._runs, [0, 3, 7, 10])
+            self.assertEqual(list(ids), [0, 1, 2, 3, 4, 7, 8, 9, 10, 11, 12])
+            self.assertEqual(ids._runs, [0])
+
+            # Pages continuing the sorted IDs add no run.
+            ids.extend([13, 15, 14, 16])
+            self.assertEqual(ids._runs, [0])
+            self.assertEqual(list(ids)[-4:], [13, 14, 15, 16])
+
+    @unittest.skipIf(idset.numpy is None, 'NumPy is not installed')
+    def test_numpy(self):
+        a = IdSet([5, 3, 3, 18446744073709551615])
+        a.extend(array('Q', [1, 5]))
+        b = IdSet([3, 4, 5])
+        self.assertEqual(list(a), [1, 3, 5, 18446744073709551615])
+        self.assertEqual(list(a | b), [1, 3, 4, 5, 18446744073709551615])
+        self.assertEqual(list(a & b), [3, 5])
+        self.assertEqual(list(a - b), [1, 18446744073709551615])
+        self.assertEqual((a | b).ids.typecode, 'Q')
+        self.assertEqual(IdSet.from_array(array('Q', [3, 1, 3])), IdSet([1, 3]))
+
+
+if __name__ == '__main__':
+    unittest.main()
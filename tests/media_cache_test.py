@@ -0,0 +1,84 @@
+import io
+import time
+import tempfile
+import unittest
+
+from pytter import Credentials, MediaCache, MemoryMediaCache, DiskMediaCache, media_cache_key
+from pytter.utils import FileInfo
+
+from tests.stubs import StubTransport, stub_session
+
+
+def upload(req):
+    return {'media_id': 7, 'media_id_string': '7', 'expires_after_secs': 86400}
+
+
+def commands(api) -> list:
+    return [req.data.get('command', 'APPEND') for req in api.requests]
+
+
+def file_info(data: bytes = b'0123456789') -> FileInfo:
+    return FileInfo(io.BytesIO(data), 'image.png')
+
+
+class MediaCacheTest(unittest.TestCase):
+
+    def test_key(self):
+        self.assertEqual(media_cache_key(file_info()), media_cache_key(file_info()))
+        self.assertNotEqual(media_cache_key(file_info()), media_cache_key(file_info(b'x')))
+        self.assertTrue(media_cache_key(file_info()).endswith('-10-image_png'))
+        self.assertEqual(media_cache_key(file_info(), 'a'), media_cache_key(file_info(), 'a'))
+        self.assertNotEqual(media_cache_key(file_info(), 'a'), media_cache_key(file_info(), 'b'))
+        self.assertNotEqual(media_cache_key(file_info(), 'a'), media_cache_key(file_info()))
+
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            MediaCache()
+
+    def test_expiry(self):
+        cache = MemoryMediaCache(margin=0)
+        cache.set('a', {'media_id': 1, 'expires_after_secs': 0.05})
+        cache.set('b', {'media_id': 2})
+        self.assertEqual(cache.get('a'), {'media_id': 1, 'expires_after_secs': 0.05})
+        self.assertIsNone(cache.get('b'))
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_ttl(self):
+        cache = MemoryMediaCache(ttl=0.05)
+        cache.set('a', {'media_id': 1, 'expires_after_secs': 86400})
+        cache.set('b', {'media_id': 2})
+        self.assertIsNotNone(cache.get('b'))
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as dir:
+            DiskMediaCache(dir).set('a', {'media_id': 1, 'expires_after_secs': 3600})
+            cache = DiskMediaCache(dir)
+            self.assertEqual(cache.get('a')['media_id'], 1)
+            self.assertIsNone(cache.get('b'))
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_upload_skips_cached(self):
+        api = StubTransport(upload)
+        session = stub_session(api, media_cache=MemoryMediaCache())
+        first = session.upload_file_cunked(file_info())
+        second = session.upload_file_cunked(file_info())
+        self.assertEqual(commands(api), ['INIT', 'APPEND', 'FINALIZE'])
+        self.assertEqual(first.id_str, second.id_str)
+        self.assertEqual(second.expires_after_secs, 86400)
+        session.upload_file_cunked(file_info(b'other'))
+        self.assertEqual(len(api.requests), 6)
+
+    def test_upload_per_account(self):
+        cache = MemoryMediaCache()
+        first, second = StubTransport(upload), StubTransport(upload)
+        stub_session(first, media_cache=cache).upload_file_cunked(file_info())
+        stub_session(second, media_cache=cache,
+            credentials=Credentials('ck', 'cs', 'other', 'ats')).upload_file_cunked(file_info())
+        self.assertEqual(commands(second), ['INIT', 'APPEND', 'FINALIZE'])
+
+
+if __name__ == '__main__':
+    unittest.main()
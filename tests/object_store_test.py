@@ -0,0 +1,180 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import threading
+
+from pytter import Client, ObjectStore, User, PROJECTION_RAW
+
+from tests.stubs import StubTransport, stub_client
+
+
+class LookupApi(StubTransport):
+    """
+    Answers bulk lookups and records the requested values.
+    """
+
+    def __init__(self):
+        super().__init__(self.answer)
+
+    def answer(self, req):
+        if req.path == 'users/lookup.json':
+            users = [{'id_str': id, 'screen_name': 'user' + id} for id in split(req.params, 'user_id')]
+            users += [{'id_str': name.lower().replace('user', ''), 'screen_name': name}
+                for name in split(req.params, 'screen_name')]
+            return users
+        if req.path == 'statuses/lookup.json':
+            return {'id': {id: ({'id_str': id, 'text': 'tweet ' + id} if id != '404' else None)
+                for id in split(req.params, 'id')}}
+        if req.path == 'favorites/create.json':
+            return {'id_str': req.params.get('id') or req.data.get('id')}
+
+    def lookups(self) -> list:
+        lookups = []
+        for req in self.requests:
+            if req.path == 'users/lookup.json':
+                lookups.append(('users', split(req.params, 'user_id'), split(req.params, 'screen_name')))
+            elif req.path == 'statuses/lookup.json':
+                lookups.append(('statuses', split(req.params, 'id')))
+        return lookups
+
+
+def split(params: dict, key: str) -> list:
+    return params[key].split(',') if params.get(key) else []
+
+
+class ObjectStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'objects.db')
+        self.store = ObjectStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.dir)
+
+    def client(self) -> Client:
+        self.api = LookupApi()
+        return stub_client(self.api, object_store=self.store)
+
+    def test_put_and_get(self):
+        self.store.put_users([{'id_str': '1', 'screen_name': 'zekroTJA'}, {'id': 2, 'screen_name': 'b'}])
+        users = self.store.get_users(ids=['1', 2, '3'])
+        self.assertEqual(users['1']['screen_name'], 'zekroTJA')
+        self.assertEqual(users['zekroTJA']['id_str'], '1')
+        self.assertEqual(users['2']['screen_name'], 'b')
+        self.assertNotIn('3', users)
+        self.assertEqual((self.store.hits, self.store.misses), (2, 1))
+
+        self.store.put_tweets([{'id_str': '5', 'text': 'a'}, None])
+        self.store.put_tweets([{'id_str': '5', 'text': 'b'}])
+        self.assertEqual(self.store.get_tweets(['5', '6']), {'5': {'id_str': '5', 'text': 'b'}})
+        self.store.delete_tweets(['5'])
+        self.assertEqual(self.store.get_tweets(['5']), {})
+
+    def test_screen_name_case(self):
+        self.store.put_users([{'id_str': '1', 'screen_name': 'zekroTJA'}])
+        self.assertIn('zekroTJA', self.store.get_users(screen_names=['ZEKROtja']))
+
+    def test_max_age(self):
+        self.store.put_tweets([{'id_str': '5'}])
+        time.sleep(0.02)
+        self.assertEqual(self.store.get_tweets(['5'], max_age=0.01), {})
+        self.assertIn('5', self.store.get_tweets(['5']))
+
+    def test_batches(self):
+        store = ObjectStore(self.path, batch_size=7)
+        store.put_tweets({'id_str': str(i)} for i in range(50))
+        self.assertEqual(len(store.get_tweets(range(60))), 50)
+        store.close()
+
+    def test_persistence(self):
+        self.store.put_tweets([{'id_str': '5'}])
+        other = ObjectStore(self.path)
+        self.assertIn('5', other.get_tweets(['5']))
+        other.close()
+
+    def test_threads(self):
+        def put(n):
+            self.store.put_tweets({'id_str': '{0}-{1}'.format(n, i)} for i in range(100))
+
+        threads = [threading.Thread(target=put, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        ids = ['{0}-{1}'.format(n, i) for n in range(8) for i in range(100)]
+        self.assertEqual(len(self.store.get_tweets(ids)), 800)
+
+    def test_client_users(self):
+        client = self.client()
+        self.store.put_users([{'id_str': '1', 'screen_name': 'user1'}])
+
+        users = client.users(ids=['1', '2'], screen_names=['User3'])
+        self.assertEqual(sorted(self.api.lookups()), [('users', [], ['User3']), ('users', ['2'], [])])
+        self.assertIsInstance(users['2'], User)
+        self.assertIs(users['2'], users['user2'])
+        self.assertEqual(users['1'].screen_name, 'user1')
+
+        self.assertEqual(client.user(screen_name='USER2').id_str, '2')
+        self.assertEqual(client.user(id=3).screen_name, 'User3')
+        self.assertEqual(len(self.api.lookups()), 2)
+
+    def test_client_statuses(self):
+        client = self.client()
+        self.store.put_tweets([{'id_str': '1', 'text': 'stored'}])
+
+        tweets = client.statuses(['1', '2', '404'])
+        self.assertEqual(tweets['1'].text, 'stored')
+        self.assertEqual(tweets['2'].text, 'tweet 2')
+        self.assertIsNone(tweets['404'])
+        self.assertEqual(self.api.lookups(), [('statuses', ['2', '404'])])
+
+        client.statuses(['1', '2'])
+        self.assertEqual(len(self.api.lookups()), 1)
+
+        # Written Tweets are requested again.
+        client.favorite('2')
+        client.statuses(['2'])
+        self.assertEqual(self.api.lookups()[-1], ('statuses', ['2']))
+
+    def test_client_forgets_status_after_write(self):
+        client = self.client()
+        answer = self.api.handler
+
+        def racing_read(req):
+            # A read completing during the write stores the
+            # Tweet as before the write.
+            if req.path == 'favorites/create.json':
+                client.statuses(['2'])
+            return answer(req)
+
+        self.api.handler = racing_read
+        client.favorite('2')
+        self.assertEqual(self.store.get_tweets(['2']), {})
+
+    def test_client_non_default_options(self):
+        client = self.client()
+        self.store.put_tweets([{'id_str': '1', 'text': 'stored'}])
+        self.store.put_users([{'id_str': '1', 'screen_name': 'user1'}])
+
+        tweets = client.statuses(['1'], include_entities=False)
+        self.assertEqual(tweets['1'].text, 'tweet 1')
+        users = client.users(ids=['1', '2'], include_entities=False)
+        self.assertEqual(self.api.lookups(), [('statuses', ['1']), ('users', ['1', '2'], [])])
+        self.assertIn('1', users)
+        self.assertEqual(self.store.get_tweets(['1'])['1']['text'], 'stored')
+        self.assertEqual(self.store.get_users(ids=['2']), {})
+
+    def test_client_projection(self):
+        client = self.client()
+        client.session()._projection = PROJECTION_RAW
+        tweets = client.statuses(['2'])
+        self.assertEqual(tweets['2'], {'id_str': '2', 'text': 'tweet 2'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import pickle
+import unittest
+
+from pytter.objects import Tweet
+
+
+TWEET = {
+    'id': 2,
+    'text': 'hello',
+    'user': {'id': 1, 'screen_name': 'zekroTJA', 'followers_count': 3},
+    'place': {'id': 'p', 'bounding_box': {'coordinates': [{'coordinates': [1, 2]}], 'type': 'Polygon'}},
+    'entities': {'hashtags': [{'text': 'pytter'}], 'media': [{'id': 5}]},
+    'extended_entities': {'media': [{'id': 5}]},
+}
+
+
+class ObjectsTest(unittest.TestCase):
+
+    def test_slotted(self):
+        tweet = Tweet(TWEET)
+        for obj in (tweet, tweet.user, tweet.user.stats, tweet.place,
+                tweet.place.bounding_box, tweet.place.bounding_box.coordinates[0],
+                tweet.entities, tweet.entities.media[0]):
+            self.assertFalse(hasattr(obj, '__dict__'), type(obj).__name__)
+
+    def test_attributes(self):
+        tweet = Tweet(TWEET)
+        self.assertEqual(tweet.id_str, '2')
+        self.assertEqual(tweet.user.username, 'zekroTJA')
+        self.assertEqual(tweet.user.stats.followers_count, 3)
+        self.assertEqual(tweet.place.bounding_box.coordinates[0].coordinates, [1, 2])
+        self.assertEqual(tweet.entities.hashtags, ['pytter'])
+        self.assertEqual(tweet.entities.media[0].id_str, '5')
+        self.assertIsNone(tweet.retweeted_status)
+
+    def test_lazy_fields(self):
+        tweet = Tweet(dict(TWEET, retweeted_status=dict(TWEET, id=3)))
+        self.assertFalse(hasattr(tweet, '_user'))
+        self.assertFalse(hasattr(tweet, '_entities'))
+        self.assertIs(tweet.user, tweet.user)
+        self.assertEqual(tweet.retweeted_status.id_str, '3')
+        self.assertEqual(tweet.retweeted_status.user.screen_name, 'zekroTJA')
+        self.assertIsNone(tweet.quote_status)
+        tweet.place = None
+        self.assertIsNone(tweet.place)
+
+    def test_lazy_fields_release_raw_data(self):
+        tweet = Tweet(TWEET)
+        self.assertNotIn('text', tweet._raw)
+        self.assertIn('user', tweet._raw)
+        tweet.user
+        self.assertNotIn('user', tweet._raw)
+        tweet.entities, tweet.place, tweet.coordinates
+        tweet.quote_status, tweet.retweeted_status
+        self.assertEqual(tweet._raw, {})
+        self.assertIn('user', TWEET)
+
+    def test_pickle(self):
+        tweet = pickle.loads(pickle.dumps(Tweet(TWEET)))
+        self.assertEqual(tweet.user.screen_name, 'zekroTJA')
+        self.assertEqual(tweet.entities.hashtags, ['pytter'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import time
+import threading
+import unittest
+
+from pytter import MediaProcessingException
+from pytter.objects import Media
+
+from tests.stubs import StubTransport, stub_session
+
+
+def payload(id: int, state: str = 'pending', check_after: float = 0.05, error: dict = None) -> dict:
+    info = {'state': state, 'check_after_secs': check_after}
+    if error:
+        info['error'] = error
+    return {'media_id': id, 'media_id_string': str(id), 'processing_info': info}
+
+
+def media(*args, **kwargs) -> Media:
+    return Media(payload(*args, **kwargs))
+
+
+class StatusApi(StubTransport):
+    """
+    Stub transport answering STATUS requests.
+    Media with ID n finishes processing on the n-th
+    check, media with ID 0 fails.
+    """
+
+    def __init__(self):
+        super().__init__(self.answer)
+        self.checks = []
+        self.threads = set()
+
+    def answer(self, req):
+        media_id = req.params['media_id']
+        self.checks.append((media_id, time.monotonic()))
+        self.threads.add(threading.get_ident())
+        count = sum(1 for id, _ in self.checks if id == media_id)
+        if media_id == '0':
+            return payload(0, 'failed', error={'name': 'InvalidMedia', 'message': 'unsupported'})
+        if count >= int(media_id):
+            return {'media_id': int(media_id), 'media_id_string': media_id,
+                'processing_info': {'state': 'succeeded', 'progress_percent': 100}}
+        return payload(int(media_id), 'in_progress')
+
+
+class ProcessingTest(unittest.TestCase):
+
+    def test_no_processing(self):
+        api = StatusApi()
+        session = stub_session(api)
+        image = Media({'media_id': 5, 'media_id_string': '5'})
+        self.assertIs(session.wait_for_processing(image), image)
+        self.assertEqual(api.checks, [])
+
+    def test_many_overlapping(self):
+        api = StatusApi()
+        session = stub_session(api)
+        start = time.monotonic()
+        done = session.wait_for_processing_many([media(3), media(1), media(2)])
+        elapsed = time.monotonic() - start
+
+        self.assertEqual([m.id_str for m in done], ['3', '1', '2'])
+        self.assertTrue(all(m.processing_info['state'] == 'succeeded' for m in done))
+        self.assertEqual(len(api.checks), 6)
+        # Three rounds of 0.05s instead of six sequential waits.
+        self.assertLess(elapsed, 0.25)
+
+    def test_check_after_secs(self):
+        api = StatusApi()
+        session = stub_session(api)
+        start = time.monotonic()
+        session.wait_for_processing(media(1, check_after=0.2))
+        self.assertGreaterEqual(api.checks[0][1] - start, 0.2)
+
+    def test_failed(self):
+        api = StatusApi()
+        session = stub_session(api)
+        with self.assertRaises(MediaProcessingException) as ctx:
+            session.wait_for_processing_many([media(2), media(0)])
+        self.assertEqual(ctx.exception.media_id, '0')
+        self.assertIn('unsupported', str(ctx.exception))
+
+    def test_timeout(self):
+        api = StatusApi()
+        session = stub_session(api)
+        with self.assertRaises(TimeoutError):
+            session.wait_for_processing(media(100), timeout=0.2)
+
+    def test_background(self):
+        api = StatusApi()
+        session = stub_session(api)
+        future = session.wait_for_processing_background([media(2), media(1)])
+        done = future.result(timeout=5)
+        self.assertEqual([m.id_str for m in done], ['2', '1'])
+        self.assertNotIn(threading.get_ident(), api.threads)
+
+
+if __name__ == '__main__':
+    unittest.main()
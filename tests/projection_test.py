@@ -0,0 +1,56 @@
+import unittest
+
+from pytter import User, PROJECTION_RAW, PROJECTION_OBJECTS
+from pytter.api.projection import projector
+
+from tests.stubs import StubTransport, stub_session
+
+
+USER = {'id': 1, 'id_str': '1', 'screen_name': 'zekroTJA', 'followers_count': 3,
+    'status': {'id_str': '2', 'text': 'hello'}}
+
+
+PAGES = {
+    '-1': {'users': [USER], 'next_cursor': 10},
+    '10': {'users': [dict(USER, id=4, id_str='4')], 'next_cursor': 0},
+}
+
+
+def answer(req):
+    if req.path == 'users/lookup.json':
+        return [USER]
+    return PAGES[str(req.params['cursor'])]
+
+
+class ProjectionTest(unittest.TestCase):
+
+    def test_projector(self):
+        factory = lambda r: User(r)
+        self.assertIs(projector(None, factory), factory)
+        self.assertIs(projector(PROJECTION_OBJECTS, factory), factory)
+        self.assertIsNone(projector(PROJECTION_RAW, factory))
+        project = projector(['id_str', 'status.text', 'missing.field'], factory)
+        self.assertEqual(project(USER), {'id_str': '1', 'status.text': 'hello', 'missing.field': None})
+        with self.assertRaises(ValueError):
+            projector('unknown', factory)
+
+    def test_users_lookup(self):
+        session = stub_session(StubTransport(answer))
+        users = session.users_lookup(ids=['1'])
+        self.assertIsInstance(users['1'], User)
+        users = session.users_lookup(ids=['1'], projection=PROJECTION_RAW)
+        self.assertIs(users['zekroTJA'], users['1'])
+        self.assertEqual(users['1']['followers_count'], 3)
+
+    def test_session_projection(self):
+        session = stub_session(StubTransport(answer), projection=['id_str', 'followers_count'])
+        self.assertEqual(session.followers_list(id='1'), [
+            {'id_str': '1', 'followers_count': 3},
+            {'id_str': '4', 'followers_count': 3},
+        ])
+        users = session.followers_list(id='1', projection=PROJECTION_OBJECTS)
+        self.assertEqual([u.id_str for u in users], ['1', '4'])
+
+
+if __name__ == '__main__':
+    unittest.main()
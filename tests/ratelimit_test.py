@@ -0,0 +1,77 @@
+import time
+import unittest
+
+from pytter import (
+    RateLimitLedger, RateLimitException, endpoint_key,
+    RATE_LIMIT_WAIT, RATE_LIMIT_RAISE, RATE_LIMIT_IGNORE
+)
+
+
+def headers(limit: int, remaining: int, reset: float) -> dict:
+    return {
+        'x-rate-limit-limit': str(limit),
+        'x-rate-limit-remaining': str(remaining),
+        'x-rate-limit-reset': str(reset),
+    }
+
+
+class RateLimitTest(unittest.TestCase):
+
+    def test_endpoint_key(self):
+        self.assertEqual(endpoint_key('/statuses/show.json'), 'statuses/show')
+        self.assertEqual(endpoint_key('statuses/retweet/123.json'), 'statuses/retweet/:id')
+        self.assertEqual(endpoint_key('media/upload'), 'media/upload')
+
+    def test_unknown_endpoint_passes(self):
+        ledger = RateLimitLedger(RATE_LIMIT_RAISE)
+        self.assertEqual(ledger.reserve('users/show'), 0)
+
+    def test_raise_before_exhaustion(self):
+        ledger = RateLimitLedger(RATE_LIMIT_RAISE)
+        ledger.update('users/show', headers(900, 2, time.time() + 60))
+        ledger.acquire('users/show')
+        ledger.acquire('users/show')
+        with self.assertRaises(RateLimitException):
+            ledger.acquire('users/show')
+
+    def test_wait_until_reset(self):
+        ledger = RateLimitLedger(RATE_LIMIT_WAIT)
+        ledger.update('users/show', headers(900, 0, time.time() + 0.2))
+        start = time.time()
+        ledger.acquire('users/show')
+        self.assertGreaterEqual(time.time() - start, 0.1)
+
+    def test_refill_starts_next_window(self):
+        ledger = RateLimitLedger(RATE_LIMIT_RAISE)
+        ledger.update('users/show', headers(2, 0, time.time() - 1))
+        ledger.acquire('users/show')
+        ledger.acquire('users/show')
+        with self.assertRaises(RateLimitException):
+            ledger.acquire('users/show')
+        self.assertGreater(ledger.reset_in('users/show'), 60)
+
+    def test_ignore(self):
+        ledger = RateLimitLedger(RATE_LIMIT_IGNORE)
+        ledger.update('users/show', headers(900, 0, time.time() + 60))
+        self.assertEqual(ledger.reserve('users/show'), 0)
+
+    def test_update_keeps_reservations(self):
+        ledger = RateLimitLedger(RATE_LIMIT_RAISE)
+        reset = time.time() + 60
+        ledger.update('users/show', headers(900, 10, reset))
+        ledger.acquire('users/show')
+        ledger.acquire('users/show')
+        ledger.update('users/show', headers(900, 9, reset))
+        self.assertEqual(ledger.get('users/show').remaining, 8)
+
+    def test_exhaust(self):
+        ledger = RateLimitLedger(RATE_LIMIT_RAISE)
+        ledger.exhaust('users/show', time.time() + 60)
+        with self.assertRaises(RateLimitException):
+            ledger.acquire('users/show')
+        ledger.exhaust('users/show', time.time() - 1)
+        ledger.acquire('users/show')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+import time
+import unittest
+
+from pytter import ResponseCache, NegativeCache, NoneResponseException, RequestFailedException, request_tags
+
+from tests.stubs import StubTransport, StubResponse, stub_session
+
+
+class CountingApi(StubTransport):
+    """
+    Stub transport answering the requested
+    Tweets and Users.
+    """
+
+    def __init__(self):
+        super().__init__(self.answer)
+
+    def answer(self, req):
+        params = req.params or req.data
+        if req.path == 'users/show.json':
+            id = str(params.get('user_id', 1))
+            return {'id': int(id), 'id_str': id, 'screen_name': params.get('screen_name')}
+        if req.path == 'statuses/show.json' and str(params['id']).startswith('40'):
+            return StubResponse(int(str(params['id'])[:3]), {'errors': []})
+        if req.path == 'statuses/show.json':
+            return {'id': int(params['id']), 'id_str': str(params['id']),
+                'favorite_count': len(self.requests)}
+        if req.path == 'statuses/lookup.json':
+            return {'id': {id: ({'id_str': id} if not id.startswith('dead') else None)
+                for id in params['id'].split(',')}}
+        return {'id': 1, 'id_str': '1'}
+
+
+# Keeps the verify_credentials request of the
+# session creation out of the cache.
+TTLS = {'account/verify_credentials': 0}
+
+
+def counting_session(**kwargs):
+    api = CountingApi()
+    return stub_session(api, **kwargs), api
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        cache = ResponseCache(ttls=TTLS)
+        session, api = counting_session(response_cache=cache)
+        for _ in range(3):
+            self.assertEqual(session.users_show(id='5').id_str, '5')
+        session.users_show(screen_name='zekro')
+        self.assertEqual(len(api.requests), 2)
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (2, 2))
+        self.assertEqual(cache.stats.hits_by_endpoint, {'users/show': 2})
+        self.assertEqual(cache.stats.hit_ratio, 0.5)
+
+    def test_uncached_endpoints(self):
+        session, api = counting_session(response_cache=ResponseCache(ttls={'users/show': 0}))
+        session.users_show(id='5')
+        session.users_show(id='5')
+        session.request('GET', 'followers/ids.json', params={'cursor': -1})
+        session.request('GET', 'followers/ids.json', params={'cursor': -1})
+        self.assertEqual(len(api.requests), 4)
+
+    def test_ttl(self):
+        cache = ResponseCache(ttls={'users/show': 0.05})
+        session, api = counting_session(response_cache=cache)
+        session.users_show(id='5')
+        time.sleep(0.06)
+        session.users_show(id='5')
+        self.assertEqual(len(api.requests), 2)
+        self.assertEqual(cache.stats.expirations, 1)
+
+    def test_lru(self):
+        cache = ResponseCache(max_entries=2, ttls=TTLS)
+        session, api = counting_session(response_cache=cache)
+        session.users_show(id='1')
+        session.users_show(id='2')
+        session.users_show(id='1')
+        session.users_show(id='3')
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats.evictions, 1)
+        session.users_show(id='1')
+        session.users_show(id='2')
+        # 2 was evicted, 1 was kept as recently used.
+        self.assertEqual(len(api.requests), 4)
+
+    def test_write_invalidation(self):
+        cache = ResponseCache()
+        session, api = counting_session(response_cache=cache)
+        writes = (
+            lambda: session.favorites_create('7'),
+            lambda: session.favorites_destroy('7'),
+            lambda: session.statuses_retweet('7'),
+            lambda: session.statuses_unretweet('7'),
+            lambda: session.statuses_destroy('7'),
+        )
+        for write in writes:
+            before = session.statuses_show('7').favorite_count
+            session.statuses_lookup(['7', '8'])
+            session.statuses_show('8')
+            self.assertEqual(session.statuses_show('7').favorite_count, before)
+            requests = len(api.requests)
+
+            write()
+            self.assertGreater(session.statuses_show('7').favorite_count, before)
+            session.statuses_lookup(['7', '8'])
+            session.statuses_show('8')
+            # show(7), the write and lookup([7, 8]) are requested again.
+            self.assertEqual(len(api.requests), requests + 3)
+        self.assertEqual(cache.stats.invalidations, 10)
+
+    def test_write_during_read(self):
+        cache = ResponseCache(ttls=TTLS)
+        session, api = counting_session(response_cache=cache)
+        answer = api.handler
+
+        def write_while_reading(req):
+            res = answer(req)
+            if req.path == 'statuses/show.json' and len(api.requests) == 1:
+                # The write completes after the show
+                # was answered, but before it is stored.
+                session.favorites_create('7')
+            return res
+
+        api.handler = write_while_reading
+        session.statuses_show('7')
+        self.assertEqual(len(cache), 0)
+        session.statuses_show('7')
+        session.statuses_show('7')
+        self.assertEqual(len(api.requests), 3)
+
+    def test_invalidated_tags_are_bounded(self):
+        cache = ResponseCache(max_entries=2)
+        generation = cache.generation()
+        for id in range(3):
+            cache.invalidate(['tweet:{}'.format(id)])
+        # The tag of the first write is forgotten,
+        # so its generation covers all tags.
+        cache.set('statuses/show', 'a', {'id': 1}, ['tweet:9'], generation)
+        self.assertEqual(len(cache), 0)
+        cache.set('statuses/show', 'a', {'id': 1}, ['tweet:9'], cache.generation())
+        self.assertEqual(len(cache), 1)
+
+    def test_copies(self):
+        cache = ResponseCache()
+        res = {'id': 1, 'entities': {'urls': []}}
+        cache.set('statuses/show', 'a', res)
+        res['id'] = 2
+        first = cache.get('statuses/show', 'a')
+        first['entities']['urls'].append('x')
+        self.assertEqual(cache.get('statuses/show', 'a'), {'id': 1, 'entities': {'urls': []}})
+
+    def test_request_tags(self):
+        self.assertEqual(request_tags('users/lookup', 'users/lookup.json',
+            {'user_id': '1,2', 'screen_name': 'Zekro'}), ['user:1', 'user:2', 'user:@zekro'])
+        self.assertEqual(request_tags('statuses/retweet/:id', 'statuses/retweet/9.json', {}),
+            ['tweet:9'])
+        self.assertEqual(request_tags('followers/ids', 'followers/ids.json', {'user_id': 1}), [])
+
+
+class NegativeCacheTest(unittest.TestCase):
+
+    def test_lookup(self):
+        negative = NegativeCache()
+        session, api = counting_session(negative_cache=negative)
+        tweets = session.statuses_lookup(['1', 'dead1', 'dead2'])
+        self.assertIsNone(tweets['dead1'])
+        self.assertEqual(len(negative), 2)
+
+        tweets = session.statuses_lookup(['1', 'dead1'])
+        self.assertEqual(api.requests[-1].path, 'statuses/lookup.json')
+        self.assertEqual(set(tweets), {'1', 'dead1'})
+        self.assertIsNone(tweets['dead1'])
+
+        # Only cached IDs are resolved without a request.
+        session.statuses_lookup(['dead1', 'dead2'])
+        self.assertEqual(len(api.requests), 2)
+        with self.assertRaises(NoneResponseException):
+            session.statuses_lookup(['1', 'dead1'], raise_on_none=True)
+        self.assertEqual(len(api.requests), 2)
+
+    def test_bulk_batches(self):
+        negative = NegativeCache()
+        negative.add(['dead{}'.format(i) for i in range(100)])
+        session, api = counting_session(negative_cache=negative)
+        ids = ['dead{}'.format(i) for i in range(100)] + [str(i) for i in range(100)]
+        tweets = session.statuses_lookup_bulk(ids)
+        # The cached IDs are left out, so one batch is enough.
+        self.assertEqual(len(api.requests), 1)
+        self.assertEqual(len(tweets), 200)
+        self.assertEqual(sum(1 for t in tweets.values() if t is None), 100)
+        self.assertEqual(negative.hits, 100)
+
+    def test_show(self):
+        negative = NegativeCache()
+        session, api = counting_session(negative_cache=negative)
+        for _ in range(2):
+            with self.assertRaises(RequestFailedException) as ctx:
+                session.statuses_show('403')
+            self.assertEqual(ctx.exception.status_code, 403)
+        with self.assertRaises(RequestFailedException):
+            session.statuses_show('405')
+        with self.assertRaises(RequestFailedException):
+            session.statuses_show('405')
+        # 405 is no negative status code.
+        self.assertEqual(len(api.requests), 3)
+
+    def test_ttl_and_size(self):
+        negative = NegativeCache(ttl=0.05, max_entries=2)
+        negative.add(['1', '2', '3'])
+        self.assertEqual(len(negative), 2)
+        self.assertIsNone(negative.get('1'))
+        self.assertEqual(negative.get('3'), 404)
+        time.sleep(0.06)
+        self.assertEqual(negative.partition(['2', '3']), (['2', '3'], []))
+        negative.add(['4'], 403)
+        negative.invalidate(['4'])
+        self.assertIsNone(negative.get('4'))
+
+
+if __name__ == '__main__':
+    unittest.main()
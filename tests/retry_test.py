@@ -0,0 +1,58 @@
+import time
+import unittest
+
+from pytter import RetryPolicy, RateLimitException, RequestFailedException
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = RetryPolicy(max_retries=2, backoff_base=0.01, jitter=False)
+
+    def test_transient_get_is_retried(self):
+        calls = []
+        def fn():
+            calls.append(1)
+            if len(calls) < 3:
+                raise RequestFailedException(503)
+            return 'ok'
+        self.assertEqual(self.policy.call(fn, 'GET', 'users/show'), 'ok')
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.policy.stats.retries, 2)
+        self.assertEqual(self.policy.stats.by_endpoint, {'users/show': 2})
+
+    def test_gives_up_after_max_retries(self):
+        def fn():
+            raise ConnectionError()
+        with self.assertRaises(ConnectionError):
+            self.policy.call(fn, 'GET', 'users/show')
+        self.assertEqual(self.policy.stats.retries, 2)
+        self.assertEqual(self.policy.stats.failures, 1)
+
+    def test_non_idempotent_is_not_retried(self):
+        exc = RequestFailedException(503)
+        self.assertIsNone(self.policy.retry_delay(exc, 'POST', 'statuses/update', 0))
+        self.assertIsNotNone(self.policy.retry_delay(exc, 'POST', 'media/upload', 0))
+
+    def test_client_errors_are_not_retried(self):
+        exc = RequestFailedException(404)
+        self.assertIsNone(self.policy.retry_delay(exc, 'GET', 'users/show', 0))
+
+    def test_retry_after(self):
+        exc = RequestFailedException(503, headers={'Retry-After': '7'})
+        self.assertEqual(self.policy.retry_delay(exc, 'GET', 'users/show', 0), 7.0)
+
+    def test_rate_limit_reset(self):
+        exc = RateLimitException(reset=time.time() + 30)
+        delay = self.policy.retry_delay(exc, 'POST', 'statuses/update', 0)
+        self.assertAlmostEqual(delay, 30, delta=1)
+        exc = RateLimitException(reset=time.time() + 3600)
+        self.assertIsNone(self.policy.retry_delay(exc, 'GET', 'users/show', 0))
+
+    def test_exponential_backoff(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=5, jitter=False)
+        self.assertEqual([policy.backoff(i) for i in range(4)], [1, 2, 4, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
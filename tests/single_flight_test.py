@@ -0,0 +1,102 @@
+import time
+import asyncio
+import unittest
+import threading
+
+from pytter import SingleFlight, AsyncSingleFlight
+
+from tests.stubs import StubTransport, stub_session
+
+
+def slow_users(req):
+    time.sleep(0.05)
+    return {'id_str': str(req.params.get('user_id')), 'screen_name': 'u'}
+
+
+def run_threads(n, fn):
+    results = [None] * n
+    barrier = threading.Barrier(n)
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = fn(i)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def test_shared_result(self):
+        flight = SingleFlight()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.05)
+            return len(calls)
+
+        results = run_threads(8, lambda i: flight.do('key', fn))
+        self.assertEqual(results, [1] * 8)
+        self.assertEqual((flight.executed, flight.shared), (1, 7))
+        self.assertEqual(len(flight), 0)
+
+        # Completed calls are not reused.
+        self.assertEqual(flight.do('key', fn), 2)
+
+    def test_shared_exception(self):
+        flight = SingleFlight()
+
+        def fn():
+            time.sleep(0.05)
+            raise ValueError('failed')
+
+        results = run_threads(4, lambda i: flight.do('key', fn))
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertEqual(flight.executed, 1)
+        self.assertEqual(len(flight), 0)
+
+    def test_session(self):
+        api = StubTransport(slow_users)
+        session = stub_session(api, coalesce_requests=True)
+        users = run_threads(10, lambda i: session.users_show(id=str(i % 2)))
+        self.assertEqual([u.id_str for u in users], [str(i % 2) for i in range(10)])
+        self.assertEqual(len(api.requests), 2)
+        self.assertEqual(session.single_flight().shared, 8)
+
+    def test_session_disabled(self):
+        api = StubTransport(slow_users)
+        session = stub_session(api)
+        run_threads(4, lambda i: session.users_show(id='1'))
+        self.assertEqual(len(api.requests), 4)
+
+    def test_async(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return len(calls)
+
+        async def run():
+            waiter = asyncio.ensure_future(flight.do('key', fn))
+            await asyncio.sleep(0)
+            # Cancelling the first caller keeps the call running.
+            waiter.cancel()
+            return await asyncio.gather(*[flight.do('key', fn) for _ in range(5)])
+
+        self.assertEqual(asyncio.run(run()), [1] * 5)
+        self.assertEqual((flight.executed, flight.shared), (1, 5))
+        self.assertEqual(len(flight), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from pytter import IdSet, SnapshotStore, SNAPSHOT_FRIENDS, diff_sorted
+from pytter.api import snapshots
+
+
+class SnapshotStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(self.dir.name)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_save_and_diff(self):
+        first = self.store.save('zekro', IdSet([5, 1, 3]), timestamp=1)
+        self.assertEqual(list(first.gained), [1, 3, 5])
+        self.assertEqual(list(first.lost), [])
+
+        second = self.store.save('zekro', IdSet([1, 4, 5, 2 ** 64 - 1]), timestamp=2)
+        self.assertEqual(list(second.gained), [4, 2 ** 64 - 1])
+        self.assertEqual(list(second.lost), [3])
+        self.assertEqual(second.total, 4)
+
+        self.assertEqual(list(self.store.load('zekro')), [1, 4, 5, 2 ** 64 - 1])
+        pending = self.store.diff('zekro', IdSet([1, 6]))
+        self.assertEqual((list(pending.gained), list(pending.lost)), ([6], [4, 5, 2 ** 64 - 1]))
+        self.assertEqual(len(self.store.load('zekro')), 4)
+
+    def test_history(self):
+        for i, ids in enumerate(([1, 2, 3], [2, 3, 4], [], [7])):
+            self.store.save('@zekro', IdSet(ids), timestamp=i)
+        history = list(self.store.history('@zekro'))
+        self.assertEqual([d.timestamp for d in history], [0, 1, 2, 3])
+        self.assertEqual([(list(d.gained), list(d.lost)) for d in history],
+            [([1, 2, 3], []), ([4], [1]), ([], [2, 3, 4]), ([7], [])])
+        self.assertEqual(list(self.store.snapshot_at('@zekro', 1)), [2, 3, 4])
+        self.assertEqual(list(self.store.snapshot_at('@zekro', -1)), [7])
+        with self.assertRaises(IndexError):
+            self.store.snapshot_at('@zekro', 4)
+
+    def test_torn_history_entry(self):
+        self.store.save('zekro', IdSet([1, 2]), timestamp=0)
+        ids_path = self.store._path('zekro', 'followers', 'ids')
+        with open(ids_path, 'rb') as f:
+            snapshot = f.read()
+        self.store.save('zekro', IdSet([2, 3]), timestamp=1)
+        path = self.store._path('zekro', 'followers', 'history')
+        with open(path, 'rb') as f:
+            data = f.read()
+        # Simulates a crash while appending the second entry,
+        # before the snapshot of the first one was replaced.
+        with open(path, 'wb') as f:
+            f.write(data[:-5])
+        with open(ids_path, 'wb') as f:
+            f.write(snapshot)
+        self.assertEqual([d.timestamp for d in self.store.history('zekro')], [0])
+
+        self.store.save('zekro', IdSet([3]), timestamp=2)
+        self.assertEqual([d.timestamp for d in self.store.history('zekro')], [0, 2])
+
+    def test_uncommitted_history_entry(self):
+        self.store.save('zekro', IdSet([1, 2]), timestamp=0)
+        # Simulates a crash after appending the second entry,
+        # but before its snapshot replaced the first one.
+        with mock.patch.object(snapshots.os, 'replace', side_effect=OSError('crash')):
+            with self.assertRaises(OSError):
+                self.store.save('zekro', IdSet([2, 3]), timestamp=1)
+        self.assertEqual([d.timestamp for d in self.store.history('zekro')], [0])
+
+        diff = self.store.save('zekro', IdSet([3]), timestamp=2)
+        self.assertEqual((list(diff.gained), list(diff.lost)), ([3], [1, 2]))
+        self.assertEqual([d.timestamp for d in self.store.history('zekro')], [0, 2])
+        self.assertEqual(list(self.store.snapshot_at('zekro', -1)), [3])
+
+    def test_big_endian(self):
+        with mock.patch.object(snapshots, 'sys', mock.Mock(byteorder='big')):
+            self.store.save('zekro', IdSet([1, 2 ** 40]))
+            diff = self.store.save('zekro', IdSet([2 ** 40, 7]))
+            self.assertEqual((list(diff.gained), list(diff.lost)), ([7], [1]))
+            self.assertEqual(list(self.store.load('zekro')), [7, 2 ** 40])
+            self.assertEqual(list(self.store.snapshot_at('zekro', -1)), [7, 2 ** 40])
+
+    def test_kinds(self):
+        self.store.save('zekro', IdSet([1]))
+        self.store.save('zekro', IdSet([2]), SNAPSHOT_FRIENDS)
+        self.assertEqual(list(self.store.load('zekro')), [1])
+        self.assertEqual(list(self.store.load('zekro', SNAPSHOT_FRIENDS)), [2])
+        self.assertEqual(list(self.store.load('unknown')), [])
+        self.assertEqual(list(self.store.history('unknown')), [])
+        with self.assertRaises(ValueError):
+            self.store.load('zekro', 'likes')
+
+    def test_diff_sorted(self):
+        old, new = IdSet(range(0, 1000, 2)), IdSet(range(0, 1000, 3))
+        gained, lost = diff_sorted(old.ids, new.ids, block_size=7)
+        self.assertEqual(gained, new - old)
+        self.assertEqual(lost, old - new)
+
+    def test_pure_python(self):
+        with mock.patch.object(snapshots, 'numpy', None):
+            self.test_save_and_diff()
+            self.test_diff_sorted()
+
+
+if __name__ == '__main__':
+    unittest.main()
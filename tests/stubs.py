@@ -0,0 +1,121 @@
+import json
+import threading
+from typing import Callable, NamedTuple
+from unittest import mock
+from urllib.parse import urlsplit
+
+from requests.structures import CaseInsensitiveDict
+
+from pytter import APISession, Client, Credentials
+
+
+CREDENTIALS = Credentials('ck', 'cs', 'atk', 'ats')
+
+ME = {'id': 1, 'id_str': '1', 'screen_name': 'me'}
+
+
+class StubRequest(NamedTuple):
+    """
+    Request received by a `StubTransport`. `path` is the
+    resource path without API version, like
+    `'users/show.json'`, and `body` the content of raw
+    request bodies, like multipart encoded segments.
+    """
+
+    method: str
+    path: str
+    params: dict
+    data: dict
+    body: bytes
+
+
+class StubResponse:
+    """
+    Response of a `StubTransport` with the attributes
+    of `requests.Response` used by the sessions.
+    """
+
+    def __init__(self, status_code: int = 200, body: object = None, headers: dict = None):
+        self.status_code = status_code
+        self.content = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.headers = CaseInsensitiveDict(headers or {})
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode()
+
+
+class StubTransport:
+    """
+    Stands in for the `requests.Session` of an APISession.
+    Each request is recorded in `requests` and passed to
+    `handler`, which returns the response body as object
+    to be JSON encoded or a `StubResponse`.
+    `account/verify_credentials.json`, requested when a
+    session is created, is answered with `ME`.
+    """
+
+    def __init__(self, handler: Callable[[StubRequest], object] = None):
+        self.handler = handler or (lambda req: {})
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def request(self, method: str, url: str, params: dict = None, data=None, **kwargs) -> StubResponse:
+        path = urlsplit(url).path.lstrip('/')
+        if path.startswith('1.1/'):
+            path = path[4:]
+
+        body = None
+        if hasattr(data, 'read'):
+            body, data = data.read(), None
+
+        if path == 'account/verify_credentials.json':
+            return StubResponse(body=ME)
+
+        req = StubRequest(method, path, dict(params or {}), dict(data or {}), body)
+        with self.lock:
+            self.requests.append(req)
+
+        res = self.handler(req)
+        return res if isinstance(res, StubResponse) else StubResponse(body=res)
+
+    def get(self, url: str, **kwargs) -> StubResponse:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> StubResponse:
+        return self.request('POST', url, **kwargs)
+
+    def paths(self) -> list:
+        """
+        Returns the paths of the recorded requests.
+        """
+
+        with self.lock:
+            return [req.path for req in self.requests]
+
+
+def stub_session(transport: StubTransport = None, session_class: type = APISession,
+    credentials: Credentials = CREDENTIALS, **kwargs) -> APISession:
+    """
+    Creates a session of `session_class` with the passed
+    arguments, which sends its requests to `transport`.
+    """
+
+    transport = transport or StubTransport()
+    with mock.patch('pytter.api.api.requests.Session', return_value=transport):
+        return session_class(credentials, **kwargs)
+
+
+def stub_client(transport: StubTransport = None, **kwargs) -> Client:
+    """
+    Creates a Client with the passed arguments,
+    which sends its requests to `transport`.
+    """
+
+    transport = transport or StubTransport()
+    with mock.patch('pytter.api.api.requests.Session', return_value=transport):
+        return Client(CREDENTIALS, **kwargs)
@@ -0,0 +1,324 @@
+import io
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pytter import (APISession, AdaptiveChunkSizer, ParameterOutOfBoundsException,
+    RequestFailedException, RetryPolicy, UploadCancelledException)
+from pytter.utils import FileInfo, utils
+
+from tests.stubs import StubTransport, StubResponse, stub_session
+
+
+DATA = b'0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+class MediaHandler(BaseHTTPRequestHandler):
+    """
+    Serves DATA as /media.mp4 and, without
+    Content-Length, as /chunked.mp4.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'video/mp4')
+        if self.path == '/media.mp4':
+            self.send_header('Content-Length', str(len(DATA)))
+        else:
+            self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(DATA)))
+        self.end_headers()
+        for i in range(0, len(DATA), 5):
+            self.wfile.write(DATA[i:i + 5])
+            self.wfile.flush()
+
+
+class SmallChunkSession(APISession):
+    """
+    APISession uploading segments of 4 bytes.
+    """
+
+    UPLOAD_CHUNK_SIZE = 4
+
+
+class UploadApi(StubTransport):
+    """
+    Stub transport of media/upload recording the
+    received segments. Segments with an index in
+    `fail_segments` fail with status `fail_status`
+    as often as given.
+    """
+
+    def __init__(self, fail_segments: dict = {}, fail_status: int = 503):
+        super().__init__(self.answer)
+        self.fail_segments = dict(fail_segments)
+        self.fail_status = fail_status
+        self.attempts = {}
+        self.segments = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.finalized_with = None
+
+    def answer(self, req):
+        command = req.data.get('command')
+        if command == 'INIT':
+            return {'media_id': 7, 'media_id_string': '7'}
+        if command == 'FINALIZE':
+            self.finalized_with = sorted(self.segments)
+            return {'media_id': 7, 'media_id_string': '7'}
+
+        index = int(req.body.rsplit(b'name="segment_index"\r\n\r\n', 1)[1].split(b'\r\n')[0])
+        with self.lock:
+            self.attempts[index] = self.attempts.get(index, 0) + 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        threading.Event().wait(0.01)
+        with self.lock:
+            self.in_flight -= 1
+            if self.fail_segments.get(index):
+                self.fail_segments[index] -= 1
+                return StubResponse(self.fail_status, b'')
+            self.segments[index] = req.body.split(b'application/octet-stream\r\n\r\n', 1)[1].rsplit(b'\r\n--', 2)[0]
+        return StubResponse(204, b'')
+
+
+class AttachmentApi(UploadApi):
+    """
+    UploadApi using the file size as media ID,
+    delaying the upload of small files, so they
+    finish last.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.init_threads = set()
+
+    def answer(self, req):
+        command = req.data.get('command')
+        if command == 'INIT':
+            size = req.data['total_bytes']
+            if size == 0:
+                return StubResponse(400, b'')
+            threading.Event().wait(0.1 / size)
+            with self.lock:
+                self.init_threads.add(threading.get_ident())
+            return {'media_id': size, 'media_id_string': str(size)}
+        if command == 'FINALIZE':
+            return {'media_id': req.data['media_id'], 'media_id_string': str(req.data['media_id'])}
+        return StubResponse(204, b'')
+
+
+class StoppingApi(AttachmentApi):
+    """
+    AttachmentApi failing the INIT of empty files
+    after a delay and recording the APPENDs and
+    FINALIZEs of the other files.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.appends = 0
+        self.finalized = []
+
+    def answer(self, req):
+        command = req.data.get('command')
+        if command == 'INIT':
+            if req.data['total_bytes'] == 0:
+                threading.Event().wait(0.05)
+        elif command == 'FINALIZE':
+            self.finalized.append(req.data['media_id'])
+        else:
+            threading.Event().wait(0.02)
+            with self.lock:
+                self.appends += 1
+        return super().answer(req)
+
+
+def upload_session(api: UploadApi, **kwargs) -> APISession:
+    return stub_session(api, session_class=SmallChunkSession, **kwargs)
+
+
+class UploadTest(unittest.TestCase):
+
+    DATA = DATA
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), MediaHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.uri = 'http://127.0.0.1:{}'.format(cls.server.server_address[1])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def file_info(self) -> FileInfo:
+        return FileInfo(io.BytesIO(self.DATA), 'data.bin')
+
+    def test_concurrent_segments(self):
+        api = UploadApi()
+        session = upload_session(api)
+        media = session.upload_file_cunked(self.file_info(), workers=3)
+        self.assertEqual(media.id_str, '7')
+        self.assertEqual(api.finalized_with, list(range(9)))
+        self.assertEqual(b''.join(api.segments[i] for i in range(9)), self.DATA)
+        self.assertLessEqual(api.max_in_flight, 3)
+        self.assertGreater(api.max_in_flight, 1)
+
+    def test_failed_segment_is_retried(self):
+        api = UploadApi(fail_segments={4: 2})
+        session = upload_session(api)
+        session.upload_file_cunked(self.file_info(), workers=2)
+        self.assertEqual(api.finalized_with, list(range(9)))
+
+    def test_retried_segment_body(self):
+        api = UploadApi(fail_segments={4: 1})
+        session = upload_session(api, retry_policy=RetryPolicy(backoff_base=0, jitter=False))
+        session.upload_file_cunked(self.file_info(), workers=2)
+        self.assertEqual(api.finalized_with, list(range(9)))
+        self.assertEqual(session.retry_policy().stats.retries, 1)
+        bodies = [req.body for req in api.requests if req.body and b'name="segment_index"\r\n\r\n4' in req.body]
+        self.assertEqual(len(bodies), 2)
+        self.assertEqual(bodies[0], bodies[1])
+
+    def test_failed_segment_aborts_upload(self):
+        api = UploadApi(fail_segments={4: 3})
+        session = upload_session(api)
+        with self.assertRaises(RequestFailedException):
+            session.upload_file_cunked(self.file_info(), workers=2)
+        self.assertIsNone(api.finalized_with)
+
+    def test_client_error_is_not_retried(self):
+        api = UploadApi(fail_segments={4: 1}, fail_status=400)
+        session = upload_session(api)
+        with self.assertRaises(RequestFailedException):
+            session.upload_file_cunked(self.file_info(), workers=2)
+        self.assertEqual(api.attempts[4], 1)
+
+    def test_retry_policy_owns_segment_retries(self):
+        api = UploadApi(fail_segments={4: 5})
+        session = upload_session(api, retry_policy=RetryPolicy(max_retries=2, backoff_base=0, jitter=False))
+        with self.assertRaises(RequestFailedException):
+            session.upload_file_cunked(self.file_info(), workers=2)
+        self.assertEqual(api.attempts[4], 3)
+
+    def test_adaptive_segments(self):
+        sizer = AdaptiveChunkSizer(initial_size=4, min_size=4, max_size=16, target_duration=1)
+        api = UploadApi()
+        session = upload_session(api, chunk_sizer=sizer)
+        session.upload_file_cunked(self.file_info())
+        sizes = [m.size for m in sizer.history]
+        self.assertEqual(sizes, [4, 8, 16, 8])
+        self.assertEqual(api.finalized_with, list(range(4)))
+        self.assertEqual(b''.join(api.segments[i] for i in range(4)), self.DATA)
+        self.assertGreater(sizer.throughput, 0)
+
+    def test_too_large_for_segments(self):
+        sizer = AdaptiveChunkSizer(initial_size=4, min_size=4, max_size=4)
+        api = UploadApi()
+        session = upload_session(api, chunk_sizer=sizer)
+        with mock.patch.object(AdaptiveChunkSizer, 'MAX_SEGMENTS', 8):
+            with self.assertRaises(ParameterOutOfBoundsException):
+                session.upload_file_cunked(self.file_info())
+        self.assertEqual(api.requests, [])
+
+    def test_probe_url(self):
+        file_info = utils.probe_url(self.uri + '/media.mp4')
+        self.assertEqual(file_info.size, len(self.DATA))
+        self.assertEqual(file_info.mime_type, 'video/mp4')
+        self.assertEqual(file_info.file_name, 'media.mp4')
+        self.assertIsNone(utils.probe_url(self.uri + '/chunked.mp4'))
+
+    def test_stream_url_chunks(self):
+        file_info = utils.probe_url(self.uri + '/media.mp4')
+        chunks = list(utils.stream_url_chunks(file_info, 8, max_pending=1))
+        self.assertEqual([c.index for c in chunks], [0, 1, 2, 3, 4])
+        self.assertEqual([c.size for c in chunks], [8, 8, 8, 8, 4])
+        self.assertEqual(b''.join(c.data for c in chunks), self.DATA)
+
+    def test_stream_url_adaptive_chunks(self):
+        file_info = utils.probe_url(self.uri + '/media.mp4')
+        sizes = iter([4, 16, 8])
+        chunks = list(utils.stream_url_chunks(file_info, lambda index, remaining: next(sizes, 8)))
+        self.assertEqual([(c.index, c.offset, c.size) for c in chunks],
+            [(0, 0, 4), (1, 4, 16), (2, 20, 8), (3, 28, 8)])
+        self.assertEqual(b''.join(c.data for c in chunks), self.DATA)
+
+    def test_stream_url_size_mismatch(self):
+        file_info = utils.RemoteFileInfo(self.uri + '/media.mp4', len(self.DATA) + 1)
+        with self.assertRaises(Exception):
+            list(utils.stream_url_chunks(file_info, 8))
+
+    def test_pipelined_upload(self):
+        api = UploadApi()
+        session = upload_session(api)
+        media = list(session.upload_attachments([self.uri + '/media.mp4'], pipelined=True))
+        self.assertEqual(media[0].id_str, '7')
+        self.assertEqual(api.finalized_with, list(range(9)))
+        self.assertEqual(b''.join(api.segments[i] for i in range(9)), self.DATA)
+
+    def test_attachments_order(self):
+        api = AttachmentApi()
+        session = upload_session(api)
+        files = [FileInfo(io.BytesIO(b'x' * n), 'image.png') for n in (1, 2, 3)]
+        media = list(session.upload_attachments(files))
+        self.assertEqual([m.id_str for m in media], ['1', '2', '3'])
+        self.assertEqual(len(api.init_threads), 3)
+
+    def test_attachments_failure(self):
+        api = AttachmentApi()
+        session = upload_session(api)
+        files = [FileInfo(io.BytesIO(b'x' * n), 'image.png') for n in (1, 0)]
+        with self.assertRaises(RequestFailedException):
+            list(session.upload_attachments(files))
+
+        # Files opened by upload_attachments are closed.
+        opened = []
+        def try_get_file(media):
+            opened.append(get_file(media))
+            return opened[-1]
+
+        get_file = utils.try_get_file
+        with tempfile.TemporaryDirectory() as dir:
+            paths = [os.path.join(dir, '{}.png'.format(n)) for n in (1, 0)]
+            for n, path in zip((1, 0), paths):
+                with open(path, 'wb') as f:
+                    f.write(b'x' * n)
+            with mock.patch.object(utils, 'try_get_file', try_get_file):
+                with self.assertRaises(RequestFailedException):
+                    list(session.upload_attachments(paths))
+        self.assertEqual(len(opened), 2)
+        self.assertTrue(all(f.handler.closed for f in opened))
+
+    def test_attachments_failure_stops_uploads(self):
+        api = StoppingApi()
+        session = upload_session(api)
+        files = [FileInfo(io.BytesIO(b'x' * n), 'image.png') for n in (40, 0)]
+        with self.assertRaises(RequestFailedException):
+            list(session.upload_attachments(files))
+        # The 10 segments of the other file are not all uploaded.
+        self.assertLess(api.appends, 10)
+        self.assertEqual(api.finalized, [])
+
+        stop = threading.Event()
+        stop.set()
+        with self.assertRaises(UploadCancelledException):
+            session.upload_file_cunked(files[0], stop=stop)
+        self.assertLess(api.appends, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
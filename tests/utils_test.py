@@ -0,0 +1,83 @@
+import io
+import os
+import email
+import tempfile
+import unittest
+
+from pytter.utils import utils, FileInfo, FileRange, MultipartEncoder
+
+
+class UtilsTest(unittest.TestCase):
+
+    def test_json_loads(self):
+        self.assertEqual(utils.json_loads(b'{"id": 1, "ids": ["2"]}'), {'id': 1, 'ids': ['2']})
+        self.assertEqual(utils.json_loads('{"text": "\\u00e4"}'.encode('utf8')), {'text': 'ä'})
+
+    def test_mmap_chunks(self):
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, 'data.png')
+            with open(path, 'wb') as f:
+                f.write(b'0123456789')
+
+            file_info = utils.try_get_file(path)
+            self.assertIsNotNone(file_info.mapping)
+            self.assertEqual(file_info.size, 10)
+            self.assertEqual(file_info.mime_type, 'image/png')
+
+            chunks = list(utils.chunk_file(file_info, 4))
+            self.assertTrue(all(isinstance(c.data, memoryview) for c in chunks))
+            self.assertEqual([bytes(c.data) for c in chunks], [b'0123', b'4567', b'89'])
+            self.assertEqual(bytes(file_info.read_at(3, 2)), b'34')
+            file_info.close()
+
+    def test_mmap_empty_file(self):
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, 'empty.png')
+            open(path, 'wb').close()
+
+            file_info = utils.try_get_file(path)
+            self.assertIsNone(file_info.mapping)
+            self.assertEqual(file_info.size, 0)
+            self.assertEqual(list(utils.chunk_file(file_info, 4)), [])
+            file_info.close()
+
+    def test_chunk_ranges(self):
+        file_info = FileInfo(io.BytesIO(b'0123456789'), 'data.bin')
+        chunks = [(c.index, c.offset, c.size) for c in utils.chunk_ranges(file_info, 4)]
+        self.assertEqual(chunks, [(0, 0, 4), (1, 4, 4), (2, 8, 2)])
+
+        sizes = lambda index, remaining: index + 3
+        chunks = [(c.index, c.offset, c.size) for c in utils.chunk_ranges(file_info, sizes)]
+        self.assertEqual(chunks, [(0, 0, 3), (1, 3, 4), (2, 7, 3)])
+
+    def test_multipart_encoder(self):
+        file_info = FileInfo(io.BytesIO(b'0123456789'), 'data.bin')
+        body = MultipartEncoder([
+            ('command', 'APPEND'),
+            ('media', FileRange(file_info, 2, 5), 'data.bin', 'application/octet-stream'),
+        ])
+
+        data = b''
+        while True:
+            block = body.read(3)
+            if not block:
+                break
+            data += block
+        self.assertEqual(len(data), len(body))
+
+        body.seek(0)
+        self.assertEqual(body.read(), data)
+
+        message = email.message_from_bytes(
+            'Content-Type: {}\r\n\r\n'.format(body.content_type).encode() + data)
+        parts = message.get_payload()
+        self.assertEqual(parts[0].get_payload(), 'APPEND')
+        self.assertEqual(parts[1].get_filename(), 'data.bin')
+        self.assertEqual(parts[1].get_payload(decode=True), b'23456')
+
+    def test_chunk_list(self):
+        self.assertEqual(list(utils.chunk_list([1, 2, 3, 4, 5], 2)), [[1, 2], [3, 4], [5]])
+
+
+if __name__ == '__main__':
+    unittest.main()